@@ -224,6 +224,7 @@ class ChatRoomAdmin(admin.ModelAdmin):
         "product",
         "get_participants",
         "status",
+        "last_message_at",
         "created_at",
         "updated_at",
     )
@@ -291,6 +292,7 @@ class ChatRoomParticipantAdmin(admin.ModelAdmin):
         "user",
         "is_active",
         "last_read_message_id",
+        "unread_count",
         "created_at",
         "updated_at",
     )
@@ -2,10 +2,12 @@ from typing import Optional
 
 from a_apis.auth.bearer import AuthBearer
 from a_apis.schema.chat import (
+    ChatPresenceResponseSchema,
     ChatRoomListResponseSchema,
     ChatRoomResponseSchema,
     CreateChatRoomResponseSchema,
     MessageListResponseSchema,
+    MessageSearchResponseSchema,
     SendMessageRequestSchema,
     SendMessageResponseSchema,
     TradeAppointmentActionSchema,
@@ -45,6 +47,26 @@ def get_chat_rooms(request, page: int = 1, page_size: int = 20):
     )
 
 
+@router.get("/search", response=MessageSearchResponseSchema)
+def search_messages(
+    request, q: str, before_id: Optional[int] = None, page_size: int = 20
+):
+    """
+    채팅 메시지 검색 API
+
+    참여 중인 채팅방의 메시지를 검색어로 조회.
+    최신순 정렬, 검색어 주변 미리보기와 검색어 위치 포함.
+
+    쿼리 파라미터:
+    - q: 검색어 (2자 이상)
+    - before_id: 이전 응답의 next_before_id (다음 페이지)
+    - page_size: 페이지 크기 (기본값: 20)
+    """
+    return ChatService.search_messages(
+        user_id=request.user.id, query=q, before_id=before_id, page_size=page_size
+    )
+
+
 @router.get("/{chat_room_id}", response=ChatRoomResponseSchema)
 def get_chat_room_detail(request, chat_room_id: int):
     """
@@ -60,7 +82,13 @@ def get_chat_room_detail(request, chat_room_id: int):
 
 @router.get("/{chat_room_id}/messages", response=MessageListResponseSchema)
 def get_chat_messages(
-    request, chat_room_id: int, page: int = 1, page_size: int = 20, sort: str = "newest"
+    request,
+    chat_room_id: int,
+    page: int = 1,
+    page_size: int = 20,
+    sort: str = "newest",
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
 ):
     """
     채팅방 메시지 조회 API
@@ -73,12 +101,31 @@ def get_chat_messages(
     - page: 페이지 번호 (기본값: 1)
     - page_size: 페이지 크기 (기본값: 20)
     - sort: 정렬 방식 (newest: 최신순, oldest: 과거순, 기본값: newest)
+    - before_id: 이 메시지 ID 이전 메시지를 최신순으로 조회 (과거 스크롤)
+    - after_id: 이 메시지 ID 이후 메시지를 과거순으로 조회 (마지막으로 받은 메시지 이후 동기화)
+
+    before_id / after_id 사용 시 page는 무시되고 total_count / total_pages 는 생략되며,
+    has_more 와 next_before_id / next_after_id 로 다음 조회 여부와 커서를 판단.
     """
     return ChatService.get_chat_messages(
         chat_room_id=chat_room_id,
         user_id=request.user.id,
         page=page,
         page_size=page_size,
+        before_id=before_id,
+        after_id=after_id,
+    )
+
+
+@router.get("/{chat_room_id}/presence", response=ChatPresenceResponseSchema)
+def get_chat_room_presence(request, chat_room_id: int):
+    """
+    채팅방 접속 상태 조회 API
+
+    현재 채팅방에 WebSocket 으로 접속해 있는 참여자 ID 목록 조회.
+    """
+    return ChatService.get_chat_room_presence(
+        chat_room_id=chat_room_id, user_id=request.user.id
     )
 
 
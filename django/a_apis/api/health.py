@@ -1,3 +1,5 @@
+from a_apis.auth.bearer import StaffAuthBearer
+from a_apis.service.chat_metrics import ChatMetrics
 from ninja import Router
 
 router = Router()
@@ -6,3 +8,14 @@ router = Router()
 @router.get("")
 def health_check(request):
     return {"status": "ok"}
+
+
+@router.get("/chat-metrics", auth=StaffAuthBearer())
+def chat_metrics(request):
+    """채팅 WebSocket 지표 (요청을 처리한 프로세스 기준, 운영자만 조회 가능)
+
+    - rate_limited_connection / rate_limited_user / rate_limited_closed: 전송 속도 제한
+    - slow_consumer_skipped_frames / slow_consumer_closed / outbound_queue_full_closed:
+      느린 클라이언트 처리
+    """
+    return ChatMetrics.snapshot()
@@ -11,6 +11,8 @@ from a_apis.schema.products import (
     PriceOfferCreateSchema,
     PriceOfferListSchema,
     PriceOfferResponseSchema,
+    PriceOfferSummaryListSchema,
+    PriceOfferSummaryResponseSchema,
     ProductCreateSchema,
     ProductInterestResponseSchema,
     ProductInterestSchema,
@@ -50,6 +52,21 @@ def get_my_products(
     )
 
 
+@router.get("/my-products/price-offer-summary", response=PriceOfferSummaryListSchema)
+def get_my_price_offer_summaries(request, status: Optional[str] = None):
+    """
+    내 판매 상품 가격 제안 요약 API (판매자 대시보드)
+
+    상품별 대기중 제안 수 / 최저 / 최고 / 중앙값 / 최근 제안을 상품 수와 무관하게 쿼리 1개로 조회
+
+    쿼리 파라미터:
+    - status: 상품 상태 필터 (선택)
+    """
+    return ProductService.get_my_price_offer_summaries(
+        user_id=request.user.id, status=status
+    )
+
+
 # 카테고리 관련 API (상품 ID 경로보다 먼저 정의)
 @router.get("/categories", response=CategoryListResponseSchema)
 def get_categories(request):
@@ -372,6 +389,23 @@ def get_price_offers(request, product_id: int):
     )
 
 
+@router.get(
+    "/{product_id}/price-offers/summary", response=PriceOfferSummaryResponseSchema
+)
+def get_price_offer_summary(request, product_id: int):
+    """
+    가격 제안 요약 조회 API
+
+    대기중 가격 제안의 개수 / 최저 / 최고 / 중앙값 / 최근 제안 조회 (판매자만 조회 가능)
+
+    경로 파라미터:
+    - product_id: 상품 ID
+    """
+    return ProductService.get_price_offer_summary(
+        product_id=product_id, user_id=request.user.id
+    )
+
+
 @router.post("/price-offers/{offer_id}/respond", response=PriceOfferResponseSchema)
 def respond_to_price_offer(request, offer_id: int, data: PriceOfferActionSchema):
     """
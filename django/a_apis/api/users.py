@@ -243,21 +243,23 @@ def get_user_manner_ratings_detail(request, user_id: int):
     "/{user_id}/reviews/detail",
     response={200: ReviewsDetailResponseSchema, 400: ErrorResponseSchema},
 )
-def get_user_reviews_detail(request, user_id: int, page: int = 1, page_size: int = 10):
+def get_user_reviews_detail(
+    request, user_id: int, before_id: int = None, page_size: int = 10
+):
     """
     특정 사용자가 받은 거래후기 상세 조회 API (페이지네이션 포함)
 
     **인증 필요**: Bearer 토큰으로 인증된 사용자만 다른 사용자의 거래후기를 상세 조회할 수 있습니다.
 
     **쿼리 파라미터**:
-    - page: 페이지 번호 (기본값: 1)
+    - before_id: 이 ID 보다 이전 후기부터 조회 (생략 시 최신 후기부터, 이전 응답의 next_before_id 전달)
     - page_size: 페이지 크기 (기본값: 10, 최대: 50)
 
     **응답 데이터**:
     - 받은 거래후기 목록 (최신순)
     - 후기 작성자 정보 (닉네임, 역할, 동네)
     - 거래 상품명, 거래 날짜, 후기 내용
-    - 페이지네이션 정보 (총 개수, 현재 페이지, 총 페이지 수)
+    - 페이지네이션 정보 (총 개수, 다음 페이지 존재 여부, 다음 페이지 커서)
 
     성공: 거래후기 상세 정보 반환
     실패: 오류 메시지
@@ -268,7 +270,7 @@ def get_user_reviews_detail(request, user_id: int, page: int = 1, page_size: int
     if page_size < 1:
         page_size = 10
 
-    result = UserService.get_user_reviews_detail(user_id, page, page_size)
+    result = UserService.get_user_reviews_detail(user_id, before_id, page_size)
 
     if not result["success"]:
         return 400, result
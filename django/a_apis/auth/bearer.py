@@ -26,3 +26,12 @@ class AuthBearer(HttpBearer):
             return None
         except User.DoesNotExist:
             return None
+
+
+class StaffAuthBearer(AuthBearer):
+    """운영자(is_staff) 전용 인증 (내부 지표 등)"""
+
+    def authenticate(self, request, token):
+        if super().authenticate(request, token) and request.user.is_staff:
+            return token
+        return None
@@ -1,14 +1,14 @@
+import logging
 from urllib.parse import parse_qs
 
 import jwt
-from channels.db import database_sync_to_async
+from a_apis.service.chat_access import ChatAccessCache
 from channels.middleware import BaseMiddleware
 
 from django.conf import settings
-from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 
-User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class JWTAuthMiddleware(BaseMiddleware):
@@ -25,25 +25,29 @@ class JWTAuthMiddleware(BaseMiddleware):
             params = parse_qs(query_string)
             token = params.get("token", [None])[0]
         user = await self.get_user(token)
-        import logging
-
-        logger = logging.getLogger("chatroom_debug")
-        logger.error("[JWTAuthMiddleware] user set: %s", user)
+        logger.debug("[JWTAuthMiddleware] user set: %s", user)
         scope["user"] = user
         return await super().__call__(scope, receive, send)
 
-    @database_sync_to_async
-    def get_user(self, token):
+    async def get_user(self, token):
+        """토큰 검증 후 사용자 반환 (서명 검증은 이벤트 루프에서, 사용자 조회는 캐시 우선)"""
         if not token:
             return AnonymousUser()
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            user_id = payload.get("user_id")
-            if not user_id:
-                return AnonymousUser()
-            return User.objects.get(id=user_id)
-        except Exception:
+        except jwt.PyJWTError:
+            return AnonymousUser()
+
+        user_id = payload.get("user_id")
+        if not user_id:
+            return AnonymousUser()
+
+        try:
+            user = await ChatAccessCache.aget_user(user_id)
+        except Exception as e:
+            logger.warning(f"[JWTAuthMiddleware] 사용자 조회 실패: {str(e)}")
             return AnonymousUser()
+        return user or AnonymousUser()
 
 
 def JWTAuthMiddlewareStack(inner):
@@ -1,173 +1,782 @@
-import json
+import asyncio
+import logging
+import time
+from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
-from django.utils import timezone
+from .service.chat import ChatService
+from .service.chat_access import ChatAccessCache
+from .service.chat_buffer import (
+    get_message_reserver,
+    get_read_receipt_buffer,
+    get_write_buffer,
+)
+from .service.chat_codec import (
+    MSGPACK_SUBPROTOCOL,
+    dumps_binary,
+    dumps_text,
+    loads_binary,
+    loads_text,
+    msgpack_available,
+)
+from .service.chat_events import ChatEventPublisher
+from .service.chat_limits import TokenBucket, UserRateLimiter, get_rate_limit_settings
+from .service.chat_metrics import ChatMetrics
+from .service.chat_presence import ChatPresence
 
-from .models import ChatMessage, ChatRoom, ChatRoomParticipant
+logger = logging.getLogger(__name__)
 
 
-class ChatConsumer(AsyncWebsocketConsumer):
-    async def connect(self):
-        import logging
+# 유휴 연결 / 느린 클라이언트 / 전송 속도 제한으로 연결을 끊을 때 사용하는 close code
+CLOSE_IDLE = 4001
+CLOSE_SLOW_CONSUMER = 4008
+CLOSE_RATE_LIMITED = 4029
+# 잘못된 연결 파라미터 (예: 숫자가 아닌 last_seq)
+CLOSE_BAD_REQUEST = 4400
+
+
+def parse_cursor(value):
+    """재연결 위치(last_message_id / last_seq) 파싱. 없으면 None, 음이 아닌 정수가 아니면 ValueError"""
+    if value is None:
+        return None
+    text = str(value)
+    if not (text.isascii() and text.isdigit()):
+        raise ValueError("유효하지 않은 재연결 위치입니다.")
+    return int(text)
+
+
+class FrameCodecMixin:
+    """WebSocket 프레임 인코딩 (JSON 텍스트 / msgpack 바이너리 서브프로토콜) 및 전송 큐
+
+    그룹 이벤트에 미리 직렬화된 프레임이 있으면 수신자마다 다시 직렬화하지 않고 그대로 전송
+
+    그룹 이벤트 프레임은 크기가 제한된 전송 큐를 거쳐 별도 태스크가 전송하며,
+    발행 후 전달까지의 지연(lag)으로 느린 클라이언트를 감지함
+    - lag 가 SKIP_LAG 를 넘으면 typing/read 같은 일시적 이벤트는 건너뜀
+    - lag 가 CLOSE_LAG 를 넘거나 전송 큐가 가득 차면 연결 종료 (재연결 시 replay 로 복구)
+    """
+
+    use_msgpack = False
+
+    OUTBOUND_QUEUE_SIZE = 256
+    SKIP_LAG = 2.0
+    CLOSE_LAG = 15.0
+
+    outbound = None
+    outbound_task = None
+    closing = False
+
+    async def accept_frames(self):
+        """클라이언트가 msgpack 서브프로토콜을 요청했으면 바이너리 프레임으로 연결 수락"""
+        if MSGPACK_SUBPROTOCOL in self.scope.get("subprotocols", []) and (
+            msgpack_available()
+        ):
+            self.use_msgpack = True
+            await self.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await self.accept()
+        self.start_outbound()
+
+    def start_outbound(self):
+        self.outbound = asyncio.Queue(maxsize=self.OUTBOUND_QUEUE_SIZE)
+        self.outbound_task = asyncio.get_running_loop().create_task(
+            self._drain_outbound()
+        )
+
+    def stop_outbound(self):
+        if self.outbound_task is not None:
+            self.outbound_task.cancel()
+            self.outbound_task = None
+
+    async def _drain_outbound(self):
+        while True:
+            frame = await self.outbound.get()
+            await self.send(**frame)
+
+    async def close_slow_consumer(self, reason: str):
+        if self.closing:
+            return
+        self.closing = True
+        ChatMetrics.incr(reason)
+        logger.warning(
+            f"[{self.__class__.__name__}] 느린 클라이언트 연결 종료: {reason}"
+        )
+        self.stop_outbound()
+        await self.close(code=CLOSE_SLOW_CONSUMER)
+
+    def decode_frame(self, text_data=None, bytes_data=None) -> dict:
+        if bytes_data is not None:
+            return loads_binary(bytes_data)
+        return loads_text(text_data)
+
+    async def send_json_frame(self, data: dict):
+        if self.use_msgpack:
+            await self.enqueue_frame({"bytes_data": dumps_binary(data)})
+        else:
+            await self.enqueue_frame({"text_data": dumps_text(data)})
+
+    async def enqueue_frame(self, frame: dict):
+        """전송 큐에 프레임 추가 (큐 시작 전에는 바로 전송). 큐가 가득 차면 연결 종료"""
+        if self.closing:
+            return
+        if self.outbound is None:
+            await self.send(**frame)
+            return
+        try:
+            self.outbound.put_nowait(frame)
+        except asyncio.QueueFull:
+            await self.close_slow_consumer("outbound_queue_full_closed")
+
+    async def send_event_frame(self, event: dict, build_frame, transient=False):
+        """그룹 이벤트의 직렬화된 프레임을 전송 큐에 추가 (없으면 build_frame 으로 생성)
+
+        transient: 건너뛰어도 되는 일시적 이벤트 여부 (입력 중, 읽음, 인박스 갱신)
+        """
+        if self.closing:
+            return
+
+        published_at = event.get("published_at")
+        lag = time.time() - published_at if published_at else 0.0
+        if lag > self.CLOSE_LAG:
+            await self.close_slow_consumer("slow_consumer_closed")
+            return
+        if transient and lag > self.SKIP_LAG:
+            ChatMetrics.incr("slow_consumer_skipped_frames")
+            return
+
+        if self.use_msgpack and "frame_bytes" in event:
+            await self.enqueue_frame({"bytes_data": event["frame_bytes"]})
+        elif not self.use_msgpack and "frame_text" in event:
+            await self.enqueue_frame({"text_data": event["frame_text"]})
+        else:
+            await self.send_json_frame(build_frame(event))
+
+
+class HeartbeatMixin(FrameCodecMixin):
+    """서버 측 heartbeat, 유휴 연결 정리, 연결 수 게이지
+
+    HEARTBEAT_INTERVAL 마다 {"type": "ping"} 을 보내고 클라이언트는 {"type": "pong"}
+    (또는 다른 아무 프레임)으로 응답. IDLE_TIMEOUT 동안 클라이언트 프레임이 없으면
+    끊긴 채 남은 모바일 연결로 보고 그룹에서 제외한 뒤 연결을 종료함
+
+    HEARTBEAT_OPT_IN 인 엔드포인트(기존 채팅방별 엔드포인트)는 heartbeat 를 모르는
+    기존 클라이언트를 위해, 연결 시 ?heartbeat=1 을 보내거나 ping/pong 프레임을 한 번
+    보낸 연결에만 ping 을 보내고 유휴 연결을 정리함. 그 외 연결의 생존 확인은
+    daphne 의 프로토콜 ping(--ping-interval / --ping-timeout)에 맡김
+
+    클라이언트 ping 은 전송 속도 제한과 별도로 HEARTBEAT_INTERVAL 당 한 번 꼴
+    (최대 PING_BURST 개 연속)만 pong 으로 응답하고, 초과분은 수신 기록만 함
+    """
+
+    # 접속 상태(ChatPresence) 갱신 주기와 같게 유지
+    HEARTBEAT_INTERVAL = ChatPresence.HEARTBEAT_INTERVAL
+    IDLE_TIMEOUT = 75
+    HEARTBEAT_OPT_IN = False
+    PING_BURST = 3
+
+    heartbeat_task = None
+    connection_open = False
+
+    async def accept_frames(self):
+        await super().accept_frames()
+        self.start_heartbeat()
+
+    def start_heartbeat(self):
+        self.last_seen = time.monotonic()
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        self.heartbeat_enabled = (
+            not self.HEARTBEAT_OPT_IN or query.get("heartbeat", ["0"])[0] == "1"
+        )
+        self.ping_bucket = TokenBucket(1 / self.HEARTBEAT_INTERVAL, self.PING_BURST)
+        self.connection_open = True
+        ChatMetrics.add_gauge("connections", 1)
+        self.heartbeat_task = asyncio.get_running_loop().create_task(
+            self._heartbeat_loop()
+        )
+
+    def release_connection(self):
+        """연결 종료 시 전송 큐 / heartbeat 태스크 정리 (여러 번 호출해도 안전)"""
+        self.stop_outbound()
+        if self.connection_open:
+            self.connection_open = False
+            ChatMetrics.add_gauge("connections", -1)
+
+        task, self.heartbeat_task = self.heartbeat_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def handle_heartbeat_frame(self, data: dict) -> bool:
+        """클라이언트 프레임 수신 기록. ping/pong 프레임이면 처리 후 True 반환"""
+        self.last_seen = time.monotonic()
+        frame_type = data.get("type")
+        if frame_type not in ("ping", "pong"):
+            return False
+
+        self.heartbeat_enabled = True
+        if frame_type == "ping":
+            if self.ping_bucket.consume():
+                await self.send_json_frame({"type": "pong"})
+            else:
+                ChatMetrics.incr("rate_limited_ping")
+        return True
+
+    async def on_heartbeat(self):
+        """heartbeat 주기마다 호출 (하위 클래스에서 확장)"""
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            if not self.heartbeat_enabled:
+                await self.on_heartbeat()
+                continue
+
+            if time.monotonic() - self.last_seen > self.IDLE_TIMEOUT:
+                ChatMetrics.incr("idle_connections_reaped")
+                # 서버가 disconnect 를 늦게 전달하더라도 그룹/접속 상태는 즉시 정리
+                await self.disconnect(CLOSE_IDLE)
+                await self.close(code=CLOSE_IDLE)
+                return
+
+            await self.send_json_frame({"type": "ping", "server_time": time.time()})
+            await self.on_heartbeat()
+
+
+class BaseChatConsumer(HeartbeatMixin, AsyncWebsocketConsumer):
+    """채팅 WebSocket 공통 동작 (클라이언트 프레임 처리 / 채팅방 그룹 이벤트 전달)
+
+    클라이언트 프레임 type
+    - message (기본값): 채팅 메시지 전송
+    - typing: 입력 중 표시. 저장하지 않고 채팅방의 다른 참여자에게만 전달
+    - read: 읽음 처리. 즉시 전달하고 DB 반영은 읽음 처리 버퍼가 모아서 처리
 
-        logger = logging.getLogger("chatroom_debug")
-        logger.error("[ChatConsumer.connect] called, user=%s", self.scope.get("user"))
+    발신자 id/닉네임은 연결 시 인증된 사용자 정보를 캐시해 사용 (현업 방식: 서버에서 강제 지정)
+
+    재연결 시 클라이언트가 마지막으로 받은 last_message_id 또는 last_seq 를 보내면
+    그 이후 메시지를 DB에서 먼저 재전송(replay)한 뒤 실시간 이벤트를 전달함.
+    Consumer 는 채널 레이어 이벤트를 한 번에 하나씩 처리하므로 replay 중 도착한
+    이벤트는 replay 가 끝난 뒤 처리되며, 이미 재전송한 message_id 이하는 건너뜀
+    """
+
+    # 한 번에 재전송하는 최대 메시지 수 (초과분은 REST after_id 조회로 동기화)
+    REPLAY_LIMIT = 200
+
+    def set_user(self, user):
+        self.user_id = user.id
+        self.sender_nickname = user.nickname
+        # 채팅방별 재전송한 마지막 message_id (실시간 이벤트 중복 제거용)
+        self.replayed_until = {}
+        # 채팅방별 이 연결이 알고 있는 가장 최근 message_id (읽음 이벤트 검증용)
+        self.latest_message_ids = {}
+
+        rate_limit = get_rate_limit_settings()
+        self.rate_bucket = TokenBucket(
+            rate_limit["CONNECTION_RATE"], rate_limit["CONNECTION_BURST"]
+        )
+        self.max_violations = rate_limit["MAX_VIOLATIONS"]
+        self.rate_violations = 0
+
+        # 접속 상태를 등록한 채팅방 (heartbeat 로 만료 시각 갱신)
+        self.presence_rooms = set()
+
+    async def join_presence(self, room_id: int):
+        if room_id in self.presence_rooms:
+            return
+        self.presence_rooms.add(room_id)
+        try:
+            await ChatPresence.ajoin(room_id, self.user_id)
+        except Exception as e:
+            logger.warning(f"[{self.__class__.__name__}] 접속 상태 등록 실패: {str(e)}")
+
+    async def leave_presence(self, room_id: int):
+        if room_id not in self.presence_rooms:
+            return
+        self.presence_rooms.discard(room_id)
+        try:
+            await ChatPresence.aleave(room_id, self.user_id)
+        except Exception as e:
+            logger.warning(f"[{self.__class__.__name__}] 접속 상태 해제 실패: {str(e)}")
+
+    async def leave_all_presence(self):
+        for room_id in list(getattr(self, "presence_rooms", ())):
+            await self.leave_presence(room_id)
+
+    async def on_heartbeat(self):
+        """접속 상태 만료 시각 갱신"""
+        for room_id in list(self.presence_rooms):
+            try:
+                await ChatPresence.arefresh(room_id, self.user_id)
+            except Exception as e:
+                logger.warning(
+                    f"[{self.__class__.__name__}] 접속 상태 갱신 실패: {str(e)}"
+                )
+
+    async def check_rate_limit(self, frame_type: str) -> bool:
+        """연결 / 사용자 단위 전송 속도 확인. 초과 시 오류 프레임을 보내고 False 반환"""
+        reason = None
+        if not self.rate_bucket.consume():
+            reason = "rate_limited_connection"
+        elif frame_type == "message":
+            try:
+                if not await UserRateLimiter.allow(self.user_id):
+                    reason = "rate_limited_user"
+            except Exception as e:
+                # 캐시 장애 시 사용자 단위 제한 없이 진행 (연결 단위 제한은 유지)
+                logger.warning(
+                    f"[{self.__class__.__name__}] 사용자 전송 속도 확인 실패: {str(e)}"
+                )
+
+        if reason is None:
+            return True
+
+        ChatMetrics.incr(reason)
+        self.rate_violations += 1
+        if self.rate_violations >= self.max_violations:
+            ChatMetrics.incr("rate_limited_closed")
+            await self.close(code=CLOSE_RATE_LIMITED)
+        else:
+            await self.send_json_frame(
+                {
+                    "type": "error",
+                    "code": "rate_limited",
+                    "error": "메시지 전송 속도 제한을 초과했습니다.",
+                }
+            )
+        return False
+
+    async def send_error(self, error):
+        await self.send_json_frame({"error": str(error), "type": "error"})
+
+    async def handle_frame(self, room_id: int, data: dict):
+        """채팅방 단위 프레임 처리"""
+        frame_type = data.get("type", "message")
+        if frame_type == "typing":
+            await self.handle_typing(room_id, data)
+        elif frame_type == "read":
+            await self.handle_read(room_id, data)
+        else:
+            await self.handle_message(room_id, data)
+
+    async def handle_message(self, room_id: int, data: dict):
+        message = data["message"]
+
+        # 선택적 파일 첨부
+        file_id = data.get("file_id")
+
+        write_buffer = get_write_buffer()
+        if write_buffer is None:
+            # 메시지 저장 (REST/시스템 메시지와 동일한 이벤트 생성)
+            event, inbox_events = await self.save_message(room_id, message, file_id)
+            await ChatEventPublisher.apublish(room_id, event)
+            await ChatEventPublisher.apublish_to_users(inbox_events)
+        else:
+            # write-behind: ID/seq만 발급받아 먼저 전송하고 저장은 버퍼에서 일괄 처리
+            if file_id:
+                chat_message = await self.build_message(room_id, message, file_id)
+            else:
+                chat_message = ChatService.build_message(room_id, self.user_id, message)
+            chat_message = await get_message_reserver().reserve(chat_message)
+            await ChatEventPublisher.apublish(
+                room_id,
+                ChatEventPublisher.message_event(
+                    chat_message, sender_nickname=self.sender_nickname
+                ),
+            )
+            await write_buffer.enqueue(chat_message)
+
+    async def handle_typing(self, room_id: int, data: dict):
+        """입력 중 이벤트 전달 (DB 접근 없음)"""
+        await ChatEventPublisher.apublish(
+            room_id,
+            ChatEventPublisher.typing_event(
+                room_id,
+                self.user_id,
+                self.sender_nickname,
+                bool(data.get("is_typing", True)),
+                self.channel_name,
+            ),
+        )
+
+    async def handle_read(self, room_id: int, data: dict):
+        """읽음 이벤트: 앞으로 나아간 경우에만 전달하고 DB 반영은 버퍼에 맡김
+
+        채팅방의 가장 최근 메시지보다 앞선 message_id 는 거부함. 이 연결이 받은 메시지
+        범위 안이면 DB 를 조회하지 않고, 벗어난 경우에만 채팅방 마지막 메시지를 조회함
+        """
+        message_id = int(data["message_id"])
+        if message_id > self.latest_message_ids.get(room_id, 0):
+            latest = await self.load_latest_message_id(room_id)
+            self.latest_message_ids[room_id] = max(
+                latest, self.latest_message_ids.get(room_id, 0)
+            )
+            if message_id > self.latest_message_ids[room_id]:
+                await self.send_error("유효하지 않은 message_id 입니다.")
+                return
+
+        advanced = await get_read_receipt_buffer().enqueue(
+            room_id, self.user_id, message_id
+        )
+        if advanced:
+            await ChatEventPublisher.apublish(
+                room_id,
+                ChatEventPublisher.read_event(room_id, self.user_id, message_id),
+            )
+
+    async def replay_missed(self, room_id: int, last_message_id=None, last_seq=None):
+        """마지막으로 받은 메시지 이후 누락된 메시지 재전송 (위치는 parse_cursor 로 검증한 값)"""
+        if last_message_id is None and last_seq is None:
+            return
+
+        # write-behind 모드: 이 프로세스에 아직 저장되지 않은 메시지가 있으면 먼저 저장
+        write_buffer = get_write_buffer()
+        if write_buffer is not None and write_buffer.has_pending():
+            try:
+                await write_buffer.flush()
+            except Exception as e:
+                logger.error(
+                    f"[{self.__class__.__name__}] replay 전 flush 실패: {str(e)}"
+                )
+
+        events = await self.load_missed_events(room_id, last_message_id, last_seq)
+        has_more = len(events) > self.REPLAY_LIMIT
+        events = events[: self.REPLAY_LIMIT]
+
+        for event in events:
+            await self.chat_message(event)
+        if events:
+            self.replayed_until[room_id] = events[-1]["message_id"]
+
+        await self.send_json_frame(
+            {
+                "type": "replay_done",
+                "room_id": room_id,
+                "count": len(events),
+                "has_more": has_more,
+            }
+        )
+
+    async def flush_buffers(self):
+        """연결 종료 시 버퍼에 남은 메시지 / 읽음 처리 반영 (정상 종료 시 유실 방지)"""
+        write_buffer = get_write_buffer()
+        if write_buffer is not None:
+            # 발급 중인 메시지가 버퍼에 들어올 때까지 대기
+            await get_message_reserver().wait_idle()
+        if write_buffer is not None and write_buffer.has_pending():
+            try:
+                await write_buffer.flush()
+            except Exception as e:
+                # 메시지는 버퍼에 남아 있으므로 주기적 flush 에서 재시도
+                logger.error(
+                    f"[{self.__class__.__name__}] disconnect flush 실패: {str(e)}"
+                )
+
+        read_buffer = get_read_receipt_buffer()
+        if read_buffer.has_pending():
+            try:
+                await read_buffer.flush()
+            except Exception as e:
+                logger.error(
+                    f"[{self.__class__.__name__}] 읽음 처리 flush 실패: {str(e)}"
+                )
+
+    async def chat_message(self, event):
+        """채팅방 그룹으로부터 메시지 수신 시 호출되는 메소드"""
+        # replay 로 이미 보낸 메시지는 건너뜀
+        room_id = event.get("room_id")
+        if event["message_id"] <= self.replayed_until.get(room_id, 0):
+            return
+        if event["message_id"] > self.latest_message_ids.get(room_id, 0):
+            self.latest_message_ids[room_id] = event["message_id"]
+
+        # 클라이언트에게 메시지 전송 (발행 시 직렬화된 프레임 그대로 사용)
+        await self.send_event_frame(event, ChatEventPublisher.message_frame)
+
+    async def chat_typing(self, event):
+        """입력 중 이벤트 수신 (본인 연결에는 보내지 않음)"""
+        if event.get("sender_channel") == self.channel_name:
+            return
+        await self.send_event_frame(
+            event, ChatEventPublisher.typing_frame, transient=True
+        )
+
+    async def chat_read(self, event):
+        """읽음 이벤트 수신"""
+        await self.send_event_frame(
+            event, ChatEventPublisher.read_frame, transient=True
+        )
+
+    async def chat_trade(self, event):
+        """가격 제안 / 거래약속 이벤트 수신"""
+        await self.send_event_frame(event, ChatEventPublisher.trade_frame)
+
+    async def can_connect_to_room(self, room_id: int):
+        """사용자가 채팅방에 접근할 수 있는지 확인 (참여자 행이 있으면 채팅방도 존재, 캐시 우선)"""
+        allowed = await ChatAccessCache.ais_member(room_id, self.user_id)
+        logger.debug(
+            f"[{self.__class__.__name__}] room={room_id} user={self.user_id} "
+            f"allowed={allowed}"
+        )
+        return allowed
+
+    @database_sync_to_async
+    def load_latest_message_id(self, room_id: int) -> int:
+        return ChatService.latest_message_id(room_id)
+
+    @database_sync_to_async
+    def load_missed_events(self, room_id: int, last_message_id=None, last_seq=None):
+        return [
+            ChatEventPublisher.message_event(chat_message)
+            for chat_message in ChatService.get_messages_after(
+                room_id, last_message_id, last_seq, limit=self.REPLAY_LIMIT
+            )
+        ]
+
+    @database_sync_to_async
+    def save_message(self, room_id: int, message, file_id=None):
+        """채팅 메시지 저장 후 채팅방 이벤트와 참여자 인박스 이벤트 반환
+
+        닉네임은 연결 시 캐시한 값 사용
+        """
+        chat_message = ChatService.save_message(room_id, self.user_id, message, file_id)
+        return (
+            ChatEventPublisher.message_event(
+                chat_message, sender_nickname=self.sender_nickname
+            ),
+            ChatService.inbox_events(room_id),
+        )
+
+    @database_sync_to_async
+    def build_message(self, room_id: int, message, file_id):
+        """write-behind 모드: 첨부파일 확인 후 발급 전 메시지 생성"""
+        return ChatService.build_message(room_id, self.user_id, message, file_id)
+
+
+class RoomUpdatedMixin(FrameCodecMixin):
+    """사용자 인박스 그룹(user_{id}) 이벤트 전달 (채팅방 갱신 / 거래 이벤트)"""
+
+    async def room_updated(self, event):
+        """채팅방 갱신 이벤트 전달"""
+        await self.send_event_frame(
+            event, ChatEventPublisher.room_updated_frame, transient=True
+        )
+
+    async def inbox_trade(self, event):
+        """가격 제안 / 거래약속 이벤트 전달"""
+        await self.send_event_frame(event, ChatEventPublisher.trade_frame)
+
+
+class ChatConsumer(BaseChatConsumer):
+    """채팅방 WebSocket Consumer (ws/chat/<room_id>/, 연결당 채팅방 하나)
+
+    채팅방 ID, 발신자 닉네임, 접근 권한은 연결 시 한 번만 확인해 캐시하고
+    메시지마다 DB 스레드 전환은 저장 한 번으로 제한
+
+    재연결: ws/chat/<room_id>/?last_seq=10 (또는 last_message_id=123)
+    heartbeat: ws/chat/<room_id>/?heartbeat=1 (기존 클라이언트 호환을 위해 선택 사항)
+    """
+
+    HEARTBEAT_OPT_IN = True
+
+    async def connect(self):
         """WebSocket 연결 시 호출되는 메소드"""
         # URL에서 채팅방 ID 추출
         self.room_id = self.scope["url_route"]["kwargs"]["room_id"]
         # 채팅방 그룹 이름 생성 (채팅방별로 그룹 생성)
-        self.room_group_name = f"chat_{self.room_id}"
+        self.room_group_name = ChatEventPublisher.room_group_name(self.room_id)
+        self.joined_group = False
 
         # 채팅방 존재 여부 확인 및 접근 권한 확인
-        can_connect = await self.can_connect_to_room()
-        if not can_connect:
+        user = self.scope.get("user")
+        if not user or user.is_anonymous or not self.room_id.isdigit():
+            # 연결 거부
+            await self.close()
+            return
+
+        self.room_id = int(self.room_id)
+        self.set_user(user)
+
+        # 재연결 위치는 그룹 참여 / 연결 수락 전에 검증 (수락 후 실패하면 정리되지 않음)
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        try:
+            last_message_id = parse_cursor(query.get("last_message_id", [None])[0])
+            last_seq = parse_cursor(query.get("last_seq", [None])[0])
+        except ValueError:
+            await self.close(code=CLOSE_BAD_REQUEST)
+            return
+
+        if not await self.can_connect_to_room(self.room_id):
             # 연결 거부
             await self.close()
             return
 
         # 채팅방 그룹에 참여
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
+        self.joined_group = True
 
         # WebSocket 연결 수락
-        await self.accept()
+        await self.accept_frames()
+        await self.join_presence(self.room_id)
+
+        # 재연결이면 누락 메시지부터 전송 (그룹 참여 후 조회하므로 빈 구간 없음)
+        await self.replay_missed(
+            self.room_id, last_message_id=last_message_id, last_seq=last_seq
+        )
 
     async def disconnect(self, close_code):
         """WebSocket 연결 종료 시 호출되는 메소드"""
+        self.release_connection()
+
         # 채팅방 그룹에서 나가기
-        await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        if getattr(self, "joined_group", False):
+            await self.channel_layer.group_discard(
+                self.room_group_name, self.channel_name
+            )
+        await self.leave_all_presence()
 
-    async def receive(self, text_data):
-        """클라이언트로부터 메시지 수신 시 호출되는 메소드 (현업 방식: sender_id는 서버에서 강제 지정)"""
+        await self.flush_buffers()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """클라이언트로부터 메시지 수신 시 호출되는 메소드"""
         try:
-            # JSON 데이터 파싱
-            text_data_json = json.loads(text_data)
-            message = text_data_json["message"]
-            # sender_id는 인증된 유저 id로 강제 지정
-            sender_id = self.scope["user"].id
+            # JSON(또는 msgpack) 데이터 파싱
+            data = self.decode_frame(text_data, bytes_data)
+            if await self.handle_heartbeat_frame(data):
+                return
+            if await self.check_rate_limit(data.get("type", "message")):
+                await self.handle_frame(self.room_id, data)
+        except Exception as e:
+            # 오류 발생 시 처리
+            await self.send_error(e)
 
-            # 선택적 파일 첨부
-            file_id = text_data_json.get("file_id")
 
-            # 메시지 저장
-            chat_message = await self.save_message(sender_id, message, file_id)
+class MultiplexChatConsumer(RoomUpdatedMixin, BaseChatConsumer):
+    """사용자당 하나의 WebSocket으로 여러 채팅방을 구독하는 Consumer (ws/chat/)
 
-            # 메시지 전송 시간 형식화
-            timestamp = chat_message.created_at.isoformat()
+    인증은 연결 시 한 번만 수행하고 채팅방은 subscribe/unsubscribe 프레임으로
+    구독/해지 (구독 시 채팅방별 참여 권한 확인). 인박스 이벤트도 같은 연결로 전달
 
-            # 발신자 닉네임 가져오기
-            sender_nickname = await self.get_user_nickname(sender_id)
+    클라이언트 프레임
+    - {"type": "subscribe", "room_id": 1, "last_seq": 10}  (last_seq/last_message_id 는 재연결 시)
+    - {"type": "unsubscribe", "room_id": 1}
+    - {"type": "message" | "typing" | "read", "room_id": 1, ...}
+    """
 
-            # 채팅방 그룹에 메시지 이벤트 전송
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "chat_message",
-                    "message": message,
-                    "sender_id": sender_id,
-                    "sender_nickname": sender_nickname,
-                    "timestamp": timestamp,
-                    "message_id": chat_message.id,
-                    "file_url": (
-                        await self.get_file_url(chat_message) if file_id else None
-                    ),
-                },
-            )
-        except Exception as e:
-            # 오류 발생 시 처리
-            await self.send(
-                text_data=json.dumps(
-                    {"error": str(e), "type": "error"}, ensure_ascii=False
-                )
-            )
+    # 연결 하나가 구독할 수 있는 최대 채팅방 수
+    MAX_SUBSCRIPTIONS = 200
 
-    async def chat_message(self, event):
-        """채팅방 그룹으로부터 메시지 수신 시 호출되는 메소드"""
-        # 클라이언트에게 메시지 전송
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "message",
-                    "message": event["message"],
-                    "sender_id": event["sender_id"],
-                    "sender_nickname": event["sender_nickname"],
-                    "timestamp": event["timestamp"],
-                    "message_id": event["message_id"],
-                    "file_url": event.get("file_url"),
-                },
-                ensure_ascii=False,
+    async def connect(self):
+        self.subscribed_rooms = set()
+        self.user_group_name = None
+
+        user = self.scope.get("user")
+        if not user or user.is_anonymous:
+            await self.close()
+            return
+
+        self.set_user(user)
+        self.user_group_name = ChatEventPublisher.user_group_name(user.id)
+        await self.channel_layer.group_add(self.user_group_name, self.channel_name)
+        await self.accept_frames()
+
+    async def disconnect(self, close_code):
+        self.release_connection()
+        for room_id in list(getattr(self, "subscribed_rooms", ())):
+            await self.channel_layer.group_discard(
+                ChatEventPublisher.room_group_name(room_id), self.channel_name
             )
-        )
+        if getattr(self, "user_group_name", None):
+            await self.channel_layer.group_discard(
+                self.user_group_name, self.channel_name
+            )
+        await self.leave_all_presence()
 
-    @database_sync_to_async
-    def can_connect_to_room(self):
-        """사용자가 채팅방에 접근할 수 있는지 확인 (logger로 강제 출력)"""
-        import logging
+        await self.flush_buffers()
 
-        logger = logging.getLogger("chatroom_debug")
+    async def receive(self, text_data=None, bytes_data=None):
         try:
-            user = self.scope.get("user")
-            logger.error("[DEBUG][can_connect_to_room] user: %s", user)
-            if not user or user.is_anonymous:
-                logger.error(
-                    "[DEBUG][can_connect_to_room] user is anonymous or not set"
-                )
-                return False
+            data = self.decode_frame(text_data, bytes_data)
+            if await self.handle_heartbeat_frame(data):
+                return
+            frame_type = data.get("type", "message")
+            room_id = int(data["room_id"])
 
-            try:
-                chat_room = ChatRoom.objects.get(id=self.room_id)
-                logger.error(
-                    f"[DEBUG][can_connect_to_room] chat_room found: {chat_room}"
+            if not await self.check_rate_limit(frame_type):
+                return
+            if frame_type == "subscribe":
+                last_message_id = parse_cursor(data.get("last_message_id"))
+                last_seq = parse_cursor(data.get("last_seq"))
+                await self.subscribe(room_id)
+                await self.replay_missed(
+                    room_id, last_message_id=last_message_id, last_seq=last_seq
                 )
-            except Exception as e:
-                logger.error(f"[DEBUG][can_connect_to_room] chat_room get error: {e}")
-                return False
-
-            exists = ChatRoomParticipant.objects.filter(
-                chat_room=chat_room, user=user, is_active=True
-            ).exists()
-            logger.error(f"[DEBUG][can_connect_to_room] participant exists? {exists}")
-            return exists
+            elif frame_type == "unsubscribe":
+                await self.unsubscribe(room_id)
+            elif room_id not in self.subscribed_rooms:
+                raise PermissionError("구독하지 않은 채팅방입니다.")
+            else:
+                await self.handle_frame(room_id, data)
         except Exception as e:
-            logger.error(f"[DEBUG][can_connect_to_room] Exception: {e}")
-            return False
-        except ChatRoom.DoesNotExist:
-            logger.error("[DEBUG][can_connect_to_room] ChatRoom.DoesNotExist")
-            return False
-        except Exception as e:
-            logger.error(f"[DEBUG][can_connect_to_room] Unknown Exception: {e}")
-            return False
+            await self.send_error(e)
 
-    @database_sync_to_async
-    def save_message(self, sender_id, message, file_id=None):
-        """채팅 메시지 저장"""
-        chat_room = ChatRoom.objects.get(id=self.room_id)
+    async def subscribe(self, room_id: int):
+        if room_id not in self.subscribed_rooms:
+            if len(self.subscribed_rooms) >= self.MAX_SUBSCRIPTIONS:
+                raise ValueError("구독 가능한 채팅방 수를 초과했습니다.")
+            if not await self.can_connect_to_room(room_id):
+                raise PermissionError("채팅방에 접근할 권한이 없습니다.")
 
-        # 메시지 생성
-        chat_message = ChatMessage.objects.create(
-            chat_room=chat_room, sender_id=sender_id, message=message, file_id=file_id
-        )
+            await self.channel_layer.group_add(
+                ChatEventPublisher.room_group_name(room_id), self.channel_name
+            )
+            self.subscribed_rooms.add(room_id)
+            await self.join_presence(room_id)
 
-        # 채팅방 갱신 시간 업데이트 (최근 메시지 순 정렬 위함)
-        chat_room.save(update_fields=["updated_at"])
+        await self.send_json_frame({"type": "subscribed", "room_id": room_id})
 
-        return chat_message
+    async def unsubscribe(self, room_id: int):
+        if room_id in self.subscribed_rooms:
+            self.subscribed_rooms.discard(room_id)
+            await self.leave_presence(room_id)
+            await self.channel_layer.group_discard(
+                ChatEventPublisher.room_group_name(room_id), self.channel_name
+            )
 
-    @database_sync_to_async
-    def get_user_nickname(self, user_id):
-        """사용자 닉네임 가져오기"""
-        from a_user.models import User
+        await self.send_json_frame({"type": "unsubscribed", "room_id": room_id})
 
-        try:
-            user = User.objects.get(id=user_id)
-            return user.nickname
-        except User.DoesNotExist:
-            return "알 수 없음"
+    async def inbox_trade(self, event):
+        # 구독 중인 채팅방은 채팅방 그룹(chat_trade)으로 이미 전달됨
+        if event.get("room_id") in self.subscribed_rooms:
+            return
+        await super().inbox_trade(event)
 
-    @database_sync_to_async
-    def get_file_url(self, message):
-        """첨부파일 URL 가져오기"""
-        if message.file:
-            return message.file.url
-        return None
+
+class InboxConsumer(RoomUpdatedMixin, HeartbeatMixin, AsyncWebsocketConsumer):
+    """사용자 인박스 WebSocket Consumer
+
+    사용자의 모든 채팅방에서 메시지가 도착할 때마다 채팅방 미리보기와
+    안 읽은 메시지 수를 전달. 채팅방 목록은 최초 한 번만 REST로 조회하면 됨
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        self.group_name = None
+        if not user or user.is_anonymous:
+            await self.close()
+            return
+
+        self.group_name = ChatEventPublisher.user_group_name(user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept_frames()
+
+    async def disconnect(self, close_code):
+        self.release_connection()
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """인박스 연결은 heartbeat(ping/pong) 프레임만 처리"""
+        try:
+            await self.handle_heartbeat_frame(self.decode_frame(text_data, bytes_data))
+        except Exception as e:
+            await self.send_json_frame({"error": str(e), "type": "error"})
@@ -0,0 +1,46 @@
+from a_apis.service.chat_archive import ChatArchiveService
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "비활성 채팅방의 오래된 메시지를 채팅방/월 단위 압축 NDJSON 파일로 "
+        "default_storage 에 보관하고 DB 에서 삭제합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--inactive-days",
+            type=int,
+            default=180,
+            help="마지막 메시지 이후 이 일수가 지난 채팅방만 대상 (기본값: 180)",
+        )
+        parser.add_argument(
+            "--keep-months",
+            type=int,
+            default=6,
+            help="최근 이 개월 수의 메시지는 DB 에 유지 (기본값: 6)",
+        )
+        parser.add_argument(
+            "--room-limit", type=int, help="한 번에 처리할 최대 채팅방 수"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="보관하지 않고 대상만 집계"
+        )
+
+    def handle(self, *args, **options):
+        result = ChatArchiveService.archive_inactive_rooms(
+            inactive_days=options["inactive_days"],
+            keep_months=options["keep_months"],
+            room_limit=options["room_limit"],
+            dry_run=options["dry_run"],
+        )
+
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}채팅방 {result['rooms']}개에서 메시지 {result['messages']}개를 "
+                f"보관 파일 {result['archives']}개로 옮겼습니다."
+            )
+        )
@@ -0,0 +1,88 @@
+import json
+import time
+
+from a_apis.models import ChatMessage
+from a_apis.service import chat_codec
+from a_apis.service.chat_events import ChatEventPublisher
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "채팅방 그룹 이벤트 fan-out 시 프레임 직렬화 비용을 비교합니다. "
+        "수신자마다 직렬화(기존 방식)와 발행 시 한 번 직렬화(현재 방식)를 "
+        "연결 수별로 측정합니다. DB에 접근하지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connections",
+            default="10,100,1000",
+            help="채팅방 연결 수 목록 (쉼표 구분, 기본값: 10,100,1000)",
+        )
+        parser.add_argument(
+            "--events", type=int, default=200, help="발행할 이벤트 수 (기본값: 200)"
+        )
+
+    def handle(self, *args, **options):
+        connection_counts = [int(c) for c in options["connections"].split(",")]
+        event_count = options["events"]
+        chat_message = ChatMessage(
+            id=1,
+            seq=1,
+            chat_room_id=1,
+            sender_id=1,
+            message="안녕하세요! 아직 판매 중인가요? 오늘 저녁에 거래 가능할까요?",
+            created_at=timezone.now(),
+        )
+
+        encoder = "orjson" if chat_codec.orjson is not None else "json"
+        self.stdout.write(
+            f"JSON 인코더: {encoder}, msgpack: {chat_codec.msgpack_available()}"
+        )
+
+        for connections in connection_counts:
+            per_recipient = self._measure(
+                event_count, connections, chat_message, self._per_recipient
+            )
+            once = self._measure(event_count, connections, chat_message, self._once)
+            frames = event_count * connections
+            self.stdout.write(
+                f"연결 {connections:>5}개: "
+                f"수신자별 직렬화 {frames / per_recipient:>12,.0f} frames/sec, "
+                f"1회 직렬화 {frames / once:>12,.0f} frames/sec "
+                f"(x{per_recipient / once:.1f})"
+            )
+
+    def _measure(self, event_count, connections, chat_message, fan_out):
+        started = time.perf_counter()
+        for _ in range(event_count):
+            fan_out(connections, chat_message)
+        return time.perf_counter() - started
+
+    @staticmethod
+    def _per_recipient(connections, chat_message):
+        """기존 방식: 이벤트 dict 를 만들고 수신자마다 프레임 dict 생성 + 직렬화"""
+        event = {
+            "type": "chat_message",
+            "room_id": chat_message.chat_room_id,
+            "message_id": chat_message.id,
+            "seq": chat_message.seq,
+            "message": chat_message.message,
+            "sender_id": chat_message.sender_id,
+            "sender_nickname": "판매자",
+            "timestamp": chat_message.created_at.isoformat(),
+            "file_url": None,
+        }
+        return [
+            json.dumps(ChatEventPublisher.message_frame(event), ensure_ascii=False)
+            for _ in range(connections)
+        ]
+
+    @staticmethod
+    def _once(connections, chat_message):
+        """현재 방식: 발행 시 한 번 직렬화하고 수신자는 직렬화된 프레임을 그대로 사용"""
+        event = ChatEventPublisher.message_event(chat_message, sender_nickname="판매자")
+        return [event["frame_text"] for _ in range(connections)]
@@ -0,0 +1,279 @@
+import asyncio
+import random
+import threading
+import time
+import uuid
+
+from a_apis.models import ChatRoom, ChatRoomParticipant, Product
+from a_apis.service.chat_metrics import process_rss_bytes
+from a_user.models import User
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+
+IN_MEMORY_CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+# 처리량 측정이 목적이므로 전송 속도 제한은 사실상 해제
+UNLIMITED_RATE_LIMIT = {
+    "CONNECTION_RATE": 1_000_000,
+    "CONNECTION_BURST": 1_000_000,
+    "USER_MESSAGES": 1_000_000,
+    "MAX_VIOLATIONS": 1_000_000,
+}
+
+
+class QueryCounter:
+    """모든 DB 연결(스레드)의 실행 쿼리 수 집계 (connection.execute_wrapper 용)"""
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.install(connection)
+        connection_created.connect(self.install)
+        return self
+
+    def __exit__(self, *exc_info):
+        connection_created.disconnect(self.install)
+        for connection in connections.all():
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+def percentile(sorted_values, ratio):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * ratio))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "ASGI 앱(a_core.asgi.application)에 ChatConsumer WebSocket 연결 N개를 "
+        "채팅방 M개에 나눠 열고, 연결마다 지정한 속도로 메시지를 보내 "
+        "전달 지연(p50/p99), messages/sec, 메시지당 DB 쿼리 수, 프로세스 RSS 를 측정합니다. "
+        "측정용 사용자/상품/채팅방을 만들고 종료 시 삭제합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connections", type=int, default=20, help="연결 수 (기본값: 20)"
+        )
+        parser.add_argument(
+            "--rooms", type=int, default=5, help="채팅방 수 (기본값: 5)"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=1.0,
+            help="연결당 초당 전송 메시지 수 (기본값: 1.0)",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="전송 시간(초) (기본값: 10)"
+        )
+        parser.add_argument(
+            "--drain-timeout",
+            type=float,
+            default=10.0,
+            help="전송 종료 후 남은 프레임을 기다리는 시간(초) (기본값: 10)",
+        )
+        parser.add_argument(
+            "--redis",
+            action="store_true",
+            help="설정된 채널 레이어(Redis) 사용 (기본값: 인메모리 채널 레이어)",
+        )
+
+    def handle(self, *args, **options):
+        connection_count = options["connections"]
+        room_count = max(1, min(options["rooms"], connection_count))
+
+        run_id = uuid.uuid4().hex[:4]
+        seller, users, rooms = self._create_fixtures(
+            run_id, connection_count, room_count
+        )
+        # 연결 i 는 채팅방 i % M 에 참여 (AccessToken 은 DB 접근 없이 발급)
+        clients = [
+            (rooms[i % room_count].id, str(AccessToken.for_user(user)))
+            for i, user in enumerate(users)
+        ]
+
+        try:
+            with override_settings(CHAT_RATE_LIMIT=UNLIMITED_RATE_LIMIT):
+                if options["redis"]:
+                    result = async_to_sync(self._run)(clients, options)
+                else:
+                    with override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS):
+                        result = async_to_sync(self._run)(clients, options)
+        finally:
+            Product.objects.filter(id__in=[room.product_id for room in rooms]).delete()
+            User.objects.filter(id__in=[seller.id] + [u.id for u in users]).delete()
+
+        self._report(result, connection_count, room_count)
+
+    def _create_fixtures(self, run_id, connection_count, room_count):
+        """측정용 판매자/연결별 사용자/상품/채팅방 생성 (비밀번호 해싱 없이 일괄 생성)"""
+        seller = User(
+            email=f"loadtest_s_{run_id}@example.com",
+            username=f"loadtest_s_{run_id}@example.com",
+            nickname=f"lt{run_id}s",
+            phone_number="01000000000",
+        )
+        seller.set_unusable_password()
+        seller.save()
+
+        users = []
+        for i in range(connection_count):
+            user = User(
+                email=f"loadtest_{run_id}_{i}@example.com",
+                username=f"loadtest_{run_id}_{i}@example.com",
+                nickname=f"lt{run_id}{i}",
+                phone_number="01000000000",
+            )
+            user.set_unusable_password()
+            users.append(user)
+        users = User.objects.bulk_create(users)
+
+        rooms = []
+        for i in range(room_count):
+            product = Product.objects.create(
+                user=seller,
+                title=f"부하 테스트 상품 {i}",
+                price=1000,
+                description="부하 테스트",
+            )
+            rooms.append(ChatRoom.objects.create(product=product, seller=seller))
+
+        ChatRoomParticipant.objects.bulk_create(
+            [ChatRoomParticipant(chat_room=room, user=seller) for room in rooms]
+            + [
+                ChatRoomParticipant(chat_room=rooms[i % room_count], user=user)
+                for i, user in enumerate(users)
+            ]
+        )
+        return seller, users, rooms
+
+    async def _run(self, clients, options):
+        from a_core.asgi import application
+
+        rss_before = process_rss_bytes()
+
+        communicators = [
+            WebsocketCommunicator(application, f"/ws/chat/{room_id}/?token={token}")
+            for room_id, token in clients
+        ]
+        results = await asyncio.gather(*(c.connect() for c in communicators))
+        if not all(connected for connected, _ in results):
+            raise RuntimeError("WebSocket 연결에 실패했습니다.")
+        rss_connected = process_rss_bytes()
+
+        room_sizes = {}
+        for room_id, _ in clients:
+            room_sizes[room_id] = room_sizes.get(room_id, 0) + 1
+
+        per_connection = int(options["rate"] * options["duration"])
+        expected_deliveries = sum(
+            per_connection * room_sizes[room_id] for room_id, _ in clients
+        )
+
+        sent_at = {}
+        latencies = []
+        done = asyncio.Event()
+
+        async def sender(index, communicator):
+            interval = 1 / options["rate"]
+            # 연결마다 시작 시점을 흩어 한꺼번에 몰리지 않도록 함
+            start = time.perf_counter() + random.uniform(0, interval)
+            for n in range(per_connection):
+                delay = start + n * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                key = f"{index}:{n}"
+                sent_at[key] = time.perf_counter()
+                await communicator.send_json_to({"message": f"lt {key}"})
+
+        async def receiver(communicator):
+            # receive_output 시간 초과는 애플리케이션을 취소하므로 충분히 길게 기다리고
+            # 측정 종료 시 태스크를 취소함
+            while True:
+                frame = await communicator.receive_json_from(timeout=3600)
+                if frame.get("type") != "message":
+                    continue
+                key = frame["message"][3:]
+                if key in sent_at:
+                    latencies.append(time.perf_counter() - sent_at[key])
+                if len(latencies) >= expected_deliveries:
+                    done.set()
+
+        with QueryCounter() as queries:
+            started = time.perf_counter()
+            receivers = [asyncio.ensure_future(receiver(c)) for c in communicators]
+            await asyncio.gather(*(sender(i, c) for i, c in enumerate(communicators)))
+            sent_elapsed = time.perf_counter() - started
+            try:
+                await asyncio.wait_for(done.wait(), options["drain_timeout"])
+            except asyncio.TimeoutError:
+                pass
+            elapsed = time.perf_counter() - started
+            for task in receivers:
+                task.cancel()
+            await asyncio.gather(*receivers, return_exceptions=True)
+            rss_peak = process_rss_bytes()
+            await asyncio.gather(*(c.disconnect() for c in communicators))
+
+        messages = len(sent_at)
+        latencies.sort()
+        return {
+            "messages": messages,
+            "deliveries": len(latencies),
+            "expected_deliveries": expected_deliveries,
+            "sent_elapsed": sent_elapsed,
+            "elapsed": elapsed,
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99),
+            "queries": queries.count,
+            "rss_before": rss_before,
+            "rss_connected": rss_connected,
+            "rss_peak": rss_peak,
+        }
+
+    def _report(self, result, connection_count, room_count):
+        mb = 1024 * 1024
+        messages = result["messages"]
+        elapsed = result["elapsed"]
+        lines = [
+            f"연결 {connection_count}개 / 채팅방 {room_count}개",
+            f"전송 메시지 {messages}개 ({result['sent_elapsed']:.2f}초), "
+            f"전달 {result['deliveries']}/{result['expected_deliveries']}건 "
+            f"({elapsed:.2f}초)",
+            f"처리량: {messages / elapsed if elapsed else 0.0:.1f} messages/sec, "
+            f"{result['deliveries'] / elapsed if elapsed else 0.0:.1f} deliveries/sec",
+            f"전달 지연: p50 {result['p50'] * 1000:.1f}ms, "
+            f"p99 {result['p99'] * 1000:.1f}ms",
+            f"메시지당 DB 쿼리: {result['queries'] / messages if messages else 0.0:.2f}개 "
+            f"(총 {result['queries']}개)",
+            f"RSS: 시작 {result['rss_before'] / mb:.1f}MB, "
+            f"연결 후 {result['rss_connected'] / mb:.1f}MB "
+            f"(연결당 {(result['rss_connected'] - result['rss_before']) / connection_count / 1024:.1f}KB), "
+            f"최대 {result['rss_peak'] / mb:.1f}MB",
+        ]
+        for line in lines[:-1]:
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(lines[-1]))
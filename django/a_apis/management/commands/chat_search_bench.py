@@ -0,0 +1,188 @@
+import statistics
+import time
+import uuid
+
+from a_apis.models import ChatRoom, ChatRoomParticipant, Product
+from a_apis.service.chat import ChatService
+from a_user.models import User
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+WORDS = [
+    "안녕하세요",
+    "자전거",
+    "아직",
+    "판매",
+    "중인가요",
+    "네고",
+    "가능할까요",
+    "직거래",
+    "택배",
+    "오늘",
+    "저녁",
+    "시청역",
+    "상태",
+    "좋아요",
+    "감사합니다",
+    "아이폰",
+    "노트북",
+    "책상",
+    "의자",
+    "유모차",
+]
+
+# 채팅방 / 순번 / 생성 시각을 generate_series 로 계산해 한 번에 삽입
+INSERT_SQL = """
+INSERT INTO chat_messages
+    (chat_room_id, sender_id, message, is_deleted, seq, created_at, updated_at)
+SELECT
+    (%(rooms)s::bigint[])[1 + g %% %(room_count)s],
+    %(sender_id)s,
+    (%(words)s::text[])[1 + floor(random() * %(word_count)s)::int] || ' ' ||
+    (%(words)s::text[])[1 + floor(random() * %(word_count)s)::int] || ' ' ||
+    (%(words)s::text[])[1 + floor(random() * %(word_count)s)::int] || ' ' || g,
+    false,
+    g / %(room_count)s + 1,
+    now() - make_interval(secs => %(total)s - g),
+    now()
+FROM generate_series(%(start)s, %(stop)s) AS g
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "채팅 메시지 검색(/api/chats/search) 성능을 측정합니다. "
+        "측정용 채팅방에 메시지를 대량 생성하고 검색어별 응답 시간과 실행 계획을 출력한 뒤 "
+        "생성한 데이터를 삭제합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=2_000_000,
+            help="생성할 메시지 수 (기본값: 2,000,000)",
+        )
+        parser.add_argument(
+            "--rooms", type=int, default=2000, help="생성할 채팅방 수 (기본값: 2000)"
+        )
+        parser.add_argument(
+            "--user-rooms",
+            type=int,
+            default=50,
+            help="검색하는 사용자가 참여한 채팅방 수 (기본값: 50)",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="측정할 검색어 (여러 번 지정 가능, 기본값: 자전거 / 네고 가능 / 없는단어)",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="검색어별 반복 횟수 (기본값: 5)"
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=200_000,
+            help="삽입 배치 크기 (기본값: 200,000)",
+        )
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or ["자전거", "네고 가능", "없는단어"]
+        run_id = uuid.uuid4().hex[:6]
+        seller, searcher, rooms = self._create_fixtures(run_id, options)
+        room_ids = [room.id for room in rooms]
+
+        try:
+            self._insert_messages(room_ids, seller.id, options)
+
+            for query in queries:
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    result = ChatService.search_messages(searcher.id, query)
+                    timings.append(time.perf_counter() - started)
+                self.stdout.write(
+                    f"'{query}': 결과 {len(result['data'])}건, "
+                    f"median {statistics.median(timings) * 1000:.1f}ms, "
+                    f"max {max(timings) * 1000:.1f}ms"
+                )
+            self._explain(searcher.id, queries[0])
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM chat_messages WHERE chat_room_id = ANY(%s)", [room_ids]
+                )
+            Product.objects.filter(id__in=[room.product_id for room in rooms]).delete()
+            User.objects.filter(id__in=[seller.id, searcher.id]).delete()
+
+        self.stdout.write(self.style.SUCCESS("측정 데이터를 삭제했습니다."))
+
+    def _create_fixtures(self, run_id, options):
+        users = []
+        for role in ("s", "q"):
+            user = User(
+                email=f"searchbench_{role}_{run_id}@example.com",
+                username=f"searchbench_{role}_{run_id}@example.com",
+                nickname=f"sb{role}{run_id}",
+                phone_number="01000000000",
+            )
+            user.set_unusable_password()
+            users.append(user)
+        seller, searcher = User.objects.bulk_create(users)
+
+        products = Product.objects.bulk_create(
+            [
+                Product(
+                    user=seller,
+                    title=f"검색 벤치마크 상품 {i}",
+                    price=1000,
+                    description="검색 벤치마크",
+                )
+                for i in range(options["rooms"])
+            ]
+        )
+        rooms = ChatRoom.objects.bulk_create(
+            [ChatRoom(product=product, seller=seller) for product in products]
+        )
+        ChatRoomParticipant.objects.bulk_create(
+            [ChatRoomParticipant(chat_room=room, user=seller) for room in rooms]
+            + [
+                ChatRoomParticipant(chat_room=room, user=searcher)
+                for room in rooms[: options["user_rooms"]]
+            ]
+        )
+        return seller, searcher, rooms
+
+    def _insert_messages(self, room_ids, sender_id, options):
+        total = options["messages"]
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            for start in range(0, total, options["batch"]):
+                cursor.execute(
+                    INSERT_SQL,
+                    {
+                        "rooms": room_ids,
+                        "room_count": len(room_ids),
+                        "sender_id": sender_id,
+                        "words": WORDS,
+                        "word_count": len(WORDS),
+                        "total": total,
+                        "start": start,
+                        "stop": min(start + options["batch"], total) - 1,
+                    },
+                )
+            cursor.execute("ANALYZE chat_messages")
+        self.stdout.write(
+            f"메시지 {total:,}개 생성 ({time.perf_counter() - started:.1f}초)"
+        )
+
+    def _explain(self, user_id, query):
+        plan = (
+            ChatService.search_queryset(user_id, query)
+            .order_by("-id")[:21]
+            .explain(analyze=True, buffers=True)
+        )
+        self.stdout.write(f"실행 계획 ('{query}'):\n{plan}")
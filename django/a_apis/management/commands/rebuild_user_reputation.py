@@ -0,0 +1,26 @@
+from a_apis.service.reputation import ReputationService
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "유저 평판 집계(매너 평가 유형별 횟수, 거래 후기 수, 판매중 상품 수)를 "
+        "원본 테이블에서 다시 계산합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="재계산할 유저 ID (여러 번 지정 가능, 생략 시 전체)",
+        )
+
+    def handle(self, *args, **options):
+        count = ReputationService.rebuild(options["user_ids"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"유저 {count}명의 평판 집계를 재계산했습니다.")
+        )
@@ -0,0 +1,26 @@
+from a_apis.service.chat import ChatService
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "채팅방 마지막 메시지 및 참여자별 안 읽은 메시지 수를 재계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--room-id",
+            type=int,
+            action="append",
+            dest="room_ids",
+            help="재계산할 채팅방 ID (여러 번 지정 가능, 생략 시 전체)",
+        )
+
+    def handle(self, *args, **options):
+        result = ChatService.repair_chat_counters(options["room_ids"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"채팅방 {result['rooms']}개의 마지막 메시지를 재계산하고, "
+                f"참여자 {result['participants']}명의 안 읽은 메시지 수를 보정했습니다."
+            )
+        )
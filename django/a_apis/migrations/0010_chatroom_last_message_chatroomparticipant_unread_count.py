@@ -0,0 +1,85 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Substr
+
+
+def backfill_chat_counters(apps, schema_editor):
+    """기존 채팅방의 마지막 메시지 / 안 읽은 메시지 수 채우기"""
+    ChatRoom = apps.get_model("a_apis", "ChatRoom")
+    ChatRoomParticipant = apps.get_model("a_apis", "ChatRoomParticipant")
+    ChatMessage = apps.get_model("a_apis", "ChatMessage")
+
+    last_message = ChatMessage.objects.filter(
+        chat_room=OuterRef("pk"), is_deleted=False
+    ).order_by("-created_at", "-id")
+    ChatRoom.objects.update(
+        last_message_id=Subquery(last_message.values("id")[:1]),
+        last_message_preview=Coalesce(
+            Substr(Subquery(last_message.values("message")[:1]), 1, 100),
+            models.Value(""),
+        ),
+        last_message_at=Subquery(last_message.values("created_at")[:1]),
+    )
+
+    unread = (
+        ChatMessage.objects.filter(
+            chat_room=OuterRef("chat_room"),
+            is_deleted=False,
+            id__gt=Coalesce(OuterRef("last_read_message_id"), 0),
+        )
+        .exclude(sender=OuterRef("user"))
+        .values("chat_room")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    ChatRoomParticipant.objects.update(unread_count=Coalesce(Subquery(unread), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_apis", "0009_alter_product_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatroom",
+            name="last_message",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="a_apis.chatmessage",
+                verbose_name="마지막 메시지",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatroom",
+            name="last_message_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="마지막 메시지 시간"
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatroom",
+            name="last_message_preview",
+            field=models.CharField(
+                blank=True,
+                default="",
+                max_length=100,
+                verbose_name="마지막 메시지 미리보기",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatroomparticipant",
+            name="unread_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="안 읽은 메시지 수"
+            ),
+        ),
+        migrations.RunPython(backfill_chat_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:03
+
+from django.db import migrations, models
+
+# 기존 메시지에 방 단위 순번을 부여하고 채팅방의 마지막 시퀀스를 채움
+BACKFILL_SEQ_SQL = """
+UPDATE chat_messages AS m
+SET seq = numbered.rn
+FROM (
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY chat_room_id ORDER BY created_at, id
+    ) AS rn
+    FROM chat_messages
+) AS numbered
+WHERE m.id = numbered.id;
+
+UPDATE chat_rooms AS r
+SET message_seq = COALESCE(
+    (SELECT MAX(m.seq) FROM chat_messages AS m WHERE m.chat_room_id = r.id), 0
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_apis", "0010_chatroom_last_message_chatroomparticipant_unread_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatroom",
+            name="message_seq",
+            field=models.PositiveBigIntegerField(
+                default=0, verbose_name="마지막 메시지 시퀀스"
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatmessage",
+            name="seq",
+            field=models.PositiveBigIntegerField(
+                default=0, verbose_name="방 내 메시지 순번"
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SEQ_SQL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(fields=["chat_room", "id"], name="chat_msg_room_id_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="chatmessage",
+            constraint=models.UniqueConstraint(
+                fields=("chat_room", "seq"), name="unique_chat_message_seq"
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:20
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_apis", "0011_chatmessage_seq_chatroom_message_seq"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(
+                fields=["chat_room", "-created_at"], name="chat_msg_room_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="chat_msg_created_brin"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ChatMessageArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("period", models.DateField(verbose_name="보관 월(1일)")),
+                (
+                    "first_message_id",
+                    models.PositiveBigIntegerField(verbose_name="첫 메시지 ID"),
+                ),
+                (
+                    "last_message_id",
+                    models.PositiveBigIntegerField(verbose_name="마지막 메시지 ID"),
+                ),
+                (
+                    "first_seq",
+                    models.PositiveBigIntegerField(verbose_name="첫 메시지 순번"),
+                ),
+                (
+                    "last_seq",
+                    models.PositiveBigIntegerField(verbose_name="마지막 메시지 순번"),
+                ),
+                (
+                    "message_count",
+                    models.PositiveIntegerField(verbose_name="메시지 수"),
+                ),
+                (
+                    "storage_path",
+                    models.CharField(max_length=255, verbose_name="저장 경로"),
+                ),
+                (
+                    "compression",
+                    models.CharField(
+                        choices=[("zstd", "zstd"), ("gzip", "gzip")],
+                        max_length=10,
+                        verbose_name="압축 방식",
+                    ),
+                ),
+                (
+                    "chat_room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="message_archives",
+                        to="a_apis.chatroom",
+                        verbose_name="채팅방",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "채팅 메시지 보관 파일",
+                "verbose_name_plural": "채팅 메시지 보관 파일 목록",
+                "db_table": "chat_message_archives",
+                "indexes": [
+                    models.Index(
+                        fields=["chat_room", "-last_message_id"],
+                        name="chat_archive_room_last_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:05
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_apis", "0012_chatmessage_indexes_chatmessagearchive"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("message"),
+                    name="gin_trgm_ops",
+                ),
+                name="chat_msg_message_trgm",
+            ),
+        ),
+    ]
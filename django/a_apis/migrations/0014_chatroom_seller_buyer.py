@@ -0,0 +1,74 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# 판매자는 상품 등록자, 구매자는 판매자가 아닌 참여자(가장 먼저 참여한 사용자)로 채움.
+# 같은 구매자가 한 상품에 채팅방을 여러 개 가진 경우 가장 최근 채팅방에만 구매자를 지정함
+BACKFILL_SELLER_BUYER_SQL = """
+UPDATE chat_rooms AS r
+SET seller_id = p.user_id
+FROM products AS p
+WHERE p.id = r.product_id;
+
+WITH buyers AS (
+    SELECT DISTINCT ON (r.id) r.id AS chat_room_id, r.product_id, cp.user_id
+    FROM chat_rooms AS r
+    JOIN chat_room_participants AS cp ON cp.chat_room_id = r.id
+    WHERE cp.user_id <> r.seller_id
+    ORDER BY r.id, cp.id
+),
+ranked AS (
+    SELECT chat_room_id, user_id, ROW_NUMBER() OVER (
+        PARTITION BY product_id, user_id ORDER BY chat_room_id DESC
+    ) AS rn
+    FROM buyers
+)
+UPDATE chat_rooms AS r
+SET buyer_id = ranked.user_id
+FROM ranked
+WHERE r.id = ranked.chat_room_id AND ranked.rn = 1;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_apis", "0013_chatmessage_message_trgm"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatroom",
+            name="seller",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="selling_chat_rooms",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="판매자",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatroom",
+            name="buyer",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="buying_chat_rooms",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="구매자",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SELLER_BUYER_SQL, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name="chatroom",
+            constraint=models.UniqueConstraint(
+                fields=("product", "buyer"), name="unique_chat_room_product_buyer"
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from .chat import ChatMessage, ChatRoom, ChatRoomParticipant
+from .chat import ChatMessage, ChatMessageArchive, ChatRoom, ChatRoomParticipant
 from .email_verification import EmailVerification
 from .files import File
 from .product import InterestProduct, Product, ProductCategory, ProductImage
@@ -19,4 +19,5 @@ __all__ = [
     "ChatRoom",
     "ChatRoomParticipant",
     "ChatMessage",
+    "ChatMessageArchive",
 ]
@@ -1,11 +1,15 @@
 from a_common.models import CommonModel
 
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class ChatRoom(CommonModel):
     """채팅방 모델"""
 
+    PREVIEW_LENGTH = 100
+
     class Status(models.TextChoices):
         ACTIVE = "active", "활성"
         INACTIVE = "inactive", "비활성"
@@ -16,18 +20,62 @@ class ChatRoom(CommonModel):
         related_name="chat_rooms",
         verbose_name="상품",
     )
+    # 참여자 테이블을 거치지 않고 판매자/구매자를 찾을 수 있도록 비정규화
+    seller = models.ForeignKey(
+        "a_user.User",
+        on_delete=models.CASCADE,
+        related_name="selling_chat_rooms",
+        verbose_name="판매자",
+        null=True,
+        blank=True,
+    )
+    buyer = models.ForeignKey(
+        "a_user.User",
+        on_delete=models.CASCADE,
+        related_name="buying_chat_rooms",
+        verbose_name="구매자",
+        null=True,
+        blank=True,
+    )
     status = models.CharField(
         max_length=10,
         choices=Status.choices,
         default=Status.ACTIVE,
         verbose_name="채팅방 상태",
     )
+    # 목록 조회 시 메시지 테이블을 다시 읽지 않도록 마지막 메시지 정보를 비정규화
+    last_message = models.ForeignKey(
+        "ChatMessage",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="마지막 메시지",
+        null=True,
+        blank=True,
+    )
+    last_message_preview = models.CharField(
+        max_length=PREVIEW_LENGTH,
+        blank=True,
+        default="",
+        verbose_name="마지막 메시지 미리보기",
+    )
+    last_message_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="마지막 메시지 시간"
+    )
+    message_seq = models.PositiveBigIntegerField(
+        default=0, verbose_name="마지막 메시지 시퀀스"
+    )
 
     class Meta:
         db_table = "chat_rooms"
         verbose_name = "채팅방"
         verbose_name_plural = "채팅방 목록"
         ordering = ["-updated_at"]  # 최근 메시지가 있는 채팅방이 상단에 위치
+        constraints = [
+            # 상품 하나에 구매자별 채팅방은 하나
+            models.UniqueConstraint(
+                fields=["product", "buyer"], name="unique_chat_room_product_buyer"
+            )
+        ]
 
     def __str__(self):
         return f"Chat for {self.product.title}"
@@ -57,6 +105,9 @@ class ChatRoomParticipant(CommonModel):
         blank=True,
     )
     is_active = models.BooleanField(default=True, verbose_name="참여 상태")
+    unread_count = models.PositiveIntegerField(
+        default=0, verbose_name="안 읽은 메시지 수"
+    )
 
     class Meta:
         db_table = "chat_room_participants"
@@ -96,13 +147,78 @@ class ChatMessage(CommonModel):
         blank=True,
     )
     is_deleted = models.BooleanField(default=False, verbose_name="삭제 여부")
+    # 채팅방 내 단조 증가 번호 (클라이언트가 누락 구간을 감지하는 데 사용)
+    seq = models.PositiveBigIntegerField(default=0, verbose_name="방 내 메시지 순번")
 
     class Meta:
         db_table = "chat_messages"
         verbose_name = "채팅 메시지"
         verbose_name_plural = "채팅 메시지 목록"
         ordering = ["created_at"]  # 시간순 정렬
+        indexes = [
+            # 커서(before_id/after_id) 기반 범위 조회용
+            models.Index(fields=["chat_room", "id"], name="chat_msg_room_id_idx"),
+            # 페이지 번호 방식 조회(채팅방 + 최신순) 정렬용
+            models.Index(
+                fields=["chat_room", "-created_at"], name="chat_msg_room_created_idx"
+            ),
+            # 삽입 순서와 생성 시각이 일치하므로 기간 조회 / 보관 처리는 작은 BRIN 으로 충분
+            BrinIndex(fields=["created_at"], name="chat_msg_created_brin"),
+            # 메시지 검색(message__icontains → UPPER(message) LIKE) 용 트라이그램 인덱스
+            GinIndex(
+                OpClass(Upper("message"), name="gin_trgm_ops"),
+                name="chat_msg_message_trgm",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chat_room", "seq"], name="unique_chat_message_seq"
+            )
+        ]
 
     def __str__(self):
         preview = self.message[:20] + "..." if len(self.message) > 20 else self.message
         return f"{self.sender.nickname}: {preview}"
+
+
+class ChatMessageArchive(CommonModel):
+    """콜드 스토리지로 옮긴 채팅 메시지 묶음
+
+    비활성 채팅방의 오래된 메시지를 채팅방/월 단위로 NDJSON 압축 파일로 만들어
+    default_storage 에 저장하고 DB 에서는 삭제함. 과거 스크롤 시 id 범위로 찾아 읽음
+    """
+
+    class Compression(models.TextChoices):
+        ZSTD = "zstd", "zstd"
+        GZIP = "gzip", "gzip"
+
+    chat_room = models.ForeignKey(
+        ChatRoom,
+        on_delete=models.CASCADE,
+        related_name="message_archives",
+        verbose_name="채팅방",
+    )
+    period = models.DateField(verbose_name="보관 월(1일)")
+    first_message_id = models.PositiveBigIntegerField(verbose_name="첫 메시지 ID")
+    last_message_id = models.PositiveBigIntegerField(verbose_name="마지막 메시지 ID")
+    first_seq = models.PositiveBigIntegerField(verbose_name="첫 메시지 순번")
+    last_seq = models.PositiveBigIntegerField(verbose_name="마지막 메시지 순번")
+    message_count = models.PositiveIntegerField(verbose_name="메시지 수")
+    storage_path = models.CharField(max_length=255, verbose_name="저장 경로")
+    compression = models.CharField(
+        max_length=10, choices=Compression.choices, verbose_name="압축 방식"
+    )
+
+    class Meta:
+        db_table = "chat_message_archives"
+        verbose_name = "채팅 메시지 보관 파일"
+        verbose_name_plural = "채팅 메시지 보관 파일 목록"
+        indexes = [
+            models.Index(
+                fields=["chat_room", "-last_message_id"],
+                name="chat_archive_room_last_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.chat_room_id} {self.period:%Y-%m} ({self.message_count})"
@@ -134,44 +134,27 @@ class Product(CommonModel):
         return f"{self.title} ({self.get_status_display()})"
 
     def mark_as_completed(self, buyer, final_price=None):
-        """거래 완료 처리 메서드"""
-        import logging
-
-        logger = logging.getLogger("product_debug")
-
-        try:
-            logger.error(
-                f"[mark_as_completed] 시작 - product_id: {self.id}, buyer: {buyer}, final_price: {final_price}"
-            )
-
-            self.status = self.Status.SOLDOUT
-            self.buyer = buyer
-            self.final_price = final_price if final_price else self.price
-            self.completed_at = timezone.now()
-            self.trade_complete_status = self.TradeCompleteStatus.COMPLETED
-
-            logger.error(
-                f"[mark_as_completed] 저장 전 - status: {self.status}, buyer_id: {self.buyer.id if self.buyer else None}"
-            )
-
-            self.save(
-                update_fields=[
-                    "status",
-                    "buyer",
-                    "final_price",
-                    "completed_at",
-                    "trade_complete_status",
-                    "updated_at",
-                ]
-            )
-
-            logger.error(f"[mark_as_completed] 성공 - product_id: {self.id}")
-            return True
-        except Exception as e:
-            logger.error(
-                f"[mark_as_completed] 오류 발생 - product_id: {self.id}, error: {str(e)}"
-            )
-            return False
+        """거래 완료 처리 메서드
+
+        상태 전이 검증 / 행 잠금 없이 바로 저장하므로 서비스 코드에서는
+        TradeStateMachine.complete 를 사용
+        """
+        self.status = self.Status.SOLDOUT
+        self.buyer = buyer
+        self.final_price = final_price if final_price else self.price
+        self.completed_at = timezone.now()
+        self.trade_complete_status = self.TradeCompleteStatus.COMPLETED
+        self.save(
+            update_fields=[
+                "status",
+                "buyer",
+                "final_price",
+                "completed_at",
+                "trade_complete_status",
+                "updated_at",
+            ]
+        )
+        return True
 
 
 class ProductImage(CommonModel):
@@ -215,11 +215,11 @@ class MannerRating(CommonModel):
         super().save(*args, **kwargs)
 
         if is_new:
-            from a_apis.service.users import UserService
+            from a_user.models import User
 
             # 매너온도 업데이트 (긍정적이면 +0.5, 부정적이면 -0.5)
             change = 0.5 if self.rating_type == self.RatingType.POSITIVE else -0.5
-            UserService.update_manner_temperature(self.rated_user.id, change)
+            User.apply_manner_temperature_delta(self.rated_user_id, change)
 
 
 class TradeAppointment(CommonModel):
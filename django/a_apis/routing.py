@@ -1,8 +1,11 @@
 from django.urls import re_path
 
-from .consumers import ChatConsumer
+from .consumers import ChatConsumer, InboxConsumer, MultiplexChatConsumer
 
 # WebSocket URL 패턴 정의
 websocket_urlpatterns = [
+    # 사용자당 연결 하나로 여러 채팅방 구독 (subscribe/unsubscribe 프레임)
+    re_path(r"ws/chat/$", MultiplexChatConsumer.as_asgi()),
     re_path(r"ws/chat/(?P<room_id>\w+)/$", ChatConsumer.as_asgi()),
+    re_path(r"ws/inbox/$", InboxConsumer.as_asgi()),
 ]
@@ -11,6 +11,7 @@ class MessageSchema(Schema):
     """채팅 메시지 스키마"""
 
     id: int = Field(..., description="메시지 ID")
+    seq: int = Field(0, description="채팅방 내 메시지 순번")
     sender_id: int = Field(..., description="발신자 ID")
     sender_nickname: str = Field(..., description="발신자 닉네임")
     message: str = Field(..., description="메시지 내용")
@@ -93,10 +94,49 @@ class MessageListResponseSchema(Schema):
     success: bool = Field(..., description="요청 성공 여부")
     message: str = Field(..., description="응답 메시지")
     data: List[MessageSchema] = Field(..., description="메시지 목록")
-    total_count: int = Field(..., description="전체 메시지 수")
-    page: int = Field(..., description="현재 페이지")
+    total_count: Optional[int] = Field(
+        None, description="전체 메시지 수 (커서 조회 시 생략)"
+    )
+    page: Optional[int] = Field(None, description="현재 페이지 (커서 조회 시 생략)")
     page_size: int = Field(..., description="페이지 크기")
-    total_pages: int = Field(..., description="전체 페이지 수")
+    total_pages: Optional[int] = Field(
+        None, description="전체 페이지 수 (커서 조회 시 생략)"
+    )
+    has_more: bool = Field(False, description="다음 페이지(커서) 존재 여부")
+    next_before_id: Optional[int] = Field(
+        None, description="이전 메시지 조회 시 before_id 로 전달할 값"
+    )
+    next_after_id: Optional[int] = Field(
+        None, description="이후 메시지 조회 시 after_id 로 전달할 값"
+    )
+
+
+class MessageSearchResultSchema(Schema):
+    """메시지 검색 결과 스키마"""
+
+    id: int = Field(..., description="메시지 ID")
+    seq: int = Field(..., description="채팅방 내 메시지 순번")
+    chat_room_id: int = Field(..., description="채팅방 ID")
+    product_title: str = Field(..., description="상품 제목")
+    sender_id: int = Field(..., description="발신자 ID")
+    sender_nickname: str = Field(..., description="발신자 닉네임")
+    snippet: str = Field(..., description="검색어 주변 메시지 미리보기")
+    highlights: List[List[int]] = Field(
+        [], description="미리보기 안의 검색어 위치 목록 ([시작, 끝) 문자 인덱스)"
+    )
+    created_at: datetime = Field(..., description="메시지 작성 시간")
+
+
+class MessageSearchResponseSchema(Schema):
+    """메시지 검색 응답 스키마"""
+
+    success: bool = Field(..., description="요청 성공 여부")
+    message: str = Field(..., description="응답 메시지")
+    data: List[MessageSearchResultSchema] = Field(..., description="검색 결과")
+    has_more: bool = Field(False, description="다음 페이지 존재 여부")
+    next_before_id: Optional[int] = Field(
+        None, description="다음 페이지 조회 시 before_id 로 전달할 값"
+    )
 
 
 class SendMessageRequestSchema(Schema):
@@ -114,6 +154,22 @@ class SendMessageResponseSchema(Schema):
     data: Optional[MessageSchema] = Field(None, description="전송된 메시지 정보")
 
 
+class ChatPresenceSchema(Schema):
+    """채팅방 접속 상태 스키마"""
+
+    online_user_ids: List[int] = Field(
+        ..., description="채팅방에 접속해 있는 참여자 ID 목록"
+    )
+
+
+class ChatPresenceResponseSchema(Schema):
+    """채팅방 접속 상태 응답 스키마"""
+
+    success: bool = Field(..., description="요청 성공 여부")
+    message: str = Field(..., description="응답 메시지")
+    data: Optional[ChatPresenceSchema] = Field(None, description="접속 상태")
+
+
 class PriceOfferCreateSchema(Schema):
     """가격 제안 생성 스키마"""
 
@@ -293,6 +293,49 @@ class PriceOfferListSchema(Schema):
     data: List[PriceOfferDetailSchema] = Field([], description="가격 제안 목록")
 
 
+class LatestPriceOfferSchema(Schema):
+    """최근 대기중 가격 제안 스키마"""
+
+    id: int = Field(..., description="가격 제안 ID")
+    user_id: int = Field(..., description="제안자 ID")
+    user_nickname: Optional[str] = Field(None, description="제안자 닉네임")
+    price: int = Field(..., description="제안 가격")
+    created_at: str = Field(..., description="제안 일시")
+
+
+class PriceOfferSummarySchema(Schema):
+    """상품별 대기중 가격 제안 요약 스키마"""
+
+    product_id: int = Field(..., description="상품 ID")
+    product_title: str = Field(..., description="상품 제목")
+    product_price: Optional[int] = Field(None, description="판매 가격 (나눔은 null)")
+    pending_count: int = Field(..., description="대기중 제안 수")
+    min_price: Optional[int] = Field(None, description="최저 제안 가격")
+    max_price: Optional[int] = Field(None, description="최고 제안 가격")
+    median_price: Optional[float] = Field(None, description="제안 가격 중앙값")
+    latest_offer: Optional[LatestPriceOfferSchema] = Field(
+        None, description="가장 최근 대기중 제안"
+    )
+
+
+class PriceOfferSummaryResponseSchema(Schema):
+    """가격 제안 요약 응답 스키마"""
+
+    success: bool = Field(..., description="성공 여부")
+    message: str = Field(..., description="응답 메시지")
+    data: Optional[PriceOfferSummarySchema] = Field(None, description="가격 제안 요약")
+
+
+class PriceOfferSummaryListSchema(Schema):
+    """내 판매 상품 가격 제안 요약 목록 응답 스키마"""
+
+    success: bool = Field(..., description="성공 여부")
+    message: str = Field(..., description="응답 메시지")
+    data: List[PriceOfferSummarySchema] = Field(
+        [], description="상품별 가격 제안 요약 목록"
+    )
+
+
 class PriceOfferActionSchema(Schema):
     """가격 제안 응답 액션 스키마"""
 
@@ -269,6 +269,8 @@ class ReviewsDetailResponseSchema(Schema):
     reviews: Optional[List[DetailedReviewSchema]] = Field(
         None, description="거래후기 목록"
     )
-    page: Optional[int] = Field(None, description="현재 페이지")
     page_size: Optional[int] = Field(None, description="페이지 크기")
-    total_pages: Optional[int] = Field(None, description="총 페이지 수")
+    has_more: Optional[bool] = Field(None, description="이전 후기 존재 여부")
+    next_before_id: Optional[int] = Field(
+        None, description="다음 페이지 조회 시 before_id 로 전달할 후기 ID"
+    )
@@ -1,4 +1,5 @@
 import math
+from collections import Counter
 
 from a_apis.models import (
     ChatMessage,
@@ -9,19 +10,393 @@ from a_apis.models import (
     ProductImage,
 )
 from a_apis.models.trade import TradeAppointment
+from a_apis.service.chat_archive import ChatArchiveService
+from a_apis.service.chat_events import ChatEventPublisher
+from a_apis.service.chat_presence import ChatPresence
+from a_apis.service.trade import TradeStateMachine
+from a_apis.service.user_cards import UserCardService
+from a_user.models import User
 
 from django.contrib.gis.geos import Point
-from django.db.models import Count, F, Max, OuterRef, Q, Subquery
-from django.db.models.functions import Coalesce
+from django.db import connection, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Substr
+from django.utils import timezone
 
 
 class ChatService:
+    @staticmethod
+    def save_message(
+        chat_room_id: int, sender_id: int, message: str, file_id: int = None
+    ) -> ChatMessage:
+        """메시지 저장 (WebSocket/REST/시스템 메시지 공통)
+
+        채팅방 행 UPDATE 한 번으로 방 단위 시퀀스와 메시지 ID 를 발급하면서 채팅방
+        마지막 메시지와 참여자별 안 읽은 메시지 수도 함께 갱신하고, 메시지를 저장함
+        (같은 트랜잭션, 쿼리 2번. last_message 외래키는 커밋 시점에 검사됨)
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"WITH room AS (UPDATE {ChatRoom._meta.db_table} SET "
+                    "message_seq = message_seq + 1, "
+                    "last_message_id = nextval(pg_get_serial_sequence("
+                    f"'{ChatMessage._meta.db_table}', 'id')), "
+                    "last_message_preview = %s, last_message_at = %s, updated_at = %s "
+                    "WHERE id = %s RETURNING message_seq, last_message_id), "
+                    # 발신자를 제외한 (나가지 않은) 참여자의 안 읽은 메시지 수 증가
+                    f"unread AS (UPDATE {ChatRoomParticipant._meta.db_table} "
+                    "SET unread_count = unread_count + 1 "
+                    "WHERE chat_room_id = %s AND is_active "
+                    "AND user_id IS DISTINCT FROM %s) "
+                    "SELECT message_seq, last_message_id FROM room",
+                    [
+                        message[: ChatRoom.PREVIEW_LENGTH],
+                        now,
+                        now,
+                        chat_room_id,
+                        chat_room_id,
+                        sender_id,
+                    ],
+                )
+                row = cursor.fetchone()
+
+            if row is None:
+                raise ChatRoom.DoesNotExist("존재하지 않는 채팅방입니다.")
+
+            seq, message_id = row
+            chat_message = ChatMessage.objects.create(
+                id=message_id,
+                chat_room_id=chat_room_id,
+                sender_id=sender_id,
+                message=message,
+                file_id=file_id,
+                seq=seq,
+            )
+
+        return chat_message
+
+    @staticmethod
+    def build_message(
+        chat_room_id: int, sender_id: int, message: str, file_id: int = None
+    ) -> ChatMessage:
+        """write-behind 모드용: 아직 ID/seq 가 없는 메시지 생성 (첨부파일이 있을 때만 DB 조회)"""
+        file = None
+        if file_id:
+            file = File.objects.filter(id=file_id).first()
+            if file is None:
+                raise ValueError("존재하지 않는 첨부파일입니다.")
+        return ChatMessage(
+            chat_room_id=chat_room_id,
+            sender_id=sender_id,
+            message=message,
+            file=file,
+        )
+
+    @staticmethod
+    def reserve_messages(chat_room_id: int, messages: list) -> list:
+        """write-behind 모드용: 같은 채팅방 메시지 여러 개의 ID와 방 단위 시퀀스를 한 번에 발급
+
+        채팅방 행 UPDATE 한 번으로 시퀀스를 len(messages) 만큼 올리고, 행 잠금을 잡은
+        같은 문장 안에서 메시지 ID 시퀀스도 발급하므로 같은 방 안에서는 ID와 seq 순서가
+        항상 일치하고 seq 빈 구간도 생기지 않음. 반환된 메시지는 아직 저장되지 않았으며
+        save_messages_bulk 로 나중에 저장됨
+        """
+        if not messages:
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH room AS (UPDATE {ChatRoom._meta.db_table} "
+                "SET message_seq = message_seq + %s WHERE id = %s "
+                "RETURNING message_seq) "
+                "SELECT room.message_seq, "
+                f"nextval(pg_get_serial_sequence('{ChatMessage._meta.db_table}', 'id')) "
+                "FROM room, generate_series(1, %s)",
+                [len(messages), chat_room_id, len(messages)],
+            )
+            rows = cursor.fetchall()
+
+        if not rows:
+            raise ChatRoom.DoesNotExist("존재하지 않는 채팅방입니다.")
+
+        last_seq = rows[0][0]
+        message_ids = sorted(message_id for _, message_id in rows)
+        now = timezone.now()
+        for offset, (chat_message, message_id) in enumerate(zip(messages, message_ids)):
+            chat_message.id = message_id
+            chat_message.seq = last_seq - len(messages) + offset + 1
+            chat_message.chat_room_id = chat_room_id
+            chat_message.created_at = now
+        return messages
+
+    @staticmethod
+    def reserve_message(
+        chat_room_id: int, sender_id: int, message: str, file_id: int = None
+    ) -> ChatMessage:
+        """write-behind 모드용: 메시지 한 개의 ID와 방 단위 시퀀스 발급"""
+        chat_message = ChatService.build_message(
+            chat_room_id, sender_id, message, file_id
+        )
+        return ChatService.reserve_messages(chat_room_id, [chat_message])[0]
+
+    @staticmethod
+    def save_messages_bulk(messages: list) -> int:
+        """reserve_message 로 발급한 메시지들을 한 번의 bulk insert로 저장
+
+        채팅방 마지막 메시지와 참여자별 안 읽은 메시지 수도 채팅방/발신자 단위로 묶어
+        같은 트랜잭션 안에서 갱신
+        """
+        if not messages:
+            return 0
+
+        # 같은 방의 created_at 이 seq 순서와 같도록 정렬 후 저장
+        messages = sorted(messages, key=lambda m: (m.chat_room_id, m.seq))
+
+        last_by_room = {}
+        unread_by_sender = Counter()
+        for msg in messages:
+            last_by_room[msg.chat_room_id] = msg
+            unread_by_sender[(msg.chat_room_id, msg.sender_id)] += 1
+
+        with transaction.atomic():
+            ChatMessage.objects.bulk_create(messages)
+
+            now = timezone.now()
+            for chat_room_id, last in last_by_room.items():
+                # 다른 프로세스가 더 최신 메시지를 이미 반영했다면 덮어쓰지 않음
+                ChatRoom.objects.filter(id=chat_room_id).filter(
+                    Q(last_message__isnull=True) | Q(last_message_id__lt=last.id)
+                ).update(
+                    last_message_id=last.id,
+                    last_message_preview=last.message[: ChatRoom.PREVIEW_LENGTH],
+                    last_message_at=last.created_at,
+                    updated_at=now,
+                )
+
+            for (chat_room_id, sender_id), count in unread_by_sender.items():
+                ChatRoomParticipant.objects.filter(
+                    chat_room_id=chat_room_id, is_active=True
+                ).exclude(user_id=sender_id).update(
+                    unread_count=F("unread_count") + count
+                )
+
+            # 반영된 채팅방마다 참여자 인박스 갱신 (커밋 후 전송)
+            for chat_room_id in last_by_room:
+                ChatEventPublisher.publish_to_users(
+                    ChatService.inbox_events(chat_room_id)
+                )
+
+        return len(messages)
+
+    @staticmethod
+    def post_message(
+        chat_room_id: int, sender_id: int, message: str, file_id: int = None
+    ) -> ChatMessage:
+        """메시지 저장 후 채팅방 WebSocket 구독자에게 전송 (REST/시스템 메시지용)
+
+        전송은 트랜잭션 커밋 후 수행되므로 구독자는 항상 조회 가능한 메시지만 받음
+        """
+        chat_message = ChatService.save_message(
+            chat_room_id, sender_id, message, file_id
+        )
+        ChatEventPublisher.publish(
+            chat_room_id, ChatEventPublisher.message_event(chat_message)
+        )
+        ChatEventPublisher.publish_to_users(ChatService.inbox_events(chat_room_id))
+        return chat_message
+
+    @staticmethod
+    def inbox_events(chat_room_id: int) -> list:
+        """채팅방 참여자별 인박스 갱신 이벤트 생성: [(user_id, event), ...]
+
+        채팅방 미리보기, 참여자별 안 읽은 수, 참여자별 전체 안 읽은 수를
+        쿼리 3번으로 계산 (참여자 수와 무관)
+        """
+        room = (
+            ChatRoom.objects.filter(id=chat_room_id)
+            .values("last_message_preview", "last_message_at")
+            .first()
+        )
+        if room is None:
+            return []
+
+        participants = list(
+            ChatRoomParticipant.objects.filter(
+                chat_room_id=chat_room_id, is_active=True
+            ).values_list("user_id", "unread_count")
+        )
+        totals = dict(
+            ChatRoomParticipant.objects.filter(
+                user_id__in=[user_id for user_id, _ in participants], is_active=True
+            )
+            .order_by()
+            .values("user_id")
+            .annotate(total=Sum("unread_count"))
+            .values_list("user_id", "total")
+        )
+
+        return [
+            (
+                user_id,
+                ChatEventPublisher.room_updated_event(
+                    chat_room_id,
+                    room["last_message_preview"],
+                    room["last_message_at"],
+                    unread_count,
+                    totals.get(user_id) or 0,
+                ),
+            )
+            for user_id, unread_count in participants
+        ]
+
+    @staticmethod
+    def repair_chat_counters(chat_room_ids: list = None) -> dict:
+        """채팅방 마지막 메시지 / 안 읽은 메시지 수를 메시지 테이블 기준으로 재계산
+
+        채팅방은 전체를 다시 계산하고, 참여자는 값이 어긋난(drift) 행만 갱신
+        """
+        rooms = ChatRoom.objects.all()
+        # 나간 참여자는 안 읽은 수를 쌓지 않으므로 제외 (다시 참여할 때 재계산)
+        participants = ChatRoomParticipant.objects.filter(is_active=True)
+        if chat_room_ids:
+            rooms = rooms.filter(id__in=chat_room_ids)
+            participants = participants.filter(chat_room_id__in=chat_room_ids)
+
+        last_message = ChatMessage.objects.filter(
+            chat_room=OuterRef("pk"), is_deleted=False
+        ).order_by("-created_at", "-id")
+        unread = (
+            ChatMessage.objects.filter(
+                chat_room=OuterRef("chat_room"),
+                is_deleted=False,
+                id__gt=Coalesce(OuterRef("last_read_message_id"), 0),
+            )
+            .exclude(sender=OuterRef("user"))
+            .values("chat_room")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+
+        with transaction.atomic():
+            room_count = rooms.update(
+                last_message_id=Subquery(last_message.values("id")[:1]),
+                last_message_preview=Coalesce(
+                    Substr(
+                        Subquery(last_message.values("message")[:1]),
+                        1,
+                        ChatRoom.PREVIEW_LENGTH,
+                    ),
+                    Value(""),
+                ),
+                last_message_at=Subquery(last_message.values("created_at")[:1]),
+            )
+
+            drifted_participant_ids = list(
+                participants.annotate(expected=Coalesce(Subquery(unread), 0))
+                .exclude(unread_count=F("expected"))
+                .values_list("id", flat=True)
+            )
+            participant_count = ChatRoomParticipant.objects.filter(
+                id__in=drifted_participant_ids
+            ).update(unread_count=Coalesce(Subquery(unread), 0))
+
+        return {"rooms": room_count, "participants": participant_count}
+
+    @staticmethod
+    def get_messages_after(
+        chat_room_id: int, after_id: int = None, after_seq: int = None, limit: int = 200
+    ) -> list:
+        """재연결 시 누락 메시지 조회 (과거순, 최대 limit + 1 건)
+
+        after_seq 는 (chat_room, seq) 유니크 인덱스, after_id 는 (chat_room, id)
+        인덱스 범위 스캔으로 처리. limit 초과 여부는 호출 측에서 판단
+        """
+        messages = ChatMessage.objects.filter(
+            chat_room_id=chat_room_id, is_deleted=False
+        ).select_related("sender", "file")
+        if after_seq is not None:
+            messages = messages.filter(seq__gt=after_seq).order_by("seq")
+        else:
+            messages = messages.filter(id__gt=after_id or 0).order_by("id")
+        return list(messages[: limit + 1])
+
+    @staticmethod
+    def latest_message_id(chat_room_id: int) -> int:
+        """채팅방 마지막 메시지 ID (메시지가 없으면 0)"""
+        return (
+            ChatRoom.objects.filter(id=chat_room_id)
+            .values_list("last_message_id", flat=True)
+            .first()
+            or 0
+        )
+
+    @staticmethod
+    def mark_messages_read(chat_room_id: int, user_id: int, message_id: int) -> bool:
+        """마지막 읽은 메시지를 앞으로만 이동하고 안 읽은 메시지 수 재계산
+
+        조건부 UPDATE 한 번으로 처리하므로 이미 같은(또는 더 최근) 위치를 읽은 경우
+        행을 다시 쓰지 않음. 해당 채팅방의 메시지가 아니면 무시. 갱신 여부 반환
+        """
+        unread = (
+            ChatMessage.objects.filter(
+                chat_room_id=chat_room_id, is_deleted=False, id__gt=message_id
+            )
+            .exclude(sender_id=user_id)
+            .values("chat_room")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+
+        updated = (
+            ChatRoomParticipant.objects.filter(
+                chat_room_id=chat_room_id, user_id=user_id, is_active=True
+            )
+            .filter(
+                Q(last_read_message__isnull=True)
+                | Q(last_read_message_id__lt=message_id)
+            )
+            .filter(
+                Exists(
+                    ChatMessage.objects.filter(id=message_id, chat_room_id=chat_room_id)
+                )
+            )
+            .update(
+                last_read_message_id=message_id,
+                unread_count=Coalesce(Subquery(unread), 0),
+                updated_at=timezone.now(),
+            )
+        )
+        return updated > 0
+
+    @staticmethod
+    def mark_messages_read_bulk(entries: list) -> int:
+        """읽음 처리 버퍼 flush 용: [((chat_room_id, user_id), message_id), ...]"""
+        updated = 0
+        with transaction.atomic():
+            for (chat_room_id, user_id), message_id in entries:
+                if ChatService.mark_messages_read(chat_room_id, user_id, message_id):
+                    updated += 1
+        return updated
+
     @staticmethod
     def create_chat_room(product_id: int, user_id: int) -> dict:
         """채팅방 생성 서비스"""
         try:
             # 상품 조회
-            product = Product.objects.select_related("user").get(id=product_id)
+            product = Product.objects.get(id=product_id)
 
             # 자신의 상품에 대해 채팅방 생성 방지
             if product.user_id == user_id:
@@ -31,39 +406,41 @@ class ChatService:
                     "data": None,
                 }
 
-            # 이미 해당 상품에 대한 채팅방이 있는지 확인
-            existing_chat = ChatRoom.objects.filter(
-                product_id=product_id,
-                participants__user_id=user_id,
-                participants__is_active=True,
-            ).first()
+            # (상품, 구매자) 유니크 제약으로 동시 요청에도 채팅방은 하나만 생성됨
+            with transaction.atomic():
+                chat_room, created = ChatRoom.objects.get_or_create(
+                    product=product,
+                    buyer_id=user_id,
+                    defaults={
+                        "seller_id": product.user_id,
+                        "status": ChatRoom.Status.ACTIVE,
+                    },
+                )
+
+                if created:
+                    # 판매자와 구매자를 참여자로 추가
+                    ChatRoomParticipant.objects.bulk_create(
+                        [
+                            ChatRoomParticipant(
+                                chat_room=chat_room, user_id=product.user_id
+                            ),
+                            ChatRoomParticipant(chat_room=chat_room, user_id=user_id),
+                        ]
+                    )
+                else:
+                    # 채팅방을 나갔던 구매자는 다시 참여 (나가 있던 동안의 안 읽은 수 재계산)
+                    if ChatRoomParticipant.objects.filter(
+                        chat_room=chat_room, user_id=user_id, is_active=False
+                    ).update(is_active=True):
+                        ChatService.repair_chat_counters([chat_room.id])
 
-            if existing_chat:
+            if not created:
                 return {
                     "success": True,
                     "message": "이미 존재하는 채팅방입니다.",
-                    "data": {"id": existing_chat.id},
+                    "data": {"id": chat_room.id},
                 }
 
-            # 새 채팅방 생성
-            chat_room = ChatRoom.objects.create(
-                product=product, status=ChatRoom.Status.ACTIVE
-            )
-
-            # 구매자(현재 사용자) 객체 가져오기
-            from a_user.models import User
-
-            buyer = User.objects.get(id=user_id)
-
-            # 판매자와 구매자를 참여자로 추가
-            ChatRoomParticipant.objects.create(
-                chat_room=chat_room, user=product.user, is_active=True
-            )
-
-            ChatRoomParticipant.objects.create(
-                chat_room=chat_room, user=buyer, is_active=True
-            )
-
             return {
                 "success": True,
                 "message": "채팅방이 생성되었습니다.",
@@ -76,12 +453,6 @@ class ChatService:
                 "message": "존재하지 않는 상품입니다.",
                 "data": None,
             }
-        except User.DoesNotExist:
-            return {
-                "success": False,
-                "message": "존재하지 않는 사용자입니다.",
-                "data": None,
-            }
         except Exception as e:
             return {
                 "success": False,
@@ -93,76 +464,36 @@ class ChatService:
     def get_chat_rooms(user_id: int, page: int = 1, page_size: int = 20) -> dict:
         """사용자의 채팅방 목록 조회"""
         try:
-            # 사용자가 참여 중인 채팅방 쿼리
+            # 사용자가 참여 중인 채팅방 쿼리 (참여자 기준으로 조회하여 안 읽은 메시지 수를 함께 가져옴)
             queryset = (
-                ChatRoom.objects.filter(
-                    participants__user_id=user_id, participants__is_active=True
+                ChatRoomParticipant.objects.filter(user_id=user_id, is_active=True)
+                .select_related("chat_room", "chat_room__product")
+                .prefetch_related(
+                    Prefetch(
+                        "chat_room__product__images",
+                        queryset=ProductImage.objects.select_related("file"),
+                    )
                 )
-                .select_related("product")
-                .distinct()
             )
 
-            # 총 개수 파악
-            total_count = queryset.count()
-            total_pages = math.ceil(total_count / page_size)
-
             # 페이지 범위 설정
             start_idx = (page - 1) * page_size
             end_idx = start_idx + page_size
 
-            # 간소화된 쿼리로 변경
-            chat_rooms = queryset.order_by("-updated_at")[start_idx:end_idx]
+            participations = queryset.order_by("-chat_room__updated_at")[
+                start_idx:end_idx
+            ]
 
-            # 결과 변환
+            # 결과 변환 (마지막 메시지, 안 읽은 메시지 수는 비정규화 필드 사용)
             result = []
-            for room in chat_rooms:
-                # 마지막 메시지 조회
-                last_message = (
-                    ChatMessage.objects.filter(chat_room=room, is_deleted=False)
-                    .order_by("-created_at")
-                    .first()
-                )
-
-                # 안 읽은 메시지 수 계산
-                participant = ChatRoomParticipant.objects.filter(
-                    chat_room=room, user_id=user_id
-                ).first()
-
-                last_read_time = None
-                if participant and participant.last_read_message:
-                    last_read_time = participant.last_read_message.created_at
-
-                unread_count = 0
-                if last_read_time:
-                    unread_count = (
-                        ChatMessage.objects.filter(
-                            chat_room=room,
-                            created_at__gt=last_read_time,
-                            sender_id__isnull=False,
-                            is_deleted=False,
-                        )
-                        .exclude(sender_id=user_id)
-                        .count()
-                    )
-                else:
-                    unread_count = (
-                        ChatMessage.objects.filter(
-                            chat_room=room, sender_id__isnull=False, is_deleted=False
-                        )
-                        .exclude(sender_id=user_id)
-                        .count()
-                    )
+            for participant in participations:
+                room = participant.chat_room
 
                 # 이미지 URL 처리
                 image_url = None
-                product_image = (
-                    ProductImage.objects.filter(product=room.product)
-                    .select_related("file")
-                    .first()
-                )
-
-                if product_image and product_image.file:
-                    image_url = product_image.file.url
+                product_images = list(room.product.images.all())
+                if product_images and product_images[0].file:
+                    image_url = product_images[0].file.url
 
                 result.append(
                     {
@@ -170,11 +501,9 @@ class ChatService:
                         "product_id": room.product.id,
                         "product_title": room.product.title,
                         "product_image_url": image_url,
-                        "last_message": last_message.message if last_message else None,
-                        "last_message_time": (
-                            last_message.created_at if last_message else None
-                        ),
-                        "unread_count": unread_count,
+                        "last_message": room.last_message_preview or None,
+                        "last_message_time": room.last_message_at,
+                        "unread_count": participant.unread_count,
                     }
                 )
 
@@ -191,6 +520,21 @@ class ChatService:
                 "data": [],
             }
 
+    @staticmethod
+    def legacy_buyer_id(chat_room: ChatRoom):
+        """buyer 가 비어 있는 채팅방의 구매자 ID (판매자가 아닌 참여자, 참여 중인 사용자 우선)
+
+        중복 채팅방 정리 시 buyer 는 (상품, 구매자)별 최신 채팅방에만 채워졌으므로
+        나머지 기존 채팅방은 참여자에서 구매자를 찾음
+        """
+        return (
+            ChatRoomParticipant.objects.filter(chat_room_id=chat_room.id)
+            .exclude(user_id=chat_room.product.user_id)
+            .order_by("-is_active", "id")
+            .values_list("user_id", flat=True)
+            .first()
+        )
+
     @staticmethod
     def get_chat_room_detail(chat_room_id: int, user_id: int) -> dict:
         """채팅방 상세 정보 조회"""
@@ -205,25 +549,11 @@ class ChatService:
                     "data": None,
                 }
 
-            # 채팅방 정보 조회
-            chat_room = ChatRoom.objects.select_related("product", "product__user").get(
-                id=chat_room_id
-            )
-
-            # 판매자 정보
-            seller = chat_room.product.user
-
-            # 구매자 정보 (판매자가 아닌 참여자)
-            buyer = None
-            buyer_participant = (
-                ChatRoomParticipant.objects.filter(chat_room=chat_room)
-                .exclude(user_id=seller.id)
-                .select_related("user")
-                .first()
-            )
-
-            if buyer_participant:
-                buyer = buyer_participant.user
+            # 채팅방 정보 조회 (판매자/구매자는 비정규화 필드의 ID 로 사용자 카드 조회)
+            chat_room = ChatRoom.objects.select_related("product").get(id=chat_room_id)
+            seller_id = chat_room.product.user_id
+            buyer_id = chat_room.buyer_id or ChatService.legacy_buyer_id(chat_room)
+            cards = UserCardService.get_many([seller_id, buyer_id])
 
             # 상품 이미지 조회
             product_image_url = None
@@ -236,16 +566,6 @@ class ChatService:
             if product_image and product_image.file:
                 product_image_url = product_image.file.url
 
-            # 판매자 프로필 이미지 조회
-            seller_profile_image_url = None
-            if hasattr(seller, "profile_image") and seller.profile_image:
-                seller_profile_image_url = seller.profile_image.url
-
-            # 구매자 프로필 이미지 조회
-            buyer_profile_image_url = None
-            if buyer and hasattr(buyer, "profile_image") and buyer.profile_image:
-                buyer_profile_image_url = buyer.profile_image.url
-
             return {
                 "success": True,
                 "message": "채팅방 정보를 조회했습니다.",
@@ -260,22 +580,8 @@ class ChatService:
                         "status": chat_room.product.status,
                         "price_offer": chat_room.product.accept_price_offer,
                     },
-                    "seller": {
-                        "id": seller.id,
-                        "nickname": seller.nickname,
-                        "profile_image_url": seller_profile_image_url,
-                        "rating_score": float(seller.rating_score),
-                    },
-                    "buyer": (
-                        {
-                            "id": buyer.id,
-                            "nickname": buyer.nickname,
-                            "profile_image_url": buyer_profile_image_url,
-                            "rating_score": float(buyer.rating_score),
-                        }
-                        if buyer
-                        else None
-                    ),
+                    "seller": cards[seller_id],
+                    "buyer": cards.get(buyer_id),
                 },
             }
 
@@ -292,16 +598,47 @@ class ChatService:
                 "data": None,
             }
 
+    @staticmethod
+    def _message_to_dict(msg) -> dict:
+        """메시지 객체를 응답용 딕셔너리로 변환"""
+        return {
+            "id": msg.id,
+            "seq": msg.seq,
+            "sender_id": msg.sender.id,
+            "sender_nickname": msg.sender.nickname,
+            "message": msg.message,
+            "created_at": msg.created_at,
+            "is_deleted": msg.is_deleted,
+            "file_url": msg.file.url if msg.file else None,
+        }
+
     @staticmethod
     def get_chat_messages(
-        chat_room_id: int, user_id: int, page: int = 1, page_size: int = 20
+        chat_room_id: int,
+        user_id: int,
+        page: int = 1,
+        page_size: int = 20,
+        before_id: int = None,
+        after_id: int = None,
     ) -> dict:
-        """채팅방 메시지 조회"""
+        """채팅방 메시지 조회
+
+        - 커서 미지정: 기존 페이지 번호 방식 (최신순)
+        - before_id: 해당 메시지보다 이전 메시지를 최신순으로 조회 (과거 스크롤)
+        - after_id: 해당 메시지 이후 메시지를 과거순으로 조회 (마지막으로 받은 메시지 이후 동기화)
+
+        커서 조회는 (chat_room, id) 인덱스 범위 스캔만 사용하며 COUNT 쿼리를 하지 않음.
+        before_id 조회에서 DB 에 남은 메시지가 부족하면 콜드 보관 파일에서 이어서 조회
+        """
         try:
             # 채팅방 존재 및 권한 확인
-            participant = ChatRoomParticipant.objects.filter(
-                chat_room_id=chat_room_id, user_id=user_id, is_active=True
-            ).first()
+            participant = (
+                ChatRoomParticipant.objects.filter(
+                    chat_room_id=chat_room_id, user_id=user_id, is_active=True
+                )
+                .select_related("chat_room")
+                .first()
+            )
 
             if not participant:
                 return {
@@ -311,60 +648,77 @@ class ChatService:
                 }
 
             # 메시지 쿼리
-            messages = (
-                ChatMessage.objects.filter(chat_room_id=chat_room_id, is_deleted=False)
-                .select_related("sender")
-                .order_by("-created_at")
-            )
-
-            # 총 개수 파악
-            total_count = messages.count()
-            total_pages = math.ceil(total_count / page_size)
-
-            # 페이지네이션
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-
-            messages = messages[start_idx:end_idx]
-
-            # 참여자 정보 업데이트 (마지막 읽은 메시지)
-            latest_message = (
-                ChatMessage.objects.filter(chat_room_id=chat_room_id)
-                .order_by("-created_at")
-                .first()
-            )
-
-            if latest_message:
-                participant.last_read_message = latest_message
-                participant.save(update_fields=["last_read_message", "updated_at"])
+            messages = ChatMessage.objects.filter(
+                chat_room_id=chat_room_id, is_deleted=False
+            ).select_related("sender", "file")
+
+            if before_id is not None or after_id is not None:
+                # 커서 기반 조회: 전체 수 / 페이지 대신 has_more 와 다음 커서 반환
+                if before_id is not None:
+                    messages = messages.filter(id__lt=before_id)
+                if after_id is not None:
+                    messages = messages.filter(id__gt=after_id).order_by("id")
+                else:
+                    messages = messages.order_by("-id")
+
+                messages = [
+                    ChatService._message_to_dict(msg)
+                    for msg in messages[: page_size + 1]
+                ]
+                if after_id is None and len(messages) <= page_size:
+                    cursor = messages[-1]["id"] if messages else before_id
+                    messages += ChatArchiveService.load_archived_messages(
+                        chat_room_id, cursor, page_size + 1 - len(messages)
+                    )
+                has_more = len(messages) > page_size
+                result = messages[:page_size]
+                pagination = {
+                    "has_more": has_more,
+                    "next_before_id": (
+                        result[-1]["id"] if after_id is None and has_more else None
+                    ),
+                    "next_after_id": (
+                        result[-1]["id"]
+                        if after_id is not None and result
+                        else after_id
+                    ),
+                }
+            else:
+                messages = messages.order_by("-created_at")
+
+                # 총 개수 파악
+                total_count = messages.count()
+
+                # 페이지네이션
+                start_idx = (page - 1) * page_size
+                end_idx = start_idx + page_size
+
+                result = [
+                    ChatService._message_to_dict(msg)
+                    for msg in messages[start_idx:end_idx]
+                ]
+                pagination = {
+                    "total_count": total_count,
+                    "page": page,
+                    "total_pages": math.ceil(total_count / page_size),
+                    "has_more": end_idx < total_count,
+                }
 
-            # 결과 변환
-            result = []
-            for msg in messages:
-                file_url = None
-                if msg.file:
-                    file_url = msg.file.url
+            # 참여자 정보 업데이트 (마지막 읽은 메시지는 앞으로만 이동)
+            latest_message_id = participant.chat_room.last_message_id
 
-                result.append(
-                    {
-                        "id": msg.id,
-                        "sender_id": msg.sender.id,
-                        "sender_nickname": msg.sender.nickname,
-                        "message": msg.message,
-                        "created_at": msg.created_at,
-                        "is_deleted": msg.is_deleted,
-                        "file_url": file_url,
-                    }
-                )
+            if latest_message_id and (
+                participant.last_read_message_id is None
+                or participant.last_read_message_id < latest_message_id
+            ):
+                ChatService.mark_messages_read(chat_room_id, user_id, latest_message_id)
 
             return {
                 "success": True,
                 "message": "메시지를 조회했습니다.",
                 "data": result,
-                "total_count": total_count,
-                "page": page,
                 "page_size": page_size,
-                "total_pages": total_pages,
+                **pagination,
             }
 
         except Exception as e:
@@ -376,8 +730,134 @@ class ChatService:
                 "page": page,
                 "page_size": page_size,
                 "total_pages": 0,
+                "has_more": False,
             }
 
+    @staticmethod
+    def get_chat_room_presence(chat_room_id: int, user_id: int) -> dict:
+        """채팅방 참여자 중 접속해 있는 사용자 조회 (DB 1회 + 캐시 1회)"""
+        participant_ids = list(
+            ChatRoomParticipant.objects.filter(
+                chat_room_id=chat_room_id, is_active=True
+            ).values_list("user_id", flat=True)
+        )
+        if user_id not in participant_ids:
+            return {
+                "success": False,
+                "message": "채팅방에 접근할 권한이 없습니다.",
+                "data": None,
+            }
+
+        online_user_ids = ChatPresence.viewing_user_ids(chat_room_id, participant_ids)
+        return {
+            "success": True,
+            "message": "접속 상태를 조회했습니다.",
+            "data": {"online_user_ids": sorted(online_user_ids)},
+        }
+
+    SEARCH_MIN_LENGTH = 2
+    SEARCH_SNIPPET_RADIUS = 30
+
+    @staticmethod
+    def _search_snippet(text: str, query: str) -> tuple:
+        """검색어 주변을 잘라낸 미리보기와 미리보기 안의 검색어 위치 [(시작, 끝)] 반환"""
+        lowered, needle = text.lower(), query.lower()
+        first = lowered.find(needle)
+        if first < 0:
+            # 대소문자 변환으로 길이가 달라지는 문자 등 예외적인 경우
+            first = 0
+        radius = ChatService.SEARCH_SNIPPET_RADIUS
+        start = max(0, first - radius)
+        end = min(len(text), first + len(query) + radius)
+
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        snippet = prefix + text[start:end] + suffix
+
+        highlights = []
+        position = lowered.find(needle, start)
+        while 0 <= position and position + len(needle) <= end:
+            offset = position - start + len(prefix)
+            highlights.append([offset, offset + len(needle)])
+            position = lowered.find(needle, position + len(needle))
+        return snippet, highlights
+
+    @staticmethod
+    def search_queryset(user_id: int, query: str):
+        """참여 중인 채팅방에서 query 를 포함하는 메시지"""
+        room_ids = ChatRoomParticipant.objects.filter(
+            user_id=user_id, is_active=True
+        ).values("chat_room_id")
+        return ChatMessage.objects.filter(
+            chat_room_id__in=Subquery(room_ids),
+            is_deleted=False,
+            message__icontains=query,
+        )
+
+    @staticmethod
+    def search_messages(
+        user_id: int, query: str, before_id: int = None, page_size: int = 20
+    ) -> dict:
+        """참여 중인 채팅방의 메시지 검색 (최신순, before_id 커서)
+
+        UPPER(message) 트라이그램 GIN 인덱스로 message__icontains 조건을 처리하며
+        COUNT 쿼리 없이 page_size + 1 건만 읽어 다음 페이지 여부를 판단함.
+        콜드 보관된 메시지는 검색 대상이 아님
+        """
+        query = (query or "").strip()
+        if len(query) < ChatService.SEARCH_MIN_LENGTH:
+            return {
+                "success": False,
+                "message": f"검색어는 {ChatService.SEARCH_MIN_LENGTH}자 이상 입력해주세요.",
+                "data": [],
+                "has_more": False,
+                "next_before_id": None,
+            }
+
+        messages = ChatService.search_queryset(user_id, query)
+        if before_id is not None:
+            messages = messages.filter(id__lt=before_id)
+
+        rows = list(
+            messages.order_by("-id").values(
+                "id",
+                "seq",
+                "chat_room_id",
+                "chat_room__product__title",
+                "sender_id",
+                "sender__nickname",
+                "message",
+                "created_at",
+            )[: page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        data = []
+        for row in rows:
+            snippet, highlights = ChatService._search_snippet(row["message"], query)
+            data.append(
+                {
+                    "id": row["id"],
+                    "seq": row["seq"],
+                    "chat_room_id": row["chat_room_id"],
+                    "product_title": row["chat_room__product__title"],
+                    "sender_id": row["sender_id"],
+                    "sender_nickname": row["sender__nickname"],
+                    "snippet": snippet,
+                    "highlights": highlights,
+                    "created_at": row["created_at"],
+                }
+            )
+
+        return {
+            "success": True,
+            "message": "메시지를 검색했습니다.",
+            "data": data,
+            "has_more": has_more,
+            "next_before_id": rows[-1]["id"] if has_more else None,
+        }
+
     @staticmethod
     def send_message(
         chat_room_id: int, user_id: int, message: str, file_id: int = None
@@ -394,35 +874,15 @@ class ChatService:
                     "data": None,
                 }
 
-            # 메시지 저장
-            chat_message = ChatMessage.objects.create(
-                chat_room_id=chat_room_id,
-                sender_id=user_id,
-                message=message,
-                file_id=file_id,
+            # 메시지 저장 및 WebSocket 구독자에게 전송
+            chat_message = ChatService.post_message(
+                chat_room_id, user_id, message, file_id
             )
 
-            # 채팅방 갱신 시간 업데이트 (최근 메시지 순 정렬 위함)
-            chat_room = ChatRoom.objects.get(id=chat_room_id)
-            chat_room.save(update_fields=["updated_at"])
-
-            # 결과 반환
-            file_url = None
-            if chat_message.file:
-                file_url = chat_message.file.url
-
             return {
                 "success": True,
                 "message": "메시지를 전송했습니다.",
-                "data": {
-                    "id": chat_message.id,
-                    "sender_id": chat_message.sender.id,
-                    "sender_nickname": chat_message.sender.nickname,
-                    "message": chat_message.message,
-                    "created_at": chat_message.created_at,
-                    "is_deleted": chat_message.is_deleted,
-                    "file_url": file_url,
-                },
+                "data": ChatService._message_to_dict(chat_message),
             }
 
         except Exception as e:
@@ -432,6 +892,28 @@ class ChatService:
                 "data": None,
             }
 
+    @staticmethod
+    def _publish_appointment_event(appointment, name: str) -> None:
+        """거래약속 변경을 채팅방과 판매자/구매자 인박스로 실시간 전달"""
+        ChatEventPublisher.publish_trade_event(
+            appointment.chat_room_id,
+            [appointment.seller_id, appointment.buyer_id],
+            name,
+            {
+                "id": appointment.id,
+                "product_id": appointment.product_id,
+                "seller_id": appointment.seller_id,
+                "buyer_id": appointment.buyer_id,
+                "appointment_date": appointment.appointment_date.isoformat(),
+                "location": {
+                    "latitude": appointment.location.y,
+                    "longitude": appointment.location.x,
+                    "description": appointment.location_description,
+                },
+                "status": appointment.status,
+            },
+        )
+
     @staticmethod
     def create_appointment(
         chat_room_id: int,
@@ -444,7 +926,9 @@ class ChatService:
         """거래약속 생성 서비스"""
         try:
             # 채팅방 존재 및 권한 확인
-            chat_room = ChatRoom.objects.select_related("product").get(id=chat_room_id)
+            chat_room = ChatRoom.objects.select_related(
+                "product", "product__user", "buyer"
+            ).get(id=chat_room_id)
 
             # 채팅방 참여자 확인
             if not ChatRoomParticipant.objects.filter(
@@ -456,26 +940,17 @@ class ChatService:
                     "data": None,
                 }
 
-            # 판매자와 구매자 구분
+            # 판매자와 구매자 구분 (채팅방 비정규화 필드)
             product = chat_room.product
-            seller_id = product.user_id
-
-            # 판매자 정보 가져오기
-            from a_user.models import User
-
-            seller = User.objects.get(id=seller_id)
-
-            # 구매자 찾기 (판매자가 아닌 사용자)
-            buyer = None
-            buyer_participant = (
-                ChatRoomParticipant.objects.filter(chat_room=chat_room)
-                .exclude(user_id=seller_id)
-                .select_related("user")
-                .first()
-            )
-
-            if buyer_participant:
-                buyer = buyer_participant.user
+            seller = product.user
+            seller_id = seller.id
+            buyer = chat_room.buyer
+            if buyer is None:
+                buyer_id = ChatService.legacy_buyer_id(chat_room)
+                if buyer_id:
+                    buyer = User.objects.get(id=buyer_id)
+
+            if buyer:
                 buyer_id = buyer.id
             else:
                 return {
@@ -487,24 +962,33 @@ class ChatService:
             # 약속 장소 생성
             appointment_location = Point(location_lng, location_lat, srid=4326)
 
-            # 기존 약속이 있는지 확인하고 없으면 새로 생성
-            appointment, created = TradeAppointment.objects.update_or_create(
-                chat_room=chat_room,
-                product=product,
-                defaults={
-                    "seller_id": seller_id,
-                    "buyer_id": buyer_id,
-                    "appointment_date": appointment_date,
-                    "location": appointment_location,
-                    "location_description": location_desc,
-                    "status": TradeAppointment.Status.PENDING,
-                },
-            )
+            with transaction.atomic():
+                # 상품 행을 잠근 뒤 현재 상태 기준으로 약속 설정 / 예약 처리
+                locked = TradeStateMachine.lock(product.id)
+                if locked.status == Product.Status.SOLDOUT:
+                    return {
+                        "success": False,
+                        "message": "이미 판매 완료된 상품입니다.",
+                        "data": None,
+                    }
+
+                # 기존 약속이 있는지 확인하고 없으면 새로 생성
+                appointment, created = TradeAppointment.objects.update_or_create(
+                    chat_room=chat_room,
+                    product=product,
+                    defaults={
+                        "seller_id": seller_id,
+                        "buyer_id": buyer_id,
+                        "appointment_date": appointment_date,
+                        "location": appointment_location,
+                        "location_description": location_desc,
+                        "status": TradeAppointment.Status.PENDING,
+                    },
+                )
 
-            # 상품 상태를 예약중으로 변경
-            if created and product.status == Product.Status.SELLING:
-                product.status = Product.Status.RESERVED
-                product.save(update_fields=["status", "updated_at"])
+                # 상품 상태를 예약중으로 변경 (취소 후 다시 잡은 약속 포함)
+                if locked.status == Product.Status.SELLING:
+                    TradeStateMachine.transition(locked, Product.Status.RESERVED)
 
             # 약속 생성 메시지 전송
             appointment_time = appointment.appointment_date.strftime(
@@ -513,15 +997,11 @@ class ChatService:
             system_message = f"[시스템] 거래약속이 설정되었습니다. \n날짜: {appointment_time}\n장소: {location_desc}"
 
             # 시스템 메시지를 보낼 때 현재 사용자를 sender로 설정
-            ChatMessage.objects.create(
-                chat_room=chat_room,
-                sender_id=user_id,
-                message=system_message,
+            ChatService.post_message(chat_room.id, user_id, system_message)
+            ChatService._publish_appointment_event(
+                appointment, "appointment_created" if created else "appointment_updated"
             )
 
-            # 채팅방 갱신 시간 업데이트
-            chat_room.save(update_fields=["updated_at"])
-
             return {
                 "success": True,
                 "message": "거래약속이 생성되었습니다.",
@@ -674,65 +1154,64 @@ class ChatService:
                     "data": None,
                 }
 
-            # 상태 변경 액션 처리
-            if action == "confirm":
-                if appointment.status != TradeAppointment.Status.PENDING:
-                    return {
-                        "success": False,
-                        "message": "대기 상태인 약속만 확정할 수 있습니다.",
-                        "data": None,
-                    }
-                appointment.status = TradeAppointment.Status.CONFIRMED
-                message = "거래약속이 확정되었습니다."
-                system_message = "[시스템] 거래약속이 확정되었습니다."
-            elif action == "cancel":
-                if appointment.status == TradeAppointment.Status.COMPLETED:
-                    return {
-                        "success": False,
-                        "message": "이미 완료된 약속은 취소할 수 없습니다.",
-                        "data": None,
-                    }
-                appointment.status = TradeAppointment.Status.CANCELED
-                message = "거래약속이 취소되었습니다."
-                system_message = "[시스템] 거래약속이 취소되었습니다."
-
-                # 상품 상태를 다시 판매중으로 변경 (이미 판매완료가 아닌 경우)
-                product = appointment.product
-                if product.status == Product.Status.RESERVED:
-                    product.status = Product.Status.SELLING
-                    product.save(update_fields=["status", "updated_at"])
-            elif action == "complete":
-                if appointment.status not in [
-                    TradeAppointment.Status.PENDING,
-                    TradeAppointment.Status.CONFIRMED,
-                ]:
+            with transaction.atomic():
+                # 상품 행을 잠그고 약속 상태를 다시 읽어 동시 변경을 순서대로 처리
+                appointment.product = TradeStateMachine.lock(appointment.product_id)
+                appointment.refresh_from_db(fields=["status"])
+
+                # 상태 변경 액션 처리
+                if action == "confirm":
+                    if appointment.status != TradeAppointment.Status.PENDING:
+                        return {
+                            "success": False,
+                            "message": "대기 상태인 약속만 확정할 수 있습니다.",
+                            "data": None,
+                        }
+                    appointment.status = TradeAppointment.Status.CONFIRMED
+                    message = "거래약속이 확정되었습니다."
+                    system_message = "[시스템] 거래약속이 확정되었습니다."
+                elif action == "cancel":
+                    if appointment.status == TradeAppointment.Status.COMPLETED:
+                        return {
+                            "success": False,
+                            "message": "이미 완료된 약속은 취소할 수 없습니다.",
+                            "data": None,
+                        }
+                    appointment.status = TradeAppointment.Status.CANCELED
+                    message = "거래약속이 취소되었습니다."
+                    system_message = "[시스템] 거래약속이 취소되었습니다."
+
+                    # 상품 상태를 다시 판매중으로 변경 (이미 판매완료가 아닌 경우)
+                    if appointment.product.status == Product.Status.RESERVED:
+                        TradeStateMachine.transition(
+                            appointment.product, Product.Status.SELLING
+                        )
+                elif action == "complete":
+                    if appointment.status not in [
+                        TradeAppointment.Status.PENDING,
+                        TradeAppointment.Status.CONFIRMED,
+                    ]:
+                        return {
+                            "success": False,
+                            "message": "대기 또는 확정 상태인 약속만 완료 처리할 수 있습니다.",
+                            "data": None,
+                        }
+                    appointment.status = TradeAppointment.Status.COMPLETED
+                    message = "거래약속이 완료 처리되었습니다."
+                    system_message = "[시스템] 거래약속이 완료되었습니다. 거래 후기와 매너 평가를 남겨보세요!"
+                else:
                     return {
                         "success": False,
-                        "message": "대기 또는 확정 상태인 약속만 완료 처리할 수 있습니다.",
+                        "message": "유효하지 않은 액션입니다. (confirm/cancel/complete 중 하나)",
                         "data": None,
                     }
-                appointment.status = TradeAppointment.Status.COMPLETED
-                message = "거래약속이 완료 처리되었습니다."
-                system_message = "[시스템] 거래약속이 완료되었습니다. 거래 후기와 매너 평가를 남겨보세요!"
-            else:
-                return {
-                    "success": False,
-                    "message": "유효하지 않은 액션입니다. (confirm/cancel/complete 중 하나)",
-                    "data": None,
-                }
 
-            # 약속 상태 업데이트
-            appointment.save(update_fields=["status", "updated_at"])
+                # 약속 상태 업데이트
+                appointment.save(update_fields=["status", "updated_at"])
 
             # 시스템 메시지 추가 - 여기도 sender=None 대신 sender_id=user_id 사용
-            ChatMessage.objects.create(
-                chat_room=appointment.chat_room,
-                sender_id=user_id,  # None 대신 현재 사용자 ID 사용
-                message=system_message,
-            )
-
-            # 채팅방 갱신 시간 업데이트
-            appointment.chat_room.save(update_fields=["updated_at"])
+            ChatService.post_message(appointment.chat_room_id, user_id, system_message)
+            ChatService._publish_appointment_event(appointment, "appointment_updated")
 
             return {
                 "success": True,
@@ -0,0 +1,99 @@
+import logging
+
+from a_apis.models import ChatRoomParticipant
+from channels.db import database_sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+class ChatAccessCache:
+    """WebSocket 연결 시 사용자 식별 정보 / 채팅방 참여 여부 캐시
+
+    배포 직후처럼 재연결이 몰릴 때 연결마다 사용자 조회와 참여자 조회가 DB로 가지 않도록
+    Django 캐시(운영 환경 Redis)에 짧게 보관함. 참여 여부는 참여 중인 경우만 캐시하고,
+    닉네임 변경 / 회원 탈퇴 / 채팅방 나가기 시 invalidate_* 로 즉시 삭제
+    """
+
+    USER_TTL = 300
+    MEMBER_TTL = 300
+
+    @staticmethod
+    def user_key(user_id) -> str:
+        return f"chat:user:{user_id}"
+
+    @staticmethod
+    def member_key(chat_room_id, user_id) -> str:
+        return f"chat:member:{chat_room_id}:{user_id}"
+
+    @staticmethod
+    def _load_user(user_id: int):
+        data = (
+            User.objects.filter(id=user_id, is_active=True)
+            .values("id", "email", "nickname")
+            .first()
+        )
+        if data is not None:
+            cache.set(ChatAccessCache.user_key(user_id), data, ChatAccessCache.USER_TTL)
+        return data
+
+    @staticmethod
+    def _load_membership(chat_room_id: int, user_id: int) -> bool:
+        exists = ChatRoomParticipant.objects.filter(
+            chat_room_id=chat_room_id, user_id=user_id, is_active=True
+        ).exists()
+        if exists:
+            cache.set(
+                ChatAccessCache.member_key(chat_room_id, user_id),
+                True,
+                ChatAccessCache.MEMBER_TTL,
+            )
+        return exists
+
+    @staticmethod
+    async def aget_user(user_id: int):
+        """활성 사용자 반환 (캐시 우선). 없거나 탈퇴한 사용자면 None
+
+        반환되는 User 는 id/email/nickname 만 채워진 인스턴스이므로
+        다른 필드가 필요하면 DB에서 다시 조회해야 함
+        """
+        data = await cache.aget(ChatAccessCache.user_key(user_id))
+        if data is None:
+            data = await database_sync_to_async(ChatAccessCache._load_user)(user_id)
+        if data is None:
+            return None
+
+        user = User(**data)
+        user._state.adding = False
+        return user
+
+    @staticmethod
+    async def ais_member(chat_room_id: int, user_id: int) -> bool:
+        """채팅방 참여 여부 확인 (캐시 우선)"""
+        if await cache.aget(ChatAccessCache.member_key(chat_room_id, user_id)):
+            return True
+        return await database_sync_to_async(ChatAccessCache._load_membership)(
+            chat_room_id, user_id
+        )
+
+    @staticmethod
+    def invalidate_user(user_id: int, chat_room_ids: list = ()) -> None:
+        """사용자 정보 변경 / 탈퇴 시 캐시 삭제 (참여했던 채팅방 참여 여부 포함)"""
+        cache.delete_many(
+            [ChatAccessCache.user_key(user_id)]
+            + [
+                ChatAccessCache.member_key(chat_room_id, user_id)
+                for chat_room_id in chat_room_ids
+            ]
+        )
+
+    @staticmethod
+    def invalidate_membership(chat_room_id: int, user_ids: list) -> None:
+        """채팅방 참여자 변경 시 캐시 삭제"""
+        cache.delete_many(
+            [ChatAccessCache.member_key(chat_room_id, user_id) for user_id in user_ids]
+        )
@@ -0,0 +1,255 @@
+"""비활성 채팅방 메시지 콜드 보관
+
+채팅방/월 단위로 메시지를 NDJSON 으로 직렬화해 압축(zstandard 설치 시 zstd, 없으면 gzip)한 뒤
+default_storage 에 저장하고 DB 에서는 삭제함. 과거 스크롤(before_id) 시 DB 에 남은 메시지가
+부족하면 보관 파일에서 이어서 읽음
+"""
+
+import datetime
+import gzip
+import json
+import logging
+
+from a_apis.models import ChatMessage, ChatMessageArchive, ChatRoom, File
+from a_user.models import User
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard 미설치 환경은 gzip 사용
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "chat-archive"
+
+
+def compress(data: bytes) -> tuple:
+    """(압축 데이터, 압축 방식) 반환"""
+    if zstandard is not None:
+        return (
+            zstandard.ZstdCompressor(level=10).compress(data),
+            ChatMessageArchive.Compression.ZSTD,
+        )
+    return gzip.compress(data), ChatMessageArchive.Compression.GZIP
+
+
+def decompress(data: bytes, compression: str) -> bytes:
+    if compression == ChatMessageArchive.Compression.ZSTD:
+        if zstandard is None:
+            raise RuntimeError(
+                "zstd 보관 파일을 읽으려면 zstandard 패키지가 필요합니다."
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+def month_start(value, months_back: int = 0) -> datetime.date:
+    """value 가 속한 달에서 months_back 개월 전 달의 1일"""
+    month_index = value.year * 12 + value.month - 1 - months_back
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class ChatArchiveService:
+    @staticmethod
+    def archive_boundary(chat_room: ChatRoom) -> int:
+        """이 id 미만의 메시지만 보관 가능
+
+        마지막 메시지와 참여 중인 사용자가 마지막으로 읽은 메시지는 DB 에 남겨
+        채팅방 목록 / 안 읽은 메시지 수 계산이 바뀌지 않도록 함
+        (아직 아무것도 읽지 않은 참여자가 있으면 보관하지 않음)
+        """
+        participants = chat_room.participants.filter(is_active=True).aggregate(
+            min_read=Min("last_read_message_id"),
+            never_read=Min("id", filter=Q(last_read_message__isnull=True)),
+        )
+        if participants["never_read"] is not None or not chat_room.last_message_id:
+            return 0
+        boundary = chat_room.last_message_id
+        if participants["min_read"] is not None:
+            boundary = min(boundary, participants["min_read"])
+        return boundary
+
+    @staticmethod
+    def _serialize(messages) -> bytes:
+        lines = [
+            json.dumps(
+                {
+                    "id": msg.id,
+                    "seq": msg.seq,
+                    "sender_id": msg.sender_id,
+                    "message": msg.message,
+                    "file_id": msg.file_id,
+                    "is_deleted": msg.is_deleted,
+                    "created_at": msg.created_at.isoformat(),
+                },
+                ensure_ascii=False,
+            )
+            for msg in messages
+        ]
+        return ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    def _period_messages(chat_room: ChatRoom, period: datetime.date, boundary: int):
+        start = datetime.datetime.combine(period, datetime.time.min)
+        end = datetime.datetime.combine(month_start(period, -1), datetime.time.min)
+        return ChatMessage.objects.filter(
+            chat_room=chat_room,
+            created_at__gte=start,
+            created_at__lt=end,
+            id__lt=boundary,
+        )
+
+    @staticmethod
+    def archive_room_month(
+        chat_room: ChatRoom, period: datetime.date, boundary: int
+    ) -> ChatMessageArchive | None:
+        """채팅방의 한 달 치 메시지(boundary 미만)를 보관 파일로 옮김"""
+        messages = list(
+            ChatArchiveService._period_messages(chat_room, period, boundary).order_by(
+                "id"
+            )
+        )
+        if not messages:
+            return None
+
+        data, compression = compress(ChatArchiveService._serialize(messages))
+        extension = (
+            "zst" if compression == ChatMessageArchive.Compression.ZSTD else "gz"
+        )
+        # 파일을 먼저 저장하고, 보관 기록 생성 / 메시지 삭제는 한 트랜잭션으로 처리
+        path = default_storage.save(
+            f"{ARCHIVE_DIR}/{chat_room.id}/{period:%Y-%m}.ndjson.{extension}",
+            ContentFile(data),
+        )
+        try:
+            with transaction.atomic():
+                archive = ChatMessageArchive.objects.create(
+                    chat_room=chat_room,
+                    period=period,
+                    first_message_id=messages[0].id,
+                    last_message_id=messages[-1].id,
+                    first_seq=messages[0].seq,
+                    last_seq=messages[-1].seq,
+                    message_count=len(messages),
+                    storage_path=path,
+                    compression=compression,
+                )
+                ChatMessage.objects.filter(id__in=[msg.id for msg in messages]).delete()
+        except Exception:
+            default_storage.delete(path)
+            raise
+        return archive
+
+    @staticmethod
+    def archive_inactive_rooms(
+        inactive_days: int = 180,
+        keep_months: int = 6,
+        room_limit: int = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """마지막 메시지가 inactive_days 일 지난 채팅방의 keep_months 개월 이전 메시지 보관"""
+        now = timezone.now()
+        cutoff = datetime.datetime.combine(
+            month_start(now, keep_months), datetime.time.min
+        )
+        rooms = (
+            ChatRoom.objects.filter(
+                last_message_at__lt=now - datetime.timedelta(days=inactive_days)
+            )
+            .filter(messages__created_at__lt=cutoff)
+            .distinct()
+            .order_by("id")
+        )
+        if room_limit:
+            rooms = rooms[:room_limit]
+
+        stats = {"rooms": 0, "archives": 0, "messages": 0}
+        for chat_room in rooms:
+            boundary = ChatArchiveService.archive_boundary(chat_room)
+            if not boundary:
+                continue
+            periods = list(
+                ChatMessage.objects.filter(
+                    chat_room=chat_room, created_at__lt=cutoff, id__lt=boundary
+                ).dates("created_at", "month")
+            )
+            if not periods:
+                continue
+
+            stats["rooms"] += 1
+            for period in periods:
+                if dry_run:
+                    stats["archives"] += 1
+                    stats["messages"] += ChatArchiveService._period_messages(
+                        chat_room, period, boundary
+                    ).count()
+                    continue
+                try:
+                    archive = ChatArchiveService.archive_room_month(
+                        chat_room, period, boundary
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"채팅방 {chat_room.id} {period:%Y-%m} 보관 실패: {str(e)}"
+                    )
+                    continue
+                if archive:
+                    stats["archives"] += 1
+                    stats["messages"] += archive.message_count
+        return stats
+
+    @staticmethod
+    def load_archived_messages(chat_room_id: int, before_id: int, limit: int) -> list:
+        """보관 파일에서 before_id 이전 메시지를 최신순으로 최대 limit 개 조회
+
+        반환 형식은 ChatService._message_to_dict 와 같음 (발신자 닉네임 / 파일 URL 은 현재 값)
+        """
+        archives = ChatMessageArchive.objects.filter(
+            chat_room_id=chat_room_id, first_message_id__lt=before_id
+        ).order_by("-last_message_id")
+
+        records = []
+        for archive in archives.iterator():
+            with default_storage.open(archive.storage_path, "rb") as f:
+                data = decompress(f.read(), archive.compression)
+            chunk = [
+                record
+                for record in map(json.loads, data.decode().splitlines())
+                if record["id"] < before_id and not record["is_deleted"]
+            ]
+            records.extend(sorted(chunk, key=lambda r: r["id"], reverse=True))
+            if len(records) >= limit:
+                break
+        records = records[:limit]
+        if not records:
+            return []
+
+        nicknames = dict(
+            User.objects.filter(
+                id__in={record["sender_id"] for record in records}
+            ).values_list("id", "nickname")
+        )
+        files = File.objects.in_bulk(
+            {record["file_id"] for record in records if record["file_id"]}
+        )
+        return [
+            {
+                "id": record["id"],
+                "seq": record["seq"],
+                "sender_id": record["sender_id"],
+                "sender_nickname": nicknames.get(record["sender_id"], ""),
+                "message": record["message"],
+                "created_at": datetime.datetime.fromisoformat(record["created_at"]),
+                "is_deleted": record["is_deleted"],
+                "file_url": (
+                    files[record["file_id"]].url if record["file_id"] in files else None
+                ),
+            }
+            for record in records
+        ]
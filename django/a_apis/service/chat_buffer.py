@@ -0,0 +1,313 @@
+"""채팅 메시지 write-behind 버퍼 / 읽음 처리 coalescing 버퍼
+
+버스트가 심한 채팅방에서 프레임마다 INSERT/트랜잭션이 발생하지 않도록,
+ChatConsumer 는 메시지 ID와 방 단위 seq 만 먼저 발급(ChatService.reserve_messages)받아
+즉시 브로드캐스트하고, 실제 저장은 프로세스 단위 버퍼에 모았다가
+FLUSH_INTERVAL_MS 마다 또는 MAX_BATCH 개가 모이면 bulk_create 로 처리함.
+발급도 MessageReserveBatcher 가 같은 채팅방에 동시에 들어온 프레임을 모아
+채팅방 행 UPDATE 한 번으로 처리하므로 버스트 중에는 프레임마다 UPDATE 하지 않음.
+
+내구성 보장
+- 브로드캐스트된 메시지는 아직 DB에 없을 수 있음 (최대 FLUSH_INTERVAL_MS 또는 MAX_BATCH 만큼)
+- 저장 실패 시 배치를 버퍼 앞쪽으로 되돌려 다음 주기에 재시도하며,
+  배치 저장이 계속 실패하면 한 건씩 저장해 문제 있는 메시지만 버림
+- 버퍼가 MAX_PENDING 을 넘으면 가장 오래된 메시지부터 버리고 에러 로그를 남김
+- 연결 종료(disconnect) 시 버퍼를 비우므로 정상 종료(daphne SIGTERM)에서는 유실 없음
+
+장애 복구
+- 프로세스가 비정상 종료되면 버퍼에 있던 메시지는 유실됨. 이미 발급된 seq 는 재사용되지
+  않으므로 클라이언트는 seq 빈 구간으로 유실을 감지할 수 있음 (after_id 동기화는 빈 구간
+  이전의 마지막 연속 메시지를 기준으로 해야 함)
+- 채팅방 마지막 메시지 / 안 읽은 메시지 수가 어긋나면 repair_chat_counters 커맨드로 보정
+"""
+
+import abc
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
+
+from django.conf import settings
+
+from .chat import ChatService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WRITE_BEHIND = {
+    "ENABLED": False,
+    "FLUSH_INTERVAL_MS": 50,
+    "MAX_BATCH": 100,
+    "MAX_PENDING": 10000,
+}
+
+
+def get_write_behind_settings() -> dict:
+    return {**DEFAULT_WRITE_BEHIND, **getattr(settings, "CHAT_WRITE_BEHIND", {})}
+
+
+class PeriodicFlushBuffer(abc.ABC):
+    """이벤트 루프에서 flush_interval 마다 flush 를 호출하는 버퍼 공통 동작"""
+
+    flush_interval = 0.05
+
+    _flush_task = None
+
+    @abc.abstractmethod
+    def has_pending(self) -> bool:
+        """flush 할 데이터가 남아 있는지 여부"""
+
+    @abc.abstractmethod
+    async def flush(self) -> int:
+        """버퍼 내용을 DB 에 반영하고 반영한 건수 반환"""
+
+    def _ensure_flush_task(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self.has_pending():
+                continue
+            try:
+                await self.flush()
+            except Exception as e:
+                # 연결 장애: 데이터는 버퍼에 남아 있으므로 다음 주기에 재시도
+                logger.error(
+                    f"{self.__class__.__name__} flush 실패, 다음 주기에 재시도: {str(e)}"
+                )
+
+
+class ChatWriteBuffer(PeriodicFlushBuffer):
+    """프로세스 단위 메시지 write-behind 버퍼"""
+
+    def __init__(
+        self,
+        flush_interval_ms: int = 50,
+        max_batch: int = 100,
+        max_pending: int = 10000,
+        writer=None,
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.writer = writer or ChatService.save_messages_bulk
+        self.pending = []
+        self.dropped_count = 0
+        self._flush_lock = None
+
+    def has_pending(self) -> bool:
+        return bool(self.pending)
+
+    def add(self, chat_message) -> bool:
+        """버퍼에 메시지 추가. 즉시 flush 가 필요하면 True 반환"""
+        self.pending.append(chat_message)
+        if len(self.pending) > self.max_pending:
+            overflow = len(self.pending) - self.max_pending
+            dropped, self.pending = self.pending[:overflow], self.pending[overflow:]
+            self.dropped_count += len(dropped)
+            logger.error(
+                f"채팅 write-behind 버퍼 초과로 메시지 {len(dropped)}개 폐기 "
+                f"(ids={[m.id for m in dropped]})"
+            )
+        return len(self.pending) >= self.max_batch
+
+    def take_batch(self) -> list:
+        batch, self.pending = (
+            self.pending[: self.max_batch],
+            self.pending[self.max_batch :],
+        )
+        return batch
+
+    def requeue(self, batch: list) -> None:
+        """저장 실패한 배치를 순서를 유지한 채 버퍼 앞쪽으로 되돌림"""
+        self.pending = batch + self.pending
+
+    async def enqueue(self, chat_message) -> None:
+        """메시지를 버퍼에 넣고 필요하면 flush (주기적 flush 태스크도 보장)"""
+        self._ensure_flush_task()
+        if self.add(chat_message):
+            try:
+                await self.flush()
+            except Exception as e:
+                # 연결 장애: 메시지는 버퍼에 남아 있으므로 주기적 flush 에서 재시도
+                logger.error(f"채팅 메시지 flush 실패, 다음 주기에 재시도: {str(e)}")
+
+    async def flush(self) -> int:
+        """버퍼의 메시지를 모두 저장. 저장된 메시지 수 반환"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        saved = 0
+        async with self._flush_lock:
+            while self.pending:
+                batch = self.take_batch()
+                try:
+                    saved += await database_sync_to_async(self.writer)(batch)
+                except Exception as e:
+                    logger.warning(
+                        f"채팅 메시지 bulk 저장 실패, 한 건씩 재시도: {str(e)}"
+                    )
+                    saved += await self._save_one_by_one(batch)
+        return saved
+
+    async def _save_one_by_one(self, batch: list) -> int:
+        """배치 저장 실패 시 한 건씩 저장. DB 연결 장애면 남은 메시지를 되돌리고 중단"""
+        saved = 0
+        for index, chat_message in enumerate(batch):
+            try:
+                saved += await database_sync_to_async(self.writer)([chat_message])
+            except Exception as e:
+                if self._is_connection_error(e):
+                    self.requeue(batch[index:])
+                    raise
+                self.dropped_count += 1
+                logger.error(
+                    f"채팅 메시지 저장 불가로 폐기 (id={chat_message.id}): {str(e)}"
+                )
+        return saved
+
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        from django.db import InterfaceError, OperationalError
+
+        return isinstance(error, (InterfaceError, OperationalError))
+
+
+class ReadReceiptBuffer(PeriodicFlushBuffer):
+    """읽음 처리 coalescing 버퍼
+
+    WebSocket read 이벤트마다 DB에 쓰지 않고 (채팅방, 사용자)별 가장 최근에 읽은
+    message_id 만 메모리에 보관했다가 flush_interval 마다 한 번에 반영
+    """
+
+    def __init__(self, flush_interval_ms: int = 2000, writer=None):
+        self.flush_interval = flush_interval_ms / 1000
+        self.writer = writer or ChatService.mark_messages_read_bulk
+        self.pending = {}
+
+    def has_pending(self) -> bool:
+        return bool(self.pending)
+
+    def mark(self, chat_room_id: int, user_id: int, message_id: int) -> bool:
+        """읽은 위치 기록. 대기 중인 값보다 앞으로 나아간 경우에만 True 반환"""
+        key = (chat_room_id, user_id)
+        if message_id <= self.pending.get(key, 0):
+            return False
+        self.pending[key] = message_id
+        return True
+
+    async def enqueue(self, chat_room_id: int, user_id: int, message_id: int) -> bool:
+        self._ensure_flush_task()
+        return self.mark(chat_room_id, user_id, message_id)
+
+    async def flush(self) -> int:
+        if not self.pending:
+            return 0
+
+        entries, self.pending = self.pending, {}
+        try:
+            return await database_sync_to_async(self.writer)(list(entries.items()))
+        except Exception:
+            # 실패한 항목을 되돌리되, 그 사이 더 앞선 값이 들어왔다면 그 값을 유지
+            for key, message_id in entries.items():
+                if message_id > self.pending.get(key, 0):
+                    self.pending[key] = message_id
+            raise
+
+
+class MessageReserveBatcher:
+    """write-behind 모드 메시지 ID/seq 발급 묶음 처리
+
+    채팅방별로 발급 요청이 진행 중인 동안 들어온 프레임을 모아 두었다가
+    다음 발급에서 함께 처리함. 한가할 때는 프레임 하나씩, 버스트 중에는
+    대기 중인 프레임 전체를 채팅방 행 UPDATE 한 번으로 발급함
+    """
+
+    def __init__(self, reserver=None):
+        self.reserver = reserver or ChatService.reserve_messages
+        self.pending = {}
+        self.running = set()
+        # 진행 중인 발급 태스크 (이벤트 루프는 태스크를 약한 참조로만 보관하므로
+        # 참조를 유지하지 않으면 발급 도중 GC 되어 대기 중인 프레임이 멈출 수 있음)
+        self.tasks = set()
+
+    async def reserve(self, chat_message):
+        """메시지 ID/seq 발급 (발급된 메시지 반환)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        room_id = chat_message.chat_room_id
+        self.pending.setdefault(room_id, []).append((chat_message, future))
+        if room_id not in self.running:
+            self.running.add(room_id)
+            task = loop.create_task(self._drain(room_id))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        return await future
+
+    async def wait_idle(self) -> None:
+        """진행 중인 발급이 모두 끝날 때까지 대기 (연결 종료 / 프로세스 종료 시)"""
+        while self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def _drain(self, room_id: int) -> None:
+        try:
+            while self.pending.get(room_id):
+                batch = self.pending.pop(room_id)
+                try:
+                    await database_sync_to_async(self.reserver)(
+                        room_id, [chat_message for chat_message, _ in batch]
+                    )
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for chat_message, future in batch:
+                        if not future.done():
+                            future.set_result(chat_message)
+        finally:
+            self.running.discard(room_id)
+
+
+_write_buffer = None
+_read_receipt_buffer = None
+_message_reserver = None
+
+
+def get_write_buffer():
+    """write-behind 모드가 켜져 있으면 프로세스 공용 버퍼 반환, 꺼져 있으면 None"""
+    global _write_buffer
+
+    config = get_write_behind_settings()
+    if not config["ENABLED"]:
+        return None
+    if _write_buffer is None:
+        _write_buffer = ChatWriteBuffer(
+            flush_interval_ms=config["FLUSH_INTERVAL_MS"],
+            max_batch=config["MAX_BATCH"],
+            max_pending=config["MAX_PENDING"],
+        )
+    return _write_buffer
+
+
+def get_read_receipt_buffer():
+    """프로세스 공용 읽음 처리 버퍼 반환"""
+    global _read_receipt_buffer
+
+    if _read_receipt_buffer is None:
+        _read_receipt_buffer = ReadReceiptBuffer(
+            flush_interval_ms=getattr(settings, "CHAT_READ_RECEIPT_FLUSH_MS", 2000)
+        )
+    return _read_receipt_buffer
+
+
+def get_message_reserver():
+    """프로세스 공용 메시지 ID/seq 발급기 반환 (write-behind 모드용)"""
+    global _message_reserver
+
+    if _message_reserver is None:
+        _message_reserver = MessageReserveBatcher()
+    return _message_reserver
@@ -0,0 +1,56 @@
+"""채팅 WebSocket 프레임 직렬화
+
+그룹 이벤트는 발행 시점에 클라이언트 프레임을 한 번만 직렬화해 frame_text
+(JSON 문자열) / frame_bytes (msgpack) 로 함께 실어 보내고, Consumer 는 수신자마다
+다시 직렬화하지 않고 그대로 전송함
+
+- orjson 이 설치되어 있으면 JSON 인코딩에 사용 (없으면 표준 json)
+- msgpack 은 channels-redis 의존성으로 함께 설치됨. 클라이언트가
+  MSGPACK_SUBPROTOCOL 서브프로토콜로 연결하면 바이너리 프레임으로 주고받음
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # channels-redis 없이 인메모리 채널 레이어만 쓰는 환경
+    msgpack = None
+
+MSGPACK_SUBPROTOCOL = "chat.msgpack"
+
+
+def dumps_text(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_binary(data: dict) -> bytes:
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def loads_text(text: str) -> dict:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def loads_binary(data: bytes) -> dict:
+    return msgpack.unpackb(data, raw=False)
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def attach_frame(event: dict, frame: dict) -> dict:
+    """그룹 이벤트에 클라이언트 프레임을 직렬화해 첨부 (수신자 수와 무관하게 한 번)"""
+    event["frame_text"] = dumps_text(frame)
+    if msgpack is not None:
+        event["frame_bytes"] = dumps_binary(frame)
+    return event
@@ -0,0 +1,253 @@
+import logging
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from django.db import transaction
+
+from .chat_codec import attach_frame
+
+logger = logging.getLogger(__name__)
+
+
+class ChatEventPublisher:
+    """채팅 실시간 이벤트 발행 (채널 레이어 그룹 전송)
+
+    REST API, 시스템 메시지, WebSocket Consumer 모두 이 클래스를 통해
+    동일한 형태의 이벤트를 같은 그룹으로 전송
+
+    이벤트에는 클라이언트로 보낼 프레임이 미리 직렬화되어 포함되며 (chat_codec.attach_frame),
+    발행 시각(published_at)은 Consumer 의 느린 클라이언트 감지에 사용됨.
+    *_frame 메소드는 이벤트에서 클라이언트 프레임을 만드는 규칙이며, 직렬화된 프레임이
+    없는 이벤트(배포 중 이전 버전이 발행한 이벤트 등)를 처리할 때도 사용
+    """
+
+    @staticmethod
+    def room_group_name(chat_room_id) -> str:
+        """채팅방 그룹 이름"""
+        return f"chat_{chat_room_id}"
+
+    @staticmethod
+    def user_group_name(user_id) -> str:
+        """사용자 인박스 그룹 이름 (사용자의 모든 채팅방 변경 알림)"""
+        return f"user_{user_id}"
+
+    @staticmethod
+    def room_updated_event(
+        chat_room_id: int,
+        last_message_preview: str,
+        last_message_at,
+        unread_count: int,
+        total_unread: int,
+    ) -> dict:
+        """인박스 채팅방 갱신 이벤트 생성 (InboxConsumer.room_updated 에서 처리)"""
+        event = {
+            "type": "room_updated",
+            "room_id": chat_room_id,
+            "last_message_preview": last_message_preview,
+            "last_message_at": (
+                last_message_at.isoformat() if last_message_at else None
+            ),
+            "unread_count": unread_count,
+            "total_unread": total_unread,
+        }
+        return attach_frame(event, ChatEventPublisher.room_updated_frame(event))
+
+    @staticmethod
+    def room_updated_frame(event: dict) -> dict:
+        return {
+            "type": "room_updated",
+            "room_id": event["room_id"],
+            "last_message_preview": event["last_message_preview"],
+            "last_message_at": event["last_message_at"],
+            "unread_count": event["unread_count"],
+            "total_unread": event["total_unread"],
+        }
+
+    @staticmethod
+    def message_event(chat_message, sender_nickname: str = None) -> dict:
+        """채팅 메시지 그룹 이벤트 생성 (ChatConsumer.chat_message 에서 처리)"""
+        if sender_nickname is None:
+            sender_nickname = chat_message.sender.nickname
+
+        event = {
+            "type": "chat_message",
+            "room_id": chat_message.chat_room_id,
+            "message_id": chat_message.id,
+            "seq": chat_message.seq,
+            "message": chat_message.message,
+            "sender_id": chat_message.sender_id,
+            "sender_nickname": sender_nickname,
+            "timestamp": chat_message.created_at.isoformat(),
+            "file_url": chat_message.file.url if chat_message.file_id else None,
+        }
+        return attach_frame(event, ChatEventPublisher.message_frame(event))
+
+    @staticmethod
+    def message_frame(event: dict) -> dict:
+        return {
+            "type": "message",
+            "room_id": event.get("room_id"),
+            "seq": event.get("seq"),
+            "message": event["message"],
+            "sender_id": event["sender_id"],
+            "sender_nickname": event["sender_nickname"],
+            "timestamp": event["timestamp"],
+            "message_id": event["message_id"],
+            "file_url": event.get("file_url"),
+        }
+
+    @staticmethod
+    def typing_event(
+        chat_room_id: int,
+        user_id: int,
+        nickname: str,
+        is_typing: bool,
+        sender_channel: str,
+    ) -> dict:
+        """입력 중 그룹 이벤트 생성 (발신 연결은 sender_channel 로 제외)"""
+        event = {
+            "type": "chat_typing",
+            "room_id": chat_room_id,
+            "user_id": user_id,
+            "nickname": nickname,
+            "is_typing": is_typing,
+            "sender_channel": sender_channel,
+        }
+        return attach_frame(event, ChatEventPublisher.typing_frame(event))
+
+    @staticmethod
+    def typing_frame(event: dict) -> dict:
+        return {
+            "type": "typing",
+            "room_id": event["room_id"],
+            "user_id": event["user_id"],
+            "nickname": event["nickname"],
+            "is_typing": event["is_typing"],
+        }
+
+    @staticmethod
+    def read_event(chat_room_id: int, user_id: int, message_id: int) -> dict:
+        """읽음 그룹 이벤트 생성"""
+        event = {
+            "type": "chat_read",
+            "room_id": chat_room_id,
+            "user_id": user_id,
+            "message_id": message_id,
+        }
+        return attach_frame(event, ChatEventPublisher.read_frame(event))
+
+    @staticmethod
+    def read_frame(event: dict) -> dict:
+        return {
+            "type": "read",
+            "room_id": event["room_id"],
+            "user_id": event["user_id"],
+            "message_id": event["message_id"],
+        }
+
+    @staticmethod
+    def trade_event(chat_room_id, name: str, data: dict) -> dict:
+        """가격 제안 / 거래약속 이벤트 생성 (ChatConsumer.chat_trade 에서 처리)
+
+        name: offer_created, offer_accepted, offer_rejected,
+              appointment_created, appointment_updated
+        data 는 채널 레이어로 전송되므로 JSON 직렬화 가능한 값만 포함해야 함
+        """
+        event = {
+            "type": "chat_trade",
+            "room_id": chat_room_id,
+            "event": name,
+            "data": data,
+        }
+        return attach_frame(event, ChatEventPublisher.trade_frame(event))
+
+    @staticmethod
+    def trade_frame(event: dict) -> dict:
+        return {
+            "type": event["event"],
+            "room_id": event["room_id"],
+            "data": event["data"],
+        }
+
+    @staticmethod
+    def publish_trade_event(chat_room_id, user_ids, name: str, data: dict) -> None:
+        """거래 이벤트를 채팅방 그룹과 당사자 인박스 그룹으로 커밋 후 전송
+
+        인박스 그룹에는 type 만 inbox_trade 로 바꿔 보내며, 채팅방을 구독 중인
+        멀티플렉스 연결은 채팅방 그룹 이벤트만 전달해 중복을 막음
+        """
+        event = ChatEventPublisher.trade_event(chat_room_id, name, data)
+        group_events = [
+            (
+                ChatEventPublisher.user_group_name(user_id),
+                {**event, "type": "inbox_trade"},
+            )
+            for user_id in dict.fromkeys(user_ids)
+            if user_id is not None
+        ]
+        if chat_room_id is not None:
+            group_events.insert(
+                0, (ChatEventPublisher.room_group_name(chat_room_id), event)
+            )
+        ChatEventPublisher._send_on_commit(group_events)
+
+    @staticmethod
+    def publish(chat_room_id, event: dict) -> None:
+        """동기 코드용 발행: 트랜잭션 커밋 후 채팅방 그룹으로 전송
+
+        커밋 전에 전송하면 클라이언트가 아직 조회되지 않는 메시지를 받을 수 있으므로
+        on_commit 으로 미룸. 전송 실패는 요청 자체를 실패시키지 않음
+        """
+        ChatEventPublisher._send_on_commit(
+            [(ChatEventPublisher.room_group_name(chat_room_id), event)]
+        )
+
+    @staticmethod
+    def publish_to_users(user_events: list) -> None:
+        """동기 코드용 인박스 발행: [(user_id, event), ...] 를 커밋 후 전송"""
+        ChatEventPublisher._send_on_commit(
+            [
+                (ChatEventPublisher.user_group_name(user_id), event)
+                for user_id, event in user_events
+            ]
+        )
+
+    @staticmethod
+    def _send_on_commit(group_events: list) -> None:
+        def _send():
+            channel_layer = get_channel_layer()
+            if channel_layer is None:
+                return
+            for group_name, event in group_events:
+                event["published_at"] = time.time()
+                try:
+                    async_to_sync(channel_layer.group_send)(group_name, event)
+                except Exception as e:
+                    logger.warning(f"채팅 이벤트 전송 실패 ({group_name}): {str(e)}")
+
+        transaction.on_commit(_send)
+
+    @staticmethod
+    async def apublish(chat_room_id, event: dict) -> None:
+        """비동기 코드(Consumer)용 발행"""
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        event["published_at"] = time.time()
+        await channel_layer.group_send(
+            ChatEventPublisher.room_group_name(chat_room_id), event
+        )
+
+    @staticmethod
+    async def apublish_to_users(user_events: list) -> None:
+        """비동기 코드(Consumer)용 인박스 발행"""
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        for user_id, event in user_events:
+            event["published_at"] = time.time()
+            await channel_layer.group_send(
+                ChatEventPublisher.user_group_name(user_id), event
+            )
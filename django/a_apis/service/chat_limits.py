@@ -0,0 +1,70 @@
+"""채팅 WebSocket 전송 속도 제한
+
+- 연결 단위: 메모리 토큰 버킷 (모든 클라이언트 프레임)
+- 사용자 단위: Django 캐시(운영 환경 Redis) 고정 윈도 카운터. 같은 사용자의 여러 연결 /
+  여러 프로세스에 걸쳐 DB 저장이 발생하는 message 프레임에만 적용
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEFAULT_RATE_LIMIT = {
+    # 연결당 초당 프레임 수 / 순간 허용량
+    "CONNECTION_RATE": 5,
+    "CONNECTION_BURST": 10,
+    # 사용자당 USER_WINDOW 초 동안 허용하는 메시지 수
+    "USER_MESSAGES": 60,
+    "USER_WINDOW": 10,
+    # 제한 초과가 이 횟수만큼 누적되면 연결 종료
+    "MAX_VIOLATIONS": 30,
+}
+
+
+def get_rate_limit_settings() -> dict:
+    return {**DEFAULT_RATE_LIMIT, **getattr(settings, "CHAT_RATE_LIMIT", {})}
+
+
+class TokenBucket:
+    """메모리 토큰 버킷 (rate: 초당 충전량, burst: 최대 보관량)"""
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.updated_at = clock()
+
+    def consume(self, amount: int = 1) -> bool:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class UserRateLimiter:
+    """사용자 단위 메시지 수 제한 (캐시 공유, 고정 윈도)"""
+
+    @staticmethod
+    def key(user_id: int, window: int) -> str:
+        return f"chat:rate:{user_id}:{int(time.time() // window)}"
+
+    @staticmethod
+    async def allow(user_id: int) -> bool:
+        config = get_rate_limit_settings()
+        window = config["USER_WINDOW"]
+        key = UserRateLimiter.key(user_id, window)
+
+        # 윈도 첫 요청에서 키 생성 (만료는 윈도 길이만큼 여유를 둠)
+        await cache.aadd(key, 0, window * 2)
+        try:
+            count = await cache.aincr(key)
+        except ValueError:
+            # 윈도 경계에서 키가 만료된 경우
+            await cache.aset(key, 1, window * 2)
+            count = 1
+        return count <= config["USER_MESSAGES"]
@@ -0,0 +1,52 @@
+import os
+import resource
+import sys
+from collections import Counter
+
+
+def process_rss_bytes() -> int:
+    """현재 프로세스 메모리 사용량(RSS, bytes)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # /proc 이 없는 환경은 최대 RSS 로 대체 (macOS 는 bytes, Linux 는 KB 단위)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ChatMetrics:
+    """채팅 WebSocket 프로세스 단위 지표 (카운터 / 게이지)
+
+    프로세스마다 따로 집계되며 /api/health-checks/chat-metrics 로 조회 (운영자 토큰 필요).
+    snapshot 시 프로세스 RSS 와 연결당 평균 메모리를 함께 계산함
+    """
+
+    counters = Counter()
+    gauges = {}
+
+    @classmethod
+    def incr(cls, name: str, amount: int = 1) -> None:
+        cls.counters[name] += amount
+
+    @classmethod
+    def set_gauge(cls, name: str, value) -> None:
+        cls.gauges[name] = value
+
+    @classmethod
+    def add_gauge(cls, name: str, amount: int) -> None:
+        cls.gauges[name] = cls.gauges.get(name, 0) + amount
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        gauges = dict(cls.gauges)
+        rss = process_rss_bytes()
+        connections = gauges.get("connections", 0)
+        gauges["process_rss_bytes"] = rss
+        gauges["rss_per_connection_bytes"] = rss // connections if connections else 0
+        return {"counters": dict(cls.counters), "gauges": gauges}
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.counters.clear()
+        cls.gauges.clear()
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+
+
+class ChatPresence:
+    """채팅방별 접속(보고 있는) 사용자 추적
+
+    Django 캐시(운영 환경 Redis)에 (채팅방, 사용자)마다 접속 중인 연결 수를 보관.
+    연결 수는 incr / decr 로만 바꾸므로 같은 사용자의 여러 기기가 동시에 들어오거나
+    나가도 서로 덮어쓰지 않음. WebSocket 연결이 HEARTBEAT_INTERVAL 마다 만료 시간만
+    갱신(touch)하고, 모든 연결의 갱신이 끊기면 TTL 이 지나 자동으로 제외됨
+
+    비정상 종료로 나가지 못한 연결은 같은 사용자의 다른 연결이 heartbeat 를 보내는
+    동안 수에 남아 있지만, 그동안은 실제로 접속 중이므로 결과는 같음
+    """
+
+    TTL = 90
+    HEARTBEAT_INTERVAL = 30
+
+    @staticmethod
+    def key(chat_room_id, user_id) -> str:
+        return f"chat:presence:{chat_room_id}:{user_id}"
+
+    @staticmethod
+    async def ajoin(chat_room_id: int, user_id: int) -> None:
+        """접속 등록 (연결 수 1 증가)"""
+        key = ChatPresence.key(chat_room_id, user_id)
+        await cache.aadd(key, 0, ChatPresence.TTL)
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            # add 와 incr 사이에 만료된 경우
+            await cache.aadd(key, 1, ChatPresence.TTL)
+        await cache.atouch(key, ChatPresence.TTL)
+
+    @staticmethod
+    async def arefresh(chat_room_id: int, user_id: int) -> None:
+        """heartbeat: 만료 시간 갱신 (이미 만료됐으면 다시 등록)"""
+        key = ChatPresence.key(chat_room_id, user_id)
+        if not await cache.atouch(key, ChatPresence.TTL):
+            await ChatPresence.ajoin(chat_room_id, user_id)
+
+    @staticmethod
+    async def aleave(chat_room_id: int, user_id: int) -> None:
+        """접속 해제 (연결 수 1 감소, 0 이 된 키는 TTL 이 지나면 삭제됨)"""
+        try:
+            await cache.adecr(ChatPresence.key(chat_room_id, user_id))
+        except ValueError:
+            pass
+
+    @staticmethod
+    def viewing_user_ids(chat_room_id: int, user_ids) -> set:
+        """user_ids 중 채팅방에 접속해 있는 사용자 (캐시 조회 한 번)"""
+        keys = {
+            ChatPresence.key(chat_room_id, user_id): user_id for user_id in user_ids
+        }
+        found = cache.get_many(list(keys))
+        return {keys[key] for key, count in found.items() if count > 0}
+
+    @staticmethod
+    def is_viewing(chat_room_id: int, user_id: int) -> bool:
+        return (cache.get(ChatPresence.key(chat_room_id, user_id)) or 0) > 0
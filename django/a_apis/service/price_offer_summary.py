@@ -0,0 +1,85 @@
+"""상품별 대기중 가격 제안 요약 (개수 / 최저 / 최고 / 중앙값 / 최근 제안)
+
+상품 수와 무관하게 상품 ⟕ 가격 제안 GROUP BY 쿼리 1개로 계산하며,
+최근 제안자 닉네임은 사용자 카드 캐시에서 조회함
+"""
+
+from a_apis.service.user_cards import UserCardService
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Aggregate, Count, FloatField, Func, JSONField, Max, Min, Q
+from django.db.models.functions import JSONObject
+
+PENDING = Q(price_offers__status="pending")
+
+
+class PercentileCont(Aggregate):
+    """PERCENTILE_CONT(fraction) WITHIN GROUP (ORDER BY expression)"""
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction: float, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+class ArrayFirst(Func):
+    """배열의 첫 번째 원소 (빈 그룹이면 NULL)"""
+
+    template = "(%(expressions)s)[1]"
+    output_field = JSONField()
+
+
+class PriceOfferSummaryService:
+    @staticmethod
+    def annotate(products):
+        """상품 쿼리셋에 대기중 가격 제안 집계 추가 (제안이 없는 상품도 개수 0 으로 포함)"""
+        return products.annotate(
+            pending_count=Count("price_offers", filter=PENDING),
+            min_price=Min("price_offers__price", filter=PENDING),
+            max_price=Max("price_offers__price", filter=PENDING),
+            median_price=PercentileCont("price_offers__price", 0.5, filter=PENDING),
+            latest_offer=ArrayFirst(
+                ArrayAgg(
+                    JSONObject(
+                        id="price_offers__id",
+                        user_id="price_offers__user_id",
+                        price="price_offers__price",
+                        created_at="price_offers__created_at",
+                    ),
+                    filter=PENDING,
+                    order_by=("-price_offers__created_at", "-price_offers__id"),
+                )
+            ),
+        )
+
+    @staticmethod
+    def to_dicts(products) -> list:
+        """annotate() 한 상품 목록을 요약 dict 목록으로 변환"""
+        cards = UserCardService.get_many(
+            {p.latest_offer["user_id"] for p in products if p.latest_offer}
+        )
+
+        summaries = []
+        for product in products:
+            latest = product.latest_offer
+            if latest:
+                card = cards.get(latest["user_id"])
+                latest = {
+                    **latest,
+                    "user_nickname": card["nickname"] if card else None,
+                }
+            summaries.append(
+                {
+                    "product_id": product.id,
+                    "product_title": product.title,
+                    "product_price": product.price,
+                    "pending_count": product.pending_count,
+                    "min_price": product.min_price,
+                    "max_price": product.max_price,
+                    "median_price": product.median_price,
+                    "latest_offer": latest,
+                }
+            )
+        return summaries
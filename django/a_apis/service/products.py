@@ -3,7 +3,12 @@ from datetime import datetime, timedelta
 
 from a_apis.models import InterestProduct, Product, ProductCategory, ProductImage
 from a_apis.models.chat import ChatRoom
+from a_apis.service.chat_events import ChatEventPublisher
 from a_apis.service.files import FileService
+from a_apis.service.price_offer_summary import PriceOfferSummaryService
+from a_apis.service.reputation import ReputationService
+from a_apis.service.trade import TradeStateMachine, TradeTransitionError
+from a_apis.service.user_cards import UserCardService
 from a_user.models import MannerRating, Review
 
 from django.contrib.gis.geos import Point
@@ -83,20 +88,22 @@ class ProductService:
                 )
                 location_description = data.meeting_location.description
 
-            # 상품 생성 (region 필드 추가)
-            product = Product.objects.create(
-                user_id=user_id,
-                title=data.title,
-                trade_type=data.trade_type,
-                price=data.price if data.trade_type == "sale" else None,
-                accept_price_offer=data.accept_price_offer,
-                description=data.description,
-                category_id=data.category_id,
-                region_id=region_id,  # 선택한 동네 정보 저장
-                meeting_location=meeting_point,
-                location_description=location_description,
-                refresh_at=timezone.now(),
-            )
+            # 상품 생성 (region 필드 추가) 과 판매자 평판 집계를 같은 트랜잭션에서 반영
+            with transaction.atomic():
+                product = Product.objects.create(
+                    user_id=user_id,
+                    title=data.title,
+                    trade_type=data.trade_type,
+                    price=data.price if data.trade_type == "sale" else None,
+                    accept_price_offer=data.accept_price_offer,
+                    description=data.description,
+                    category_id=data.category_id,
+                    region_id=region_id,  # 선택한 동네 정보 저장
+                    meeting_location=meeting_point,
+                    location_description=location_description,
+                    refresh_at=timezone.now(),
+                )
+                ReputationService.record_status_change(user_id, None, product.status)
 
             # 이미지 처리
             if images:
@@ -399,10 +406,14 @@ class ProductService:
 
             # 이미지 업데이트 (기존 이미지 삭제 후 새 이미지 등록)
             if images:
-                # 기존 이미지 삭제
-                for image in product.images.all():
-                    FileService.delete_file(image.file)
-                    image.delete()
+                # 기존 이미지 삭제 (저장소 파일은 커밋 후 삭제)
+                old_images = list(product.images.select_related("file"))
+                ProductImage.objects.filter(
+                    id__in=[image.id for image in old_images]
+                ).delete()
+                ProductService._delete_files_on_commit(
+                    [image.file for image in old_images]
+                )
 
                 # 새 이미지 등록
                 for image_file in images:
@@ -422,32 +433,31 @@ class ProductService:
 
     @staticmethod
     def update_product_status(product_id: int, user_id: int, status: str) -> dict:
-        """상품 상태 변경 서비스"""
+        """상품 상태 변경 서비스 (상품 행 잠금 후 전이 규칙 검증)"""
         try:
-            product = Product.objects.get(id=product_id)
-
-            # 권한 체크
-            if product.user_id != user_id:
-                return {"success": False, "message": "상품 상태 변경 권한이 없습니다."}
+            with transaction.atomic():
+                product = TradeStateMachine.lock(product_id)
 
-            # 상태 변경
-            product.status = status
-            product.save(update_fields=["status", "updated_at"])
+                # 권한 체크
+                if product.user_id != user_id:
+                    return {
+                        "success": False,
+                        "message": "상품 상태 변경 권한이 없습니다.",
+                    }
 
-            status_display = {
-                "selling": "판매중",
-                "reserved": "예약중",
-                "soldout": "판매완료",
-            }.get(status, status)
+                # 상태 변경
+                TradeStateMachine.transition(product, status)
 
             return {
                 "success": True,
-                "message": f"상품 상태가 '{status_display}'(으)로 변경되었습니다.",
+                "message": f"상품 상태가 '{product.get_status_display()}'(으)로 변경되었습니다.",
                 "data": ProductService._product_to_detail(product, user_id),
             }
 
         except Product.DoesNotExist:
             return {"success": False, "message": "존재하지 않는 상품입니다."}
+        except TradeTransitionError as e:
+            return {"success": False, "message": str(e)}
         except Exception as e:
             return {"success": False, "message": str(e)}
 
@@ -496,23 +506,25 @@ class ProductService:
             return {"success": False, "message": str(e)}
 
     @staticmethod
-    @transaction.atomic
     def delete_product(product_id: int, user_id: int) -> dict:
         """상품 삭제 서비스"""
         try:
-            product = Product.objects.get(id=product_id)
+            with transaction.atomic():
+                # 삭제 중 상태가 바뀌지 않도록 상품 행을 잠그고 평판 집계와 함께 반영
+                product = TradeStateMachine.lock(product_id)
 
-            # 권한 체크
-            if product.user_id != user_id:
-                return {"success": False, "message": "상품 삭제 권한이 없습니다."}
+                # 권한 체크
+                if product.user_id != user_id:
+                    return {"success": False, "message": "상품 삭제 권한이 없습니다."}
 
-            # 이미지 삭제
-            for image in product.images.all():
-                FileService.delete_file(image.file)
+                # 이미지 파일은 커밋 후 삭제 (롤백되면 파일도 남김)
+                files = [image.file for image in product.images.select_related("file")]
 
-            # 상품 삭제
-            product_title = product.title
-            product.delete()
+                # 상품 삭제
+                product_title = product.title
+                product.delete()
+                ReputationService.record_status_change(user_id, product.status, None)
+                ProductService._delete_files_on_commit(files)
 
             return {
                 "success": True,
@@ -876,6 +888,18 @@ class ProductService:
         except Exception as e:
             return {"success": False, "message": str(e), "data": []}
 
+    @staticmethod
+    def _delete_files_on_commit(files: list) -> None:
+        """트랜잭션 커밋 후 파일 삭제 (저장소 I/O 를 행 잠금 밖에서 수행)"""
+        if not files:
+            return
+
+        def delete():
+            for file_obj in files:
+                FileService.delete_file(file_obj)
+
+        transaction.on_commit(delete)
+
     @staticmethod
     def _product_to_detail(product, user_id=None):
         """상품 객체를 상세 정보 딕셔너리로 변환"""
@@ -946,18 +970,15 @@ class ProductService:
         # 동네 정보 추가
         region_name = product.region.name if product.region else None
 
-        # 판매자 정보 구성
+        # 판매자 정보 구성 (사용자 카드 캐시)
+        seller_card = UserCardService.get(product.user_id)
         seller_info = {
-            "id": product.user.id,
-            "nickname": product.user.nickname,
-            "profile_image_url": None,
-            "rating_score": float(product.user.rating_score),
+            "id": product.user_id,
+            "nickname": seller_card["nickname"],
+            "profile_image_url": seller_card["profile_image_url"],
+            "rating_score": seller_card["rating_score"],
         }
 
-        # 판매자 프로필 이미지 URL 처리
-        if product.user.profile_img:
-            seller_info["profile_image_url"] = product.user.profile_img.url
-
         # 가격 제안 개수 계산
         from a_user.models import PriceOffer
 
@@ -1336,12 +1357,14 @@ class ProductService:
 
             if existing_offer:
                 # 기존 제안 업데이트
-                offer = PriceOffer.objects.get(
+                offer = PriceOffer.objects.select_related("user").get(
                     product_id=product_id, user_id=user_id, status="pending"
                 )
                 offer.price = price
                 offer.save(update_fields=["price", "updated_at"])
+                user = offer.user
                 message = "가격 제안이 업데이트되었습니다."
+                event_name = "offer_updated"
             else:
                 # 새 제안 생성
                 from a_user.models import User
@@ -1354,20 +1377,34 @@ class ProductService:
                     chat_room_id=chat_room_id if chat_room_id else None,
                 )
                 message = "가격 제안이 등록되었습니다."
+                event_name = "offer_created"
+
+            data = {
+                "id": offer.id,
+                "product_id": product_id,
+                "product_title": product.title,
+                "user_id": user_id,
+                "user_nickname": user.nickname,
+                "price": price,
+                "status": offer.status,
+                "created_at": offer.created_at.isoformat(),
+            }
+
+            # 판매자 / 제안자에게 실시간 알림 (채팅방이 있으면 채팅방에도 전달)
+            ChatEventPublisher.publish_trade_event(
+                offer.chat_room_id
+                or ProductService._offer_chat_room_ids(product_id, [user_id]).get(
+                    user_id
+                ),
+                [product.user_id, user_id],
+                event_name,
+                data,
+            )
 
             return {
                 "success": True,
                 "message": message,
-                "data": {
-                    "id": offer.id,
-                    "product_id": product_id,
-                    "product_title": product.title,
-                    "user_id": user_id,
-                    "user_nickname": user.nickname,
-                    "price": price,
-                    "status": offer.status,
-                    "created_at": offer.created_at.isoformat(),
-                },
+                "data": data,
             }
 
         except Product.DoesNotExist:
@@ -1375,67 +1412,117 @@ class ProductService:
         except Exception as e:
             return {"success": False, "message": str(e)}
 
+    @staticmethod
+    def _price_offer_data(offer, product) -> dict:
+        """가격 제안 응답 / 실시간 이벤트 데이터 (offer.user 필요)"""
+        return {
+            "id": offer.id,
+            "product_id": product.id,
+            "product_title": product.title,
+            "user_id": offer.user.id,
+            "user_nickname": offer.user.nickname,
+            "price": offer.price,
+            "status": offer.status,
+            "created_at": offer.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def _offer_chat_room_ids(product_id: int, buyer_ids: list) -> dict:
+        """구매자 ID → 해당 상품 채팅방 ID (채팅방 구매자 필드로 한 번에 조회)"""
+        return dict(
+            ChatRoom.objects.filter(
+                product_id=product_id, buyer_id__in=buyer_ids
+            ).values_list("buyer_id", "id")
+        )
+
     @staticmethod
     def respond_to_price_offer(offer_id: int, user_id: int, action: str) -> dict:
         """가격 제안 수락/거절 서비스"""
-        try:
-            from a_user.models import PriceOffer
+        from a_user.models import PriceOffer
 
-            offer = PriceOffer.objects.select_related("product", "user").get(
+        try:
+            product_id = PriceOffer.objects.values_list("product_id", flat=True).get(
                 id=offer_id
             )
 
-            # 상품 소유자 확인
-            if offer.product.user_id != user_id:
-                return {
-                    "success": False,
-                    "message": "이 제안에 대한 응답 권한이 없습니다.",
-                }
+            # 같은 상품의 제안 응답은 상품 행 잠금으로 한 번에 하나씩 처리
+            with transaction.atomic():
+                product = TradeStateMachine.lock(product_id)
+                # 제안 상태는 잠금 후 다시 읽어 동시 수락을 막음
+                offer = PriceOffer.objects.select_related("user").get(id=offer_id)
+                offer.product = product
 
-            # 이미 처리된 제안인지 확인
-            if offer.status != "pending":
-                status_display = {
-                    "accepted": "수락",
-                    "rejected": "거절",
-                    "pending": "대기중",
-                }
-                return {
-                    "success": False,
-                    "message": f"이미 {status_display.get(offer.status)}된 제안입니다.",
-                }
-
-            # 수락 또는 거절 처리
-            if action == "accept":
-                offer.status = "accepted"
-                # 다른 대기중인 제안 모두 거절
-                PriceOffer.objects.filter(
-                    product_id=offer.product.id, status="pending"
-                ).exclude(id=offer_id).update(status="rejected")
-
-                # 수락 시 상품 가격 업데이트
-                offer.product.price = offer.price
-                offer.product.save(update_fields=["price", "updated_at"])
+                # 상품 소유자 확인
+                if product.user_id != user_id:
+                    return {
+                        "success": False,
+                        "message": "이 제안에 대한 응답 권한이 없습니다.",
+                    }
 
-                message = "가격 제안을 수락했습니다."
-            else:  # reject
-                offer.status = "rejected"
-                message = "가격 제안을 거절했습니다."
+                # 이미 처리된 제안인지 확인
+                if offer.status != "pending":
+                    status_display = {
+                        "accepted": "수락",
+                        "rejected": "거절",
+                        "pending": "대기중",
+                    }
+                    return {
+                        "success": False,
+                        "message": f"이미 {status_display.get(offer.status)}된 제안입니다.",
+                    }
 
-            offer.save(update_fields=["status", "updated_at"])
+                # 수락 또는 거절 처리
+                auto_rejected = []
+                if action == "accept":
+                    if product.status == Product.Status.SOLDOUT:
+                        return {
+                            "success": False,
+                            "message": "이미 판매 완료된 상품입니다.",
+                        }
+                    offer.status = "accepted"
+                    # 다른 대기중인 제안 모두 거절 (제안자에게 알리기 위해 먼저 조회)
+                    other_offers = PriceOffer.objects.filter(
+                        product_id=product_id, status="pending"
+                    ).exclude(id=offer_id)
+                    auto_rejected = list(other_offers.select_related("user"))
+                    other_offers.update(status="rejected")
+
+                    # 수락 시 상품 가격 업데이트
+                    product.price = offer.price
+                    product.save(update_fields=["price", "updated_at"])
+
+                    message = "가격 제안을 수락했습니다."
+                else:  # reject
+                    offer.status = "rejected"
+                    message = "가격 제안을 거절했습니다."
+
+                offer.save(update_fields=["status", "updated_at"])
+
+            data = ProductService._price_offer_data(offer, offer.product)
+
+            # 제안자 / 판매자에게 실시간 알림
+            room_ids = ProductService._offer_chat_room_ids(
+                offer.product_id,
+                [offer.user_id] + [other.user_id for other in auto_rejected],
+            )
+            for responded in [offer] + auto_rejected:
+                if responded is not offer:
+                    responded.status = "rejected"
+                ChatEventPublisher.publish_trade_event(
+                    responded.chat_room_id or room_ids.get(responded.user_id),
+                    [offer.product.user_id, responded.user_id],
+                    f"offer_{responded.status}",
+                    (
+                        data
+                        if responded is offer
+                        else ProductService._price_offer_data(responded, offer.product)
+                    ),
+                )
 
             return {
                 "success": True,
                 "message": message,
-                "data": {
-                    "id": offer.id,
-                    "product_id": offer.product.id,
-                    "product_title": offer.product.title,
-                    "user_id": offer.user.id,
-                    "user_nickname": offer.user.nickname,
-                    "price": offer.price,
-                    "status": offer.status,
-                    "created_at": offer.created_at.isoformat(),
-                },
+                "data": data,
             }
 
         except PriceOffer.DoesNotExist:
@@ -1456,11 +1543,10 @@ class ProductService:
             # 제안 목록 조회
             from a_user.models import PriceOffer
 
-            offers = (
-                PriceOffer.objects.filter(product_id=product_id)
-                .select_related("user")
-                .order_by("-created_at")
+            offers = list(
+                PriceOffer.objects.filter(product_id=product_id).order_by("-created_at")
             )
+            cards = UserCardService.get_many({offer.user_id for offer in offers})
 
             data = []
             for offer in offers:
@@ -1469,8 +1555,8 @@ class ProductService:
                         "id": offer.id,
                         "product_id": product_id,
                         "product_title": product.title,
-                        "user_id": offer.user.id,
-                        "user_nickname": offer.user.nickname,
+                        "user_id": offer.user_id,
+                        "user_nickname": cards[offer.user_id]["nickname"],
                         "price": offer.price,
                         "status": offer.status,
                         "created_at": offer.created_at.isoformat(),
@@ -1489,56 +1575,82 @@ class ProductService:
             return {"success": False, "message": str(e)}
 
     @staticmethod
-    def complete_trade(
-        product_id: int, user_id: int, buyer_id: int, final_price: int = None
-    ) -> dict:
-        """거래 완료 처리 서비스"""
-        import logging
-
-        logger = logging.getLogger("product_debug")
-
+    def get_price_offer_summary(product_id: int, user_id: int) -> dict:
+        """상품 가격 제안 요약 조회 서비스 (상품 조회와 집계를 쿼리 1개로 처리)"""
         try:
-            logger.error(
-                f"[complete_trade] 시작 - product_id: {product_id}, user_id: {user_id}, buyer_id: {buyer_id}, final_price: {final_price}"
-            )
-
-            product = Product.objects.get(id=product_id)
-
-            logger.error(
-                f"[complete_trade] 상품 정보 - title: {product.title}, status: {product.status}, user_id: {product.user_id}"
+            products = PriceOfferSummaryService.annotate(
+                Product.objects.filter(id=product_id).only(
+                    "id", "user_id", "title", "price"
+                )
             )
+            product = products.get()
 
-            # 판매자 확인
+            # 권한 확인 (판매자만 조회 가능)
             if product.user_id != user_id:
-                return {"success": False, "message": "거래 완료 처리 권한이 없습니다."}
+                return {"success": False, "message": "가격 제안 조회 권한이 없습니다."}
 
-            # 이미 판매 완료된 상품인지 확인
-            if product.status == Product.Status.SOLDOUT:
-                return {"success": False, "message": "이미 판매 완료된 상품입니다."}
+            return {
+                "success": True,
+                "message": "가격 제안 요약을 조회했습니다.",
+                "data": PriceOfferSummaryService.to_dicts([product])[0],
+            }
 
-            # 구매자 확인
-            from a_user.models import User
+        except Product.DoesNotExist:
+            return {"success": False, "message": "존재하지 않는 상품입니다."}
+        except Exception as e:
+            return {"success": False, "message": str(e)}
 
-            try:
-                buyer = User.objects.get(id=buyer_id)
-                logger.error(
-                    f"[complete_trade] 구매자 정보 - buyer_id: {buyer.id}, nickname: {buyer.nickname}"
+    @staticmethod
+    def get_my_price_offer_summaries(user_id: int, status: str = None) -> dict:
+        """내 판매 상품 전체의 가격 제안 요약 조회 서비스 (판매자 대시보드용, 쿼리 1개)"""
+        try:
+            queryset = Product.objects.filter(user_id=user_id)
+            if status:
+                queryset = queryset.filter(status=status)
+            products = list(
+                PriceOfferSummaryService.annotate(
+                    queryset.only("id", "title", "price").order_by("-refresh_at")
                 )
-            except User.DoesNotExist:
-                logger.error(f"[complete_trade] 구매자 없음 - buyer_id: {buyer_id}")
-                return {"success": False, "message": "존재하지 않는 구매자입니다."}
+            )
+
+            return {
+                "success": True,
+                "message": "가격 제안 요약을 조회했습니다.",
+                "data": PriceOfferSummaryService.to_dicts(products),
+            }
+
+        except Exception as e:
+            return {"success": False, "message": str(e)}
 
+    @staticmethod
+    def complete_trade(
+        product_id: int, user_id: int, buyer_id: int, final_price: int = None
+    ) -> dict:
+        """거래 완료 처리 서비스 (상품 행 잠금 후 판매완료로 전이)"""
+        from a_user.models import User
+
+        try:
             # 판매자와 구매자가 동일한지 확인
-            if buyer.id == user_id:
+            if buyer_id == user_id:
                 return {"success": False, "message": "자신에게 판매할 수 없습니다."}
 
-            # 거래 완료 처리
-            logger.error(f"[complete_trade] mark_as_completed 호출 전")
-            result = product.mark_as_completed(buyer, final_price)
-            logger.error(f"[complete_trade] mark_as_completed 결과: {result}")
+            with transaction.atomic():
+                product = TradeStateMachine.lock(product_id)
 
-            if not result:
-                return {"success": False, "message": "거래 완료 처리에 실패했습니다."}
+                # 판매자 확인
+                if product.user_id != user_id:
+                    return {
+                        "success": False,
+                        "message": "거래 완료 처리 권한이 없습니다.",
+                    }
+
+                # 구매자 확인
+                buyer = User.objects.filter(id=buyer_id).first()
+                if buyer is None:
+                    return {"success": False, "message": "존재하지 않는 구매자입니다."}
+
+                # 거래 완료 처리 (이미 판매 완료된 상품이면 TradeTransitionError)
+                TradeStateMachine.complete(product, buyer, final_price)
 
             return {
                 "success": True,
@@ -1547,10 +1659,10 @@ class ProductService:
             }
 
         except Product.DoesNotExist:
-            logger.error(f"[complete_trade] 상품 없음 - product_id: {product_id}")
             return {"success": False, "message": "존재하지 않는 상품입니다."}
+        except TradeTransitionError as e:
+            return {"success": False, "message": str(e)}
         except Exception as e:
-            logger.error(f"[complete_trade] 예외 발생 - error: {str(e)}")
             return {"success": False, "message": str(e)}
 
     @staticmethod
@@ -1587,20 +1699,23 @@ class ProductService:
             # 후기 수신자 설정
             receiver_id = product.buyer_id if is_seller else product.user_id
 
-            # 후기 작성
-            from a_user.models import User
-
-            review = Review.objects.create(
-                product_id=product_id,
-                reviewer_id=user_id,
-                receiver_id=receiver_id,
-                content=content,
-            )
+            with transaction.atomic():
+                # 후기 작성
+                review = Review.objects.create(
+                    product_id=product_id,
+                    reviewer_id=user_id,
+                    receiver_id=receiver_id,
+                    content=content,
+                )
+                ReputationService.record_review(receiver_id)
 
-            # 후기 작성 완료 상태로 업데이트
-            if product.trade_complete_status == Product.TradeCompleteStatus.COMPLETED:
-                product.trade_complete_status = Product.TradeCompleteStatus.REVIEWED
-                product.save(update_fields=["trade_complete_status", "updated_at"])
+                # 후기 작성 완료 상태로 업데이트
+                if (
+                    product.trade_complete_status
+                    == Product.TradeCompleteStatus.COMPLETED
+                ):
+                    product.trade_complete_status = Product.TradeCompleteStatus.REVIEWED
+                    product.save(update_fields=["trade_complete_status", "updated_at"])
 
             return {
                 "success": True,
@@ -1648,7 +1763,7 @@ class ProductService:
             rated_user_id = product.buyer_id if is_seller else product.user_id
 
             # 매너 평가 유효성 검사
-            from a_user.models import MannerRating
+            from a_user.models import MannerRating, User
 
             valid_types = [choice[0] for choice in MannerRating.MANNER_TYPES]
             invalid_types = [rt for rt in rating_types if rt not in valid_types]
@@ -1664,31 +1779,40 @@ class ProductService:
                 rater_id=user_id,
             ).values_list("rating_type", flat=True)
 
-            new_types = [rt for rt in rating_types if rt not in existing_types]
+            new_types = [
+                rt for rt in dict.fromkeys(rating_types) if rt not in existing_types
+            ]
             if not new_types:
                 return {
                     "success": False,
                     "message": "이미 모든 유형의 평가를 등록했습니다.",
                 }
 
-            # 새 평가 등록
-            ratings = []
-            for rating_type in new_types:
-                rating = MannerRating.objects.create(
-                    product_id=product_id,
-                    rater_id=user_id,
-                    rated_user_id=rated_user_id,
-                    rating_type=rating_type,
+            with transaction.atomic():
+                # 새 평가 일괄 등록 (save() 를 거치지 않으므로 매너온도는 아래에서 한 번에 반영)
+                MannerRating.objects.bulk_create(
+                    [
+                        MannerRating(
+                            product_id=product_id,
+                            rater_id=user_id,
+                            rated_user_id=rated_user_id,
+                            rating_type=rating_type,
+                        )
+                        for rating_type in new_types
+                    ]
+                )
+                User.apply_manner_temperature_delta(
+                    rated_user_id, User.manner_temperature_delta(new_types)
                 )
-                ratings.append(rating)
-
-            # 매너 평가 완료 상태로 업데이트
-            if product.trade_complete_status in [
-                Product.TradeCompleteStatus.COMPLETED,
-                Product.TradeCompleteStatus.REVIEWED,
-            ]:
-                product.trade_complete_status = Product.TradeCompleteStatus.RATED
-                product.save(update_fields=["trade_complete_status", "updated_at"])
+                ReputationService.record_ratings(rated_user_id, new_types)
+
+                # 매너 평가 완료 상태로 업데이트
+                if product.trade_complete_status in [
+                    Product.TradeCompleteStatus.COMPLETED,
+                    Product.TradeCompleteStatus.REVIEWED,
+                ]:
+                    product.trade_complete_status = Product.TradeCompleteStatus.RATED
+                    product.save(update_fields=["trade_complete_status", "updated_at"])
 
             return {
                 "success": True,
@@ -11,6 +11,7 @@ from a_apis.models.region import (
     SigunguRegion,
     UserActivityRegion,
 )
+from a_apis.service.user_cards import UserCardService
 from a_user.models import User  # User 모델 추가
 
 from django.conf import settings
@@ -334,6 +335,8 @@ class RegionService:
                 activity_region.save()
 
             is_primary = activity_region.priority == 1
+            if is_primary:
+                UserCardService.invalidate(user_id)
 
             return {
                 "success": True,
@@ -482,6 +485,8 @@ class RegionService:
                 if region.priority != new_priority:
                     region.priority = new_priority
                     region.save()
+            if deleted_priority == 1:
+                UserCardService.invalidate(user_id)
 
             return {"success": True, "message": "활동지역이 삭제되었습니다."}
 
@@ -649,6 +654,7 @@ class RegionService:
                     previous_primary_region.save(
                         update_fields=["priority", "updated_at"]
                     )
+                UserCardService.invalidate(user.id)
 
             # 새로 설정된 활성 동네 정보만 반환
             # EupmyeondongRegion에서 위도/경도 정보 가져오기
@@ -0,0 +1,177 @@
+from collections import Counter
+
+from a_apis.models import Product
+from a_user.models import MannerRating, Review, User, UserReputation
+
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+class ReputationService:
+    """유저 평판 집계(UserReputation) 갱신
+
+    원본 데이터를 쓰는 트랜잭션 안에서 호출해 같은 트랜잭션에서 집계가 함께 반영되도록 함
+    """
+
+    REBUILD_BATCH_SIZE = 1000
+
+    @staticmethod
+    def _value_fields() -> list:
+        """집계 값 필드 이름 (PK / 생성 시각 제외)"""
+        return [
+            field.name
+            for field in UserReputation._meta.concrete_fields
+            if not field.primary_key and field.name != "created_at"
+        ]
+
+    @staticmethod
+    def apply(user_id: int, **deltas) -> None:
+        """집계 필드 증감 (UPDATE 한 번)
+
+        가입 시 집계 행이 함께 생성되므로 보통은 UPDATE 한 번으로 끝남. 집계 행이 없는
+        기존 유저는 원본에서 계산해 잠금 없이 생성하며(원본 쓰기 이후에 호출하므로 방금 쓴
+        데이터도 포함됨), 동시에 다른 요청이 먼저 생성했다면 증감만 반영함
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas or user_id is None:
+            return
+
+        def increment():
+            # 집계가 원본과 어긋난 경우에도 음수가 되지 않도록 0 에서 멈춤
+            return UserReputation.objects.filter(user_id=user_id).update(
+                updated_at=timezone.now(),
+                **{
+                    field: Greatest(F(field) + delta, Value(0))
+                    for field, delta in deltas.items()
+                },
+            )
+
+        if increment():
+            return
+        if not User.objects.filter(id=user_id).exists():
+            return
+        computed = ReputationService._compute([user_id])[0]
+        _, created = UserReputation.objects.get_or_create(
+            user_id=user_id,
+            defaults={
+                field: getattr(computed, field)
+                for field in ReputationService._value_fields()
+            },
+        )
+        if not created:
+            increment()
+
+    @staticmethod
+    def record_ratings(user_id: int, rating_types: list) -> None:
+        """매너 평가 등록 반영"""
+        counts = Counter(rating_types)
+        deltas = {
+            UserReputation.RATING_FIELDS[rating_type]: count
+            for rating_type, count in counts.items()
+            if rating_type in UserReputation.RATING_FIELDS
+        }
+        deltas["positive_count"] = sum(
+            count for rt, count in counts.items() if UserReputation.is_positive(rt)
+        )
+        deltas["negative_count"] = sum(
+            count
+            for rt, count in counts.items()
+            if rt in UserReputation.RATING_FIELDS and not UserReputation.is_positive(rt)
+        )
+        ReputationService.apply(user_id, **deltas)
+
+    @staticmethod
+    def record_review(user_id: int) -> None:
+        """받은 거래 후기 등록 반영"""
+        ReputationService.apply(user_id, review_count=1)
+
+    @staticmethod
+    def record_status_change(user_id: int, before: str, after: str) -> None:
+        """상품 상태 변경 반영 (생성은 before=None, 삭제는 after=None)"""
+        delta = (after == Product.Status.SELLING) - (before == Product.Status.SELLING)
+        ReputationService.apply(user_id, selling_product_count=delta)
+
+    @staticmethod
+    def get(user: User) -> UserReputation:
+        """유저 평판 집계 조회 (select_related("reputation") 로 함께 조회한 값 사용)"""
+        try:
+            return user.reputation
+        except UserReputation.DoesNotExist:
+            ReputationService.rebuild([user.id])
+            return UserReputation.objects.get(user_id=user.id)
+
+    @staticmethod
+    def _compute(user_ids: list) -> list:
+        """원본 테이블에서 유저별 집계 계산 (쿼리 3개)"""
+        reputations = {
+            user_id: UserReputation(user_id=user_id, updated_at=timezone.now())
+            for user_id in user_ids
+        }
+
+        ratings = (
+            MannerRating.objects.filter(rated_user_id__in=user_ids)
+            .values_list("rated_user_id", "rating_type")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for user_id, rating_type, count in ratings:
+            field = UserReputation.RATING_FIELDS.get(rating_type)
+            if field is None:
+                continue
+            reputation = reputations[user_id]
+            setattr(reputation, field, count)
+            if UserReputation.is_positive(rating_type):
+                reputation.positive_count += count
+            else:
+                reputation.negative_count += count
+
+        reviews = (
+            Review.objects.filter(receiver_id__in=user_ids)
+            .values_list("receiver_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for user_id, count in reviews:
+            reputations[user_id].review_count = count
+
+        selling = (
+            Product.objects.filter(user_id__in=user_ids, status=Product.Status.SELLING)
+            .values_list("user_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for user_id, count in selling:
+            reputations[user_id].selling_product_count = count
+
+        return list(reputations.values())
+
+    @staticmethod
+    def rebuild(user_ids: list = None) -> int:
+        """유저 평판 집계를 원본에서 다시 계산해 저장 (user_ids 생략 시 전체, 저장한 유저 수 반환)"""
+        users = User.objects.order_by("id").values_list("id", flat=True)
+        if user_ids is not None:
+            users = users.filter(id__in=user_ids)
+
+        update_fields = ReputationService._value_fields()
+        total = 0
+        batch = []
+        for user_id in users.iterator(chunk_size=ReputationService.REBUILD_BATCH_SIZE):
+            batch.append(user_id)
+            if len(batch) == ReputationService.REBUILD_BATCH_SIZE:
+                total += ReputationService._save(batch, update_fields)
+                batch = []
+        if batch:
+            total += ReputationService._save(batch, update_fields)
+        return total
+
+    @staticmethod
+    def _save(user_ids: list, update_fields: list) -> int:
+        reputations = ReputationService._compute(user_ids)
+        UserReputation.objects.bulk_create(
+            reputations,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=update_fields,
+        )
+        return len(reputations)
@@ -0,0 +1,79 @@
+from a_apis.models import Product
+from a_apis.service.reputation import ReputationService
+
+from django.utils import timezone
+
+
+class TradeTransitionError(Exception):
+    """허용되지 않는 상품 거래 상태 전이"""
+
+
+class TradeStateMachine:
+    """상품 거래 상태(Product.status) 전이 규칙
+
+    상태를 바꾸는 서비스는 transaction.atomic 안에서 lock() 으로 상품 행을 한 번 잠그고,
+    transition() 으로 전이를 검증한 뒤 관련 변경을 같은 트랜잭션에서 처리함.
+    동시에 들어온 요청은 행 잠금에서 순서대로 처리되어 나중 요청은 바뀐 상태로 검증됨
+    """
+
+    TRANSITIONS = {
+        Product.Status.SELLING: {Product.Status.RESERVED, Product.Status.SOLDOUT},
+        Product.Status.RESERVED: {Product.Status.SELLING, Product.Status.SOLDOUT},
+        # 거래 완료 처리(구매자 지정) 전 판매자가 직접 판매완료로 바꾼 경우만 되돌릴 수 있음
+        Product.Status.SOLDOUT: {Product.Status.SELLING, Product.Status.RESERVED},
+    }
+
+    @staticmethod
+    def lock(product_id: int) -> Product:
+        """상품 행 잠금 조회 (transaction.atomic 안에서 호출)"""
+        return Product.objects.select_for_update().get(id=product_id)
+
+    @staticmethod
+    def is_completed(product: Product) -> bool:
+        return (
+            product.trade_complete_status != Product.TradeCompleteStatus.NOT_COMPLETED
+        )
+
+    @staticmethod
+    def check(product: Product, status: str) -> bool:
+        """전이 가능 여부 확인. 현재 상태와 같으면 False, 불가능하면 TradeTransitionError"""
+        if status not in Product.Status.values:
+            raise TradeTransitionError("유효하지 않은 상품 상태입니다.")
+        if TradeStateMachine.is_completed(product):
+            raise TradeTransitionError("이미 거래 완료된 상품입니다.")
+        if product.status == status:
+            return False
+        if status not in TradeStateMachine.TRANSITIONS[product.status]:
+            raise TradeTransitionError(
+                f"'{product.get_status_display()}' 상태에서 "
+                f"'{Product.Status(status).label}'(으)로 변경할 수 없습니다."
+            )
+        return True
+
+    @staticmethod
+    def transition(product: Product, status: str, **fields) -> bool:
+        """전이 검증 후 상태와 함께 바뀌는 필드를 UPDATE 한 번으로 반영 (변경 여부 반환)"""
+        if not TradeStateMachine.check(product, status) and not fields:
+            return False
+
+        previous = product.status
+        product.status = status
+        for name, value in fields.items():
+            setattr(product, name, value)
+        product.save(update_fields=["status", *fields, "updated_at"])
+        ReputationService.record_status_change(product.user_id, previous, status)
+        return True
+
+    @staticmethod
+    def complete(product: Product, buyer, final_price: int = None) -> None:
+        """거래 완료 처리 (판매완료 + 구매자 / 최종 가격 / 완료 시각)"""
+        if product.status == Product.Status.SOLDOUT:
+            raise TradeTransitionError("이미 판매 완료된 상품입니다.")
+        TradeStateMachine.transition(
+            product,
+            Product.Status.SOLDOUT,
+            buyer=buyer,
+            final_price=final_price if final_price else product.price,
+            completed_at=timezone.now(),
+            trade_complete_status=Product.TradeCompleteStatus.COMPLETED,
+        )
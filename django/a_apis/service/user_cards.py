@@ -0,0 +1,153 @@
+"""공개 사용자 카드 (닉네임 / 프로필 이미지 / 매너온도 / 대표 동네) 캐시
+
+상품 상세 판매자, 채팅방 판매자/구매자, 거래 후기 작성자, 가격 제안자 등 여러 응답에서
+같은 사용자 정보를 반복해서 조회하지 않도록 프로세스 메모리 LRU → Django 캐시(운영 환경 Redis)
+→ DB 순으로 조회함. DB 조회는 사용자 수와 무관하게 쿼리 1개.
+
+프로필 수정 / 매너온도 변경 / 동네 변경 시 invalidate() 로 Redis 와 현재 프로세스 LRU 를
+삭제하며, 다른 프로세스의 LRU 는 LOCAL_TTL 초 안에 만료됨
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from a_apis.models.region import UserActivityRegion
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+User = get_user_model()
+
+
+class LocalLRU:
+    """프로세스 메모리 LRU (항목별 만료 시간, 스레드 안전)"""
+
+    def __init__(self, maxsize: int, ttl: float, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        now = self.clock()
+        found = {}
+        with self.lock:
+            for key in keys:
+                item = self.items.get(key)
+                if item is None:
+                    continue
+                expires_at, value = item
+                if expires_at <= now:
+                    del self.items[key]
+                    continue
+                self.items.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, values: dict) -> None:
+        expires_at = self.clock() + self.ttl
+        with self.lock:
+            for key, value in values.items():
+                self.items[key] = (expires_at, value)
+                self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def delete_many(self, keys) -> None:
+        with self.lock:
+            for key in keys:
+                self.items.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.items.clear()
+
+
+class UserCardService:
+    TTL = 600
+    LOCAL_TTL = 5
+    LOCAL_MAXSIZE = 10_000
+
+    local = LocalLRU(LOCAL_MAXSIZE, LOCAL_TTL)
+
+    @staticmethod
+    def key(user_id) -> str:
+        return f"user:card:{user_id}"
+
+    @staticmethod
+    def _load(user_ids) -> dict:
+        """DB 에서 사용자 카드 조회 (프로필 이미지 / 대표 동네 포함 쿼리 1개)"""
+        primary_region = UserActivityRegion.objects.filter(
+            user_id=OuterRef("pk"), priority=1
+        ).values("activity_area__name")[:1]
+        users = (
+            User.objects.filter(id__in=user_ids)
+            .select_related("profile_img")
+            .annotate(region_name=Subquery(primary_region))
+        )
+        return {
+            user.id: {
+                "id": user.id,
+                "nickname": user.nickname,
+                "profile_image_url": (
+                    user.profile_img.url if user.profile_img else None
+                ),
+                "rating_score": float(user.rating_score),
+                "region_name": user.region_name,
+            }
+            for user in users
+        }
+
+    @staticmethod
+    def get_many(user_ids) -> dict:
+        """{user_id: 카드} 반환 (존재하지 않는 사용자는 제외)"""
+        keys = {
+            UserCardService.key(user_id): user_id
+            for user_id in user_ids
+            if user_id is not None
+        }
+        cards = UserCardService.local.get_many(keys)
+
+        missing = [key for key in keys if key not in cards]
+        if missing:
+            shared = cache.get_many(missing)
+            UserCardService.local.set_many(shared)
+            cards.update(shared)
+
+        missing_ids = [keys[key] for key in keys if key not in cards]
+        if missing_ids:
+            loaded = {
+                UserCardService.key(user_id): card
+                for user_id, card in UserCardService._load(missing_ids).items()
+            }
+            cache.set_many(loaded, UserCardService.TTL)
+            UserCardService.local.set_many(loaded)
+            cards.update(loaded)
+
+        return {keys[key]: card for key, card in cards.items()}
+
+    @staticmethod
+    def get(user_id: int) -> dict | None:
+        return UserCardService.get_many([user_id]).get(user_id)
+
+    @staticmethod
+    def invalidate(*user_ids) -> None:
+        """카드 캐시 삭제
+
+        바로 삭제하고 트랜잭션 커밋 후 한 번 더 삭제해, 커밋 전에 다른 요청이
+        변경 전 값으로 다시 채운 캐시도 지움
+        """
+        keys = [UserCardService.key(user_id) for user_id in user_ids]
+        if not keys:
+            return
+
+        def delete():
+            UserCardService.local.delete_many(keys)
+            cache.delete_many(keys)
+
+        delete()
+        transaction.on_commit(delete)
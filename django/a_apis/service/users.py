@@ -1,15 +1,21 @@
 from datetime import datetime
 
 from a_apis.auth.cookies import create_auth_response
-from a_apis.models import EmailVerification
+from a_apis.models import ChatRoomParticipant, EmailVerification
 from a_apis.models.region import (
     EupmyeondongRegion,
     SidoRegion,
     SigunguRegion,
     UserActivityRegion,
 )
+from a_apis.service.chat_access import ChatAccessCache
+from a_apis.service.user_cards import UserCardService
 from allauth.account.models import EmailAddress
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.auth import authenticate, get_user_model, login
@@ -262,6 +268,55 @@ class UserService:
                 "message": f"로그아웃 처리 중 오류가 발생했습니다: {str(e)}",
             }
 
+    @staticmethod
+    def withdraw_user(request):
+        """회원 탈퇴 서비스
+
+        계정을 비활성화하고 발급된 리프레시 토큰을 모두 블랙리스트에 추가하며,
+        참여 중인 채팅방에서 나감 (WebSocket 접근 캐시도 삭제)
+
+        Args:
+            request: HTTP 요청 객체
+
+        Returns:
+            dict: 처리 결과 메시지
+        """
+        try:
+            if not request.auth:
+                return {"success": False, "message": "인증되지 않은 사용자입니다."}
+
+            from rest_framework_simplejwt.tokens import AccessToken
+
+            access_token = AccessToken(request.auth)
+            user = User.objects.get(id=access_token["user_id"], is_active=True)
+
+            with transaction.atomic():
+                user.is_active = False
+                user.save(update_fields=["is_active", "updated_at"])
+
+                chat_room_ids = list(
+                    ChatRoomParticipant.objects.filter(
+                        user=user, is_active=True
+                    ).values_list("chat_room_id", flat=True)
+                )
+                ChatRoomParticipant.objects.filter(
+                    user=user, chat_room_id__in=chat_room_ids
+                ).update(is_active=False)
+
+                for token in OutstandingToken.objects.filter(user=user):
+                    BlacklistedToken.objects.get_or_create(token=token)
+
+            ChatAccessCache.invalidate_user(user.id, chat_room_ids)
+
+            return {"success": True, "message": "회원 탈퇴가 완료되었습니다."}
+        except User.DoesNotExist:
+            return {"success": False, "message": "사용자를 찾을 수 없습니다."}
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"회원 탈퇴 처리 중 오류가 발생했습니다: {str(e)}",
+            }
+
     @staticmethod
     def get_user(request):
         try:
@@ -404,6 +459,10 @@ class UserService:
             # 변경 사항이 있으면 저장
             if updated_fields:
                 user_obj.save(update_fields=updated_fields + ["updated_at"])
+                UserCardService.invalidate(user_obj.id)
+                if "nickname" in updated_fields:
+                    # WebSocket 연결 시 사용하는 캐시된 닉네임 갱신
+                    ChatAccessCache.invalidate_user(user_obj.id)
 
                 # 업데이트된 필드 표시
                 updated_str = ", ".join([field for field in updated_fields])
@@ -545,6 +604,7 @@ class UserService:
 
                 user_region.priority = 1
                 user_region.save(update_fields=["priority", "updated_at"])
+                UserCardService.invalidate(user.id)
 
             # 새로 설정된 활성 동네 정보만 반환
             current_region = {
@@ -572,106 +632,43 @@ class UserService:
     def get_user_profile(user_id: int) -> dict:
         """특정 유저의 프로필 정보를 조회합니다"""
         try:
-            from a_apis.models.product import Product
-            from a_apis.models.region import UserActivityRegion
-            from a_user.models import MannerRating, Review  # 올바른 모델 import
-
-            from django.db.models import Count, Q
+            from a_apis.service.reputation import ReputationService
+            from a_user.models import Review
 
-            # 사용자 조회
+            # 사용자 조회 (평판 집계 / 프로필 이미지 포함)
             try:
-                user = User.objects.get(id=user_id)
+                user = User.objects.select_related("reputation", "profile_img").get(
+                    id=user_id
+                )
             except User.DoesNotExist:
                 return {"success": False, "message": "사용자를 찾을 수 없습니다."}
+            reputation = ReputationService.get(user)
 
             # 1. 현재 판매 중인 상품 수
-            selling_products_count = Product.objects.filter(
-                user=user, status="selling"
-            ).count()
-
-            # 2. 가장 많이 받은 매너 평가 상위 3개 (rating_type별로 집계)
-            manner_ratings = MannerRating.objects.filter(rated_user=user)
-
-            manner_rating_names = {
-                "time": "시간 약속을 잘 지켜요",
-                "response": "응답이 빨라요",
-                "kind": "친절하고 매너가 좋아요",
-                "accurate": "상품 상태가 설명과 일치해요",
-                "negotiable": "가격 제안에 대해 긍정적이에요",
-                "bad_time": "약속시간을 안 지켜요",
-                "bad_response": "응답이 느려요",
-                "bad_manner": "불친절해요",
-                "bad_accuracy": "상품 상태가 설명과 달라요",
-                "bad_price": "가격 흥정이 너무 심해요",
-            }
-
-            # rating_type별로 집계
-            top_manner_ratings_queryset = (
-                manner_ratings.values("rating_type")
-                .annotate(count=Count("id"))
-                .order_by("-count")[:3]
-            )
+            selling_products_count = reputation.selling_product_count
 
-            formatted_top_ratings = []
-            for rating in top_manner_ratings_queryset:
-                rating_type = rating["rating_type"]
-                formatted_top_ratings.append(
-                    {
-                        "rating_type": rating_type,
-                        "rating_name": manner_rating_names.get(
-                            rating_type, rating_type
-                        ),
-                        "count": rating["count"],
-                    }
-                )
+            # 2. 가장 많이 받은 매너 평가 상위 3개
+            formatted_top_ratings = [
+                {"rating_type": rating_type, "rating_name": name, "count": count}
+                for rating_type, name, count in reputation.rating_counts()[:3]
+            ]
 
             # 3. 받은 거래후기 총 개수
-            total_review_count = Review.objects.filter(receiver=user).count()
+            total_review_count = reputation.review_count
 
             # 4. 최근 거래후기 3개 (작성자 정보 포함)
-            recent_reviews_queryset = (
-                Review.objects.filter(receiver=user)
-                .select_related("reviewer", "product")
-                .order_by("-created_at")[:3]
+            latest_reviews = UserService._reviews_with_reviewer(
+                Review.objects.filter(receiver=user).order_by("-id")[:3]
             )
 
-            recent_reviews = []
-            for review in recent_reviews_queryset:
-                # 작성자가 구매자인지 판매자인지 확인
-                product = review.product
-                reviewer_role = (
-                    "buyer" if product.user == user else "seller"
-                )  # receiver가 판매자면 reviewer는 구매자
-
-                # 작성자의 대표 동네 조회
-                writer_region = (
-                    UserActivityRegion.objects.filter(user=review.reviewer, priority=1)
-                    .select_related("activity_area")
-                    .first()
-                )
-                reviewer_region = (
-                    writer_region.activity_area.name if writer_region else None
-                )
-
-                # 작성자 프로필 이미지 URL 처리
-                reviewer_profile_img_url = None
-                if review.reviewer.profile_img:
-                    reviewer_profile_img_url = (
-                        review.reviewer.profile_img.file.url
-                        if review.reviewer.profile_img.file
-                        else None
-                    )
-
-                recent_reviews.append(
-                    {
-                        "reviewer_nickname": review.reviewer.nickname,
-                        "reviewer_profile_img_url": reviewer_profile_img_url,
-                        "reviewer_role": reviewer_role,
-                        "reviewer_region": reviewer_region,
-                        "content": review.content,
-                        "created_at": review.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    }
-                )
+            recent_reviews = [
+                {
+                    **UserService._reviewer_info(review, user),
+                    "content": review.content,
+                    "created_at": review.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                for review in latest_reviews
+            ]
 
             # 프로필 이미지 URL 처리
             profile_img_url = None
@@ -712,92 +709,26 @@ class UserService:
     def get_user_manner_ratings_detail(user_id: int) -> dict:
         """특정 유저가 받은 매너평가를 긍정/부정으로 구분하여 상세 조회합니다"""
         try:
-            from a_user.models import MannerRating
-
-            from django.db.models import Count
+            from a_apis.service.reputation import ReputationService
 
-            # 사용자 조회
+            # 사용자 조회 (평판 집계 포함)
             try:
-                user = User.objects.get(id=user_id)
+                user = User.objects.select_related("reputation").get(id=user_id)
             except User.DoesNotExist:
                 return {"success": False, "message": "사용자를 찾을 수 없습니다."}
+            reputation = ReputationService.get(user)
 
-            # 매너평가 이름 매핑
-            manner_rating_names = {
-                "time": "시간 약속을 잘 지켜요",
-                "response": "응답이 빨라요",
-                "kind": "친절하고 매너가 좋아요",
-                "accurate": "상품 상태가 설명과 일치해요",
-                "negotiable": "가격 제안에 대해 긍정적이에요",
-                "bad_time": "약속시간을 안 지켜요",
-                "bad_response": "응답이 느려요",
-                "bad_manner": "불친절해요",
-                "bad_accuracy": "상품 상태가 설명과 달라요",
-                "bad_price": "가격 흥정이 너무 심해요",
-            }
-
-            # 긍정적 평가 항목
-            positive_types = ["time", "response", "kind", "accurate", "negotiable"]
-            # 부정적 평가 항목
-            negative_types = [
-                "bad_time",
-                "bad_response",
-                "bad_manner",
-                "bad_accuracy",
-                "bad_price",
+            # 긍정적 / 부정적 매너평가 유형별 횟수 (횟수 내림차순)
+            positive_ratings = [
+                {"rating_type": rating_type, "rating_name": name, "count": count}
+                for rating_type, name, count in reputation.rating_counts(positive=True)
             ]
-
-            # 긍정적 매너평가 집계
-            positive_ratings_queryset = (
-                MannerRating.objects.filter(
-                    rated_user=user, rating_type__in=positive_types
-                )
-                .values("rating_type")
-                .annotate(count=Count("id"))
-                .order_by("-count")
-            )
-
-            positive_ratings = []
-            positive_total = 0
-            for rating in positive_ratings_queryset:
-                rating_type = rating["rating_type"]
-                count = rating["count"]
-                positive_total += count
-                positive_ratings.append(
-                    {
-                        "rating_type": rating_type,
-                        "rating_name": manner_rating_names.get(
-                            rating_type, rating_type
-                        ),
-                        "count": count,
-                    }
-                )
-
-            # 부정적 매너평가 집계
-            negative_ratings_queryset = (
-                MannerRating.objects.filter(
-                    rated_user=user, rating_type__in=negative_types
-                )
-                .values("rating_type")
-                .annotate(count=Count("id"))
-                .order_by("-count")
-            )
-
-            negative_ratings = []
-            negative_total = 0
-            for rating in negative_ratings_queryset:
-                rating_type = rating["rating_type"]
-                count = rating["count"]
-                negative_total += count
-                negative_ratings.append(
-                    {
-                        "rating_type": rating_type,
-                        "rating_name": manner_rating_names.get(
-                            rating_type, rating_type
-                        ),
-                        "count": count,
-                    }
-                )
+            negative_ratings = [
+                {"rating_type": rating_type, "rating_name": name, "count": count}
+                for rating_type, name, count in reputation.rating_counts(positive=False)
+            ]
+            positive_total = reputation.positive_count
+            negative_total = reputation.negative_count
 
             return {
                 "success": True,
@@ -818,90 +749,75 @@ class UserService:
                 "message": f"매너평가 상세 조회 중 오류가 발생했습니다: {str(e)}",
             }
 
+    @staticmethod
+    def _reviews_with_reviewer(queryset):
+        """후기 목록과 작성자 카드 조회 (후기 수와 무관하게 쿼리 1개 + 카드 캐시 미스 시 1개)"""
+        reviews = list(queryset.select_related("product"))
+        cards = UserCardService.get_many({review.reviewer_id for review in reviews})
+        for review in reviews:
+            review.reviewer_card = cards.get(review.reviewer_id)
+        return reviews
+
+    @staticmethod
+    def _reviewer_info(review, user) -> dict:
+        """_reviews_with_reviewer 로 조회한 후기의 작성자 정보"""
+        card = review.reviewer_card or {}
+        return {
+            "reviewer_nickname": card.get("nickname", ""),
+            "reviewer_profile_img_url": card.get("profile_image_url"),
+            # receiver가 판매자면 reviewer는 구매자
+            "reviewer_role": "buyer" if review.product.user_id == user.id else "seller",
+            "reviewer_region": card.get("region_name"),
+        }
+
     @staticmethod
     def get_user_reviews_detail(
-        user_id: int, page: int = 1, page_size: int = 10
+        user_id: int, before_id: int = None, page_size: int = 10
     ) -> dict:
-        """특정 유저가 받은 거래후기를 상세 조회합니다 (페이지네이션 포함)"""
+        """특정 유저가 받은 거래후기를 상세 조회합니다 (before_id 기준 커서 페이지네이션)"""
         try:
-            from a_apis.models.region import UserActivityRegion
+            from a_apis.service.reputation import ReputationService
             from a_user.models import Review
 
-            from django.core.paginator import Paginator
-
-            # 사용자 조회
+            # 사용자 조회 (평판 집계 포함)
             try:
-                user = User.objects.get(id=user_id)
+                user = User.objects.select_related("reputation").get(id=user_id)
             except User.DoesNotExist:
                 return {"success": False, "message": "사용자를 찾을 수 없습니다."}
 
-            # 받은 거래후기 조회 (최신순)
-            reviews_queryset = (
-                Review.objects.filter(receiver=user)
-                .select_related("reviewer", "product")
-                .order_by("-created_at")
-            )
+            # 받은 거래후기 조회 (최신순, before_id 보다 이전 후기만)
+            reviews_queryset = Review.objects.filter(receiver=user).order_by("-id")
+            if before_id:
+                reviews_queryset = reviews_queryset.filter(id__lt=before_id)
 
-            # 페이지네이션 적용
-            paginator = Paginator(reviews_queryset, page_size)
-            total_pages = paginator.num_pages
-            total_count = paginator.count
-
-            try:
-                reviews_page = paginator.page(page)
-            except Exception:
-                return {"success": False, "message": "잘못된 페이지 번호입니다."}
+            # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+            page_reviews = UserService._reviews_with_reviewer(
+                reviews_queryset[: page_size + 1]
+            )
+            has_more = len(page_reviews) > page_size
+            page_reviews = page_reviews[:page_size]
 
             # 리뷰 데이터 포맷팅
-            reviews = []
-            for review in reviews_page:
-                # 작성자가 구매자인지 판매자인지 확인
-                product = review.product
-                reviewer_role = (
-                    "buyer" if product.user == user else "seller"
-                )  # receiver가 판매자면 reviewer는 구매자
-
-                # 작성자의 대표 동네 조회
-                writer_region = (
-                    UserActivityRegion.objects.filter(user=review.reviewer, priority=1)
-                    .select_related("activity_area")
-                    .first()
-                )
-                reviewer_region = (
-                    writer_region.activity_area.name if writer_region else None
-                )
-
-                # 작성자 프로필 이미지 URL 처리
-                reviewer_profile_img_url = None
-                if review.reviewer.profile_img:
-                    reviewer_profile_img_url = (
-                        review.reviewer.profile_img.file.url
-                        if review.reviewer.profile_img.file
-                        else None
-                    )
-
-                reviews.append(
-                    {
-                        "id": review.id,
-                        "reviewer_nickname": review.reviewer.nickname,
-                        "reviewer_profile_img_url": reviewer_profile_img_url,
-                        "reviewer_role": reviewer_role,
-                        "reviewer_region": reviewer_region,
-                        "product_title": product.title,
-                        "trade_date": review.created_at.strftime("%Y-%m-%d"),
-                        "content": review.content,
-                        "created_at": review.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    }
-                )
+            reviews = [
+                {
+                    "id": review.id,
+                    **UserService._reviewer_info(review, user),
+                    "product_title": review.product.title,
+                    "trade_date": review.created_at.strftime("%Y-%m-%d"),
+                    "content": review.content,
+                    "created_at": review.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                for review in page_reviews
+            ]
 
             return {
                 "success": True,
                 "message": "거래후기 상세 조회를 성공했습니다.",
-                "total_count": total_count,
+                "total_count": ReputationService.get(user).review_count,
                 "reviews": reviews,
-                "page": page,
                 "page_size": page_size,
-                "total_pages": total_pages,
+                "has_more": has_more,
+                "next_before_id": page_reviews[-1].id if has_more else None,
             }
 
         except Exception as e:
@@ -1,15 +1,52 @@
+import asyncio
 import datetime
 import json
-
-from a_apis.models import ChatMessage, ChatRoom, ChatRoomParticipant, Product
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from a_apis.consumers import (
+    CLOSE_BAD_REQUEST,
+    CLOSE_IDLE,
+    ChatConsumer,
+    MultiplexChatConsumer,
+)
+from a_apis.models import (
+    ChatMessage,
+    ChatMessageArchive,
+    ChatRoom,
+    ChatRoomParticipant,
+    Product,
+)
 from a_apis.models.trade import TradeAppointment
+from a_apis.service.chat import ChatService
+from a_apis.service.chat_access import ChatAccessCache
+from a_apis.service.chat_buffer import (
+    ChatWriteBuffer,
+    MessageReserveBatcher,
+    ReadReceiptBuffer,
+)
+from a_apis.service.chat_codec import loads_text
+from a_apis.service.chat_events import ChatEventPublisher
+from a_apis.service.chat_limits import TokenBucket, UserRateLimiter
+from a_apis.service.chat_metrics import ChatMetrics
+from a_apis.service.chat_presence import ChatPresence
+from a_apis.service.products import ProductService
 from a_user.models import User
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.gis.geos import Point
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 
 class ChatAPITestCase(TestCase):
@@ -250,6 +287,589 @@ class ChatAPITestCase(TestCase):
 
         self.assertTrue(found, "전송한 메시지가 목록에 없습니다.")
 
+    def test_unread_count_and_last_message_denormalized(self):
+        """메시지 전송 시 마지막 메시지 / 안 읽은 메시지 수 갱신 및 읽음 처리 시 초기화 테스트"""
+        chat_room = self.test_create_chat_room()
+
+        # 구매자가 메시지 두 개 전송
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.buyer_token['access']}"
+        )
+        for text in ["첫 번째 메시지", "두 번째 메시지"]:
+            self.client.post(
+                f"/api/chats/{chat_room.id}/messages", {"message": text}, format="json"
+            )
+
+        chat_room.refresh_from_db()
+        self.assertEqual(chat_room.last_message_preview, "두 번째 메시지")
+        self.assertIsNotNone(chat_room.last_message_at)
+
+        seller_participant = ChatRoomParticipant.objects.get(
+            chat_room=chat_room, user=self.seller
+        )
+        buyer_participant = ChatRoomParticipant.objects.get(
+            chat_room=chat_room, user=self.buyer
+        )
+        self.assertEqual(seller_participant.unread_count, 2)
+        self.assertEqual(buyer_participant.unread_count, 0)
+
+        # 판매자 채팅방 목록에 안 읽은 메시지 수 반영
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.seller_token['access']}"
+        )
+        response = self.client.get("/api/chats/")
+        room_data = json.loads(response.content)["data"][0]
+        self.assertEqual(room_data["unread_count"], 2)
+        self.assertEqual(room_data["last_message"], "두 번째 메시지")
+
+        # 판매자가 메시지를 조회하면 안 읽은 메시지 수 초기화
+        self.client.get(f"/api/chats/{chat_room.id}/messages")
+        seller_participant.refresh_from_db()
+        self.assertEqual(seller_participant.unread_count, 0)
+
+    def test_chat_metrics_requires_staff(self):
+        """채팅 지표는 운영자만 조회 가능한지 테스트"""
+        self.assertEqual(
+            self.client.get("/api/health-checks/chat-metrics").status_code, 401
+        )
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.seller_token['access']}"
+        )
+        self.assertEqual(
+            self.client.get("/api/health-checks/chat-metrics").status_code, 401
+        )
+
+        User.objects.filter(id=self.seller.id).update(is_staff=True)
+        response = self.client.get("/api/health-checks/chat-metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("gauges", json.loads(response.content))
+
+    def test_unread_count_skips_inactive_participants(self):
+        """나간 참여자의 안 읽은 메시지 수는 증가하지 않고, 다시 참여하면 재계산되는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        ChatRoomParticipant.objects.filter(chat_room=chat_room, user=self.buyer).update(
+            is_active=False
+        )
+
+        ChatService.save_message(chat_room.id, self.seller.id, "나간 뒤 메시지")
+        buyer_participant = ChatRoomParticipant.objects.get(
+            chat_room=chat_room, user=self.buyer
+        )
+        self.assertEqual(buyer_participant.unread_count, 0)
+
+        ChatService.create_chat_room(self.product.id, self.buyer.id)
+        buyer_participant.refresh_from_db()
+        self.assertTrue(buyer_participant.is_active)
+        self.assertEqual(buyer_participant.unread_count, 1)
+
+    def test_create_chat_room_is_idempotent(self):
+        """같은 상품/구매자 채팅방은 하나만 만들어지고 판매자/구매자가 저장되는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        self.assertEqual(chat_room.seller_id, self.seller.id)
+        self.assertEqual(chat_room.buyer_id, self.buyer.id)
+
+        # 채팅방을 나갔다가 다시 요청해도 같은 채팅방으로 재참여
+        ChatRoomParticipant.objects.filter(chat_room=chat_room, user=self.buyer).update(
+            is_active=False
+        )
+        result = ChatService.create_chat_room(self.product.id, self.buyer.id)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["data"]["id"], chat_room.id)
+        self.assertEqual(ChatRoom.objects.filter(product=self.product).count(), 1)
+        self.assertTrue(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.buyer
+            ).is_active
+        )
+
+        # 상세 조회 시 판매자/구매자는 채팅방 필드의 ID 로 사용자 카드를 한 번에 조회
+        with self.assertNumQueries(4):
+            result = ChatService.get_chat_room_detail(chat_room.id, self.seller.id)
+        self.assertEqual(result["data"]["buyer"]["id"], self.buyer.id)
+        self.assertEqual(result["data"]["seller"]["nickname"], self.seller.nickname)
+
+        # 카드 캐시가 채워진 뒤에는 사용자 조회 없음
+        with self.assertNumQueries(3):
+            ChatService.get_chat_room_detail(chat_room.id, self.seller.id)
+
+    def test_get_chat_messages_with_cursor(self):
+        """before_id / after_id 커서 기반 메시지 조회 및 방 단위 순번 테스트"""
+        chat_room = self.test_create_chat_room()
+        messages = [
+            ChatService.save_message(chat_room.id, self.buyer.id, f"메시지 {i}")
+            for i in range(5)
+        ]
+        self.assertEqual([m.seq for m in messages], [1, 2, 3, 4, 5])
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.seller_token['access']}"
+        )
+
+        # 마지막으로 받은 메시지 이후 동기화 (과거순)
+        response = self.client.get(
+            f"/api/chats/{chat_room.id}/messages?after_id={messages[1].id}"
+        )
+        response_data = json.loads(response.content)
+        self.assertTrue(response_data["success"])
+        self.assertEqual(
+            [m["id"] for m in response_data["data"]], [m.id for m in messages[2:]]
+        )
+        self.assertFalse(response_data["has_more"])
+        self.assertEqual(response_data["next_after_id"], messages[4].id)
+        # 커서 조회는 전체 수 / 페이지를 계산하지 않음
+        self.assertIsNone(response_data["total_count"])
+        self.assertIsNone(response_data["total_pages"])
+
+        # 과거 스크롤 (최신순)
+        response = self.client.get(
+            f"/api/chats/{chat_room.id}/messages"
+            f"?before_id={messages[3].id}&page_size=2"
+        )
+        response_data = json.loads(response.content)
+        self.assertEqual(
+            [m["seq"] for m in response_data["data"]],
+            [messages[2].seq, messages[1].seq],
+        )
+        self.assertTrue(response_data["has_more"])
+        self.assertEqual(response_data["next_before_id"], messages[1].id)
+
+    def test_search_messages(self):
+        """참여 중인 채팅방 메시지만 검색되고 미리보기 / 커서가 동작하는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        matches = [
+            ChatService.save_message(
+                chat_room.id, self.buyer.id, f"{i}번째 자전거 네고 가능할까요?"
+            )
+            for i in range(3)
+        ]
+        ChatService.save_message(chat_room.id, self.buyer.id, "안녕하세요")
+
+        # 참여하지 않은 채팅방의 메시지는 검색되지 않음
+        other_product = Product.objects.create(
+            user=self.buyer,
+            title="다른 상품",
+            price=1000,
+            description="다른 상품 설명",
+            meeting_location=Point(126.9780, 37.5665, srid=4326),
+        )
+        other_room = ChatRoom.objects.create(product=other_product, seller=self.buyer)
+        ChatRoomParticipant.objects.create(chat_room=other_room, user=self.buyer)
+        ChatService.save_message(other_room.id, self.buyer.id, "자전거 팝니다")
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.seller_token['access']}"
+        )
+        response = self.client.get("/api/chats/search?q=자전거&page_size=2")
+        response_data = json.loads(response.content)
+        self.assertTrue(response_data["success"])
+        self.assertEqual(
+            [m["id"] for m in response_data["data"]],
+            [matches[2].id, matches[1].id],
+        )
+        self.assertTrue(response_data["has_more"])
+        result = response_data["data"][0]
+        start, end = result["highlights"][0]
+        self.assertEqual(result["snippet"][start:end], "자전거")
+
+        response = self.client.get(
+            "/api/chats/search?q=자전거&page_size=2"
+            f"&before_id={response_data['next_before_id']}"
+        )
+        response_data = json.loads(response.content)
+        self.assertEqual([m["id"] for m in response_data["data"]], [matches[0].id])
+        self.assertFalse(response_data["has_more"])
+
+        # 너무 짧은 검색어는 거부
+        response = self.client.get("/api/chats/search?q=자")
+        self.assertFalse(json.loads(response.content)["success"])
+
+    @override_settings(
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+    )
+    def test_archive_inactive_chat_messages(self):
+        """비활성 채팅방의 오래된 메시지를 보관하고 과거 스크롤 시 보관 파일에서 읽는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        messages = [
+            ChatService.save_message(chat_room.id, self.buyer.id, f"메시지 {i}")
+            for i in range(5)
+        ]
+        for user in (self.seller, self.buyer):
+            ChatService.mark_messages_read(chat_room.id, user.id, messages[3].id)
+
+        old = datetime.datetime(2020, 1, 15, 12, 0)
+        ChatMessage.objects.filter(id__in=[m.id for m in messages[:4]]).update(
+            created_at=old
+        )
+        ChatRoom.objects.filter(id=chat_room.id).update(last_message_at=old)
+
+        call_command("archive_chat_messages", stdout=StringIO())
+
+        # 모든 참여자가 읽은 메시지(messages[3]) 이전만 보관됨
+        archive = ChatMessageArchive.objects.get(chat_room=chat_room)
+        self.assertEqual(archive.message_count, 3)
+        self.assertEqual(archive.period, datetime.date(2020, 1, 1))
+        self.assertEqual(
+            list(
+                ChatMessage.objects.filter(chat_room=chat_room)
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+            [messages[3].id, messages[4].id],
+        )
+
+        result = ChatService.get_chat_messages(
+            chat_room.id, self.seller.id, page_size=2, before_id=messages[4].id
+        )
+        self.assertEqual(
+            [m["id"] for m in result["data"]], [messages[3].id, messages[2].id]
+        )
+        self.assertEqual(result["data"][1]["sender_nickname"], "구매자")
+        self.assertTrue(result["has_more"])
+
+        result = ChatService.get_chat_messages(
+            chat_room.id, self.seller.id, page_size=2, before_id=messages[2].id
+        )
+        self.assertEqual(
+            [m["id"] for m in result["data"]], [messages[1].id, messages[0].id]
+        )
+        self.assertFalse(result["has_more"])
+
+    def test_chat_membership_cache(self):
+        """채팅방 참여 여부는 참여 중인 경우만 캐시되고 무효화 시 삭제되는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        key = ChatAccessCache.member_key(chat_room.id, self.buyer.id)
+
+        self.assertTrue(ChatAccessCache._load_membership(chat_room.id, self.buyer.id))
+        self.assertTrue(cache.get(key))
+
+        ChatAccessCache.invalidate_membership(chat_room.id, [self.buyer.id])
+        self.assertIsNone(cache.get(key))
+
+        # 참여하지 않은 사용자는 캐시하지 않음
+        outsider_key = ChatAccessCache.member_key(chat_room.id, 999999)
+        self.assertFalse(ChatAccessCache._load_membership(chat_room.id, 999999))
+        self.assertIsNone(cache.get(outsider_key))
+
+    def test_chat_room_presence(self):
+        """WebSocket 접속 상태 등록 / 해제 및 조회 API 테스트 (여러 기기 연결은 연결 수로 구분)"""
+        chat_room = self.test_create_chat_room()
+        async_to_sync(ChatPresence.ajoin)(chat_room.id, self.seller.id)
+        async_to_sync(ChatPresence.ajoin)(chat_room.id, self.seller.id)
+
+        response = self.client.get(f"/api/chats/{chat_room.id}/presence")
+        response_data = json.loads(response.content)
+        self.assertTrue(response_data["success"])
+        self.assertEqual(response_data["data"]["online_user_ids"], [self.seller.id])
+
+        # 한 기기만 나가면 여전히 접속 중
+        async_to_sync(ChatPresence.aleave)(chat_room.id, self.seller.id)
+        self.assertTrue(ChatPresence.is_viewing(chat_room.id, self.seller.id))
+
+        # heartbeat 는 연결 수를 바꾸지 않음
+        async_to_sync(ChatPresence.arefresh)(chat_room.id, self.seller.id)
+        async_to_sync(ChatPresence.aleave)(chat_room.id, self.seller.id)
+        self.assertFalse(ChatPresence.is_viewing(chat_room.id, self.seller.id))
+        self.assertEqual(
+            ChatPresence.viewing_user_ids(
+                chat_room.id, [self.seller.id, self.buyer.id]
+            ),
+            set(),
+        )
+
+    def test_mark_messages_read_only_moves_forward(self):
+        """읽음 처리는 앞으로만 이동하고 안 읽은 메시지 수를 재계산"""
+        chat_room = self.test_create_chat_room()
+        messages = [
+            ChatService.save_message(chat_room.id, self.buyer.id, f"메시지 {i}")
+            for i in range(3)
+        ]
+        participant = ChatRoomParticipant.objects.get(
+            chat_room=chat_room, user=self.seller
+        )
+        self.assertEqual(participant.unread_count, 3)
+
+        self.assertTrue(
+            ChatService.mark_messages_read(chat_room.id, self.seller.id, messages[1].id)
+        )
+        participant.refresh_from_db()
+        self.assertEqual(participant.last_read_message_id, messages[1].id)
+        self.assertEqual(participant.unread_count, 1)
+
+        # 같은 위치 / 이전 위치 / 다른 채팅방 메시지는 반영하지 않음
+        self.assertFalse(
+            ChatService.mark_messages_read(chat_room.id, self.seller.id, messages[1].id)
+        )
+        self.assertFalse(
+            ChatService.mark_messages_read(chat_room.id, self.seller.id, messages[0].id)
+        )
+        self.assertFalse(
+            ChatService.mark_messages_read(
+                chat_room.id, self.seller.id, messages[2].id + 1000
+            )
+        )
+        participant.refresh_from_db()
+        self.assertEqual(participant.last_read_message_id, messages[1].id)
+
+        # 메시지 조회 시 마지막 메시지까지 읽음 처리, 다시 조회해도 행을 쓰지 않음
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.seller_token['access']}"
+        )
+        self.client.get(f"/api/chats/{chat_room.id}/messages")
+        participant.refresh_from_db()
+        self.assertEqual(participant.last_read_message_id, messages[2].id)
+        self.assertEqual(participant.unread_count, 0)
+
+        updated_at = participant.updated_at
+        self.client.get(f"/api/chats/{chat_room.id}/messages")
+        participant.refresh_from_db()
+        self.assertEqual(participant.updated_at, updated_at)
+
+    @override_settings(
+        CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    )
+    def test_rest_message_broadcast_to_room_group(self):
+        """REST API로 전송한 메시지가 WebSocket 채팅방 그룹으로 전송되는지 테스트"""
+        chat_room = self.test_create_chat_room()
+
+        # WebSocket 구독자 대신 채널 하나를 채팅방 그룹에 참여시킴
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"chat_{chat_room.id}", channel_name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/chats/{chat_room.id}/messages",
+                {"message": "실시간 전송 확인"},
+                format="json",
+            )
+        message_id = json.loads(response.content)["data"]["id"]
+
+        event = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(event["type"], "chat_message")
+        self.assertEqual(event["message_id"], message_id)
+        self.assertEqual(event["message"], "실시간 전송 확인")
+        self.assertEqual(event["sender_nickname"], self.buyer.nickname)
+
+    @override_settings(
+        CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    )
+    def test_message_pushes_inbox_update(self):
+        """메시지 전송 시 수신자 인박스 그룹으로 안 읽은 수가 전송되는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        ChatService.save_message(chat_room.id, self.buyer.id, "이전 메시지")
+
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"user_{self.seller.id}", channel_name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/chats/{chat_room.id}/messages",
+                {"message": "인박스 확인"},
+                format="json",
+            )
+
+        event = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(event["type"], "room_updated")
+        self.assertEqual(event["room_id"], chat_room.id)
+        self.assertEqual(event["last_message_preview"], "인박스 확인")
+        self.assertEqual(event["unread_count"], 2)
+        self.assertEqual(event["total_unread"], 2)
+
+    @override_settings(
+        CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    )
+    def test_trade_actions_push_events(self):
+        """가격 제안 / 거래약속 변경이 채팅방과 인박스 그룹으로 전송되는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        self.product.accept_price_offer = True
+        self.product.save(update_fields=["accept_price_offer"])
+
+        channel_layer = get_channel_layer()
+        room_channel = async_to_sync(channel_layer.new_channel)()
+        inbox_channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"chat_{chat_room.id}", room_channel)
+        async_to_sync(channel_layer.group_add)(f"user_{self.seller.id}", inbox_channel)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = ProductService.create_price_offer(
+                self.product.id, self.buyer.id, 9000
+            )
+        self.assertTrue(offer["success"])
+
+        event = async_to_sync(channel_layer.receive)(room_channel)
+        self.assertEqual(event["type"], "chat_trade")
+        self.assertEqual(event["event"], "offer_created")
+        self.assertEqual(event["data"]["price"], 9000)
+        self.assertEqual(loads_text(event["frame_text"])["type"], "offer_created")
+        event = async_to_sync(channel_layer.receive)(inbox_channel)
+        self.assertEqual(event["type"], "inbox_trade")
+        self.assertEqual(event["room_id"], chat_room.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductService.respond_to_price_offer(
+                offer["data"]["id"], self.seller.id, "accept"
+            )
+        event = async_to_sync(channel_layer.receive)(room_channel)
+        self.assertEqual(event["event"], "offer_accepted")
+        self.assertEqual(event["data"]["status"], "accepted")
+
+        # 거래약속 생성: 시스템 메시지 다음으로 appointment_created 전달
+        with self.captureOnCommitCallbacks(execute=True):
+            ChatService.create_appointment(
+                chat_room.id,
+                self.buyer.id,
+                datetime.datetime.now() + datetime.timedelta(days=1),
+                37.5665,
+                126.9780,
+                "서울시청 앞",
+            )
+        events = [async_to_sync(channel_layer.receive)(room_channel) for _ in range(2)]
+        self.assertEqual([e["type"] for e in events], ["chat_message", "chat_trade"])
+        self.assertEqual(events[1]["event"], "appointment_created")
+        self.assertEqual(events[1]["data"]["buyer_id"], self.buyer.id)
+
+    def test_write_behind_bulk_save(self):
+        """write-behind: 발급된 메시지를 bulk 저장하고 카운터를 일괄 갱신하는지 테스트"""
+        chat_room = self.test_create_chat_room()
+        reserved = [
+            ChatService.reserve_message(chat_room.id, self.buyer.id, "구매자 1"),
+            ChatService.reserve_message(chat_room.id, self.seller.id, "판매자 1"),
+            ChatService.reserve_message(chat_room.id, self.buyer.id, "구매자 2"),
+        ]
+        self.assertEqual([m.seq for m in reserved], [1, 2, 3])
+        self.assertFalse(ChatMessage.objects.filter(chat_room=chat_room).exists())
+
+        # 버퍼 순서가 섞여도 seq 순서대로 저장
+        saved = ChatService.save_messages_bulk(list(reversed(reserved)))
+        self.assertEqual(saved, 3)
+
+        stored = list(ChatMessage.objects.filter(chat_room=chat_room).order_by("seq"))
+        self.assertEqual([m.id for m in stored], [m.id for m in reserved])
+
+        chat_room.refresh_from_db()
+        self.assertEqual(chat_room.last_message_id, reserved[-1].id)
+        self.assertEqual(chat_room.message_seq, 3)
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.seller
+            ).unread_count,
+            2,
+        )
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.buyer
+            ).unread_count,
+            1,
+        )
+
+    def test_save_message_without_row_lock(self):
+        """메시지 저장은 채팅방 행 잠금 조회 없이 UPDATE 한 번 + INSERT 한 번으로 처리"""
+        chat_room = self.test_create_chat_room()
+
+        with CaptureQueriesContext(connection) as queries:
+            chat_message = ChatService.save_message(
+                chat_room.id, self.buyer.id, "안녕하세요"
+            )
+
+        statements = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        self.assertEqual(len(statements), 2)
+        self.assertFalse(any("FOR UPDATE" in sql for sql in statements))
+
+        chat_room.refresh_from_db()
+        self.assertEqual(chat_room.last_message_id, chat_message.id)
+        self.assertEqual(chat_room.message_seq, chat_message.seq)
+        self.assertEqual(chat_room.last_message_preview, "안녕하세요")
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.seller
+            ).unread_count,
+            1,
+        )
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.buyer
+            ).unread_count,
+            0,
+        )
+
+    def test_reserve_messages_in_one_statement(self):
+        """write-behind: 여러 메시지의 ID/seq 를 채팅방 행 UPDATE 한 번으로 연속 발급"""
+        chat_room = self.test_create_chat_room()
+        drafts = [
+            ChatService.build_message(chat_room.id, self.buyer.id, f"메시지 {i}")
+            for i in range(3)
+        ]
+
+        with self.assertNumQueries(1):
+            reserved = ChatService.reserve_messages(chat_room.id, drafts)
+
+        self.assertEqual([m.seq for m in reserved], [1, 2, 3])
+        self.assertEqual([m.id for m in reserved], sorted(m.id for m in reserved))
+        chat_room.refresh_from_db()
+        self.assertEqual(chat_room.message_seq, 3)
+
+    def test_write_behind_crash_leaves_detectable_gap(self):
+        """write-behind: 저장 전 프로세스가 죽어도 seq가 재사용되지 않고 카운터 보정 가능"""
+        chat_room = self.test_create_chat_room()
+
+        # 발급 후 저장되지 못한 메시지 (비정상 종료 가정)
+        ChatService.reserve_message(chat_room.id, self.buyer.id, "유실된 메시지")
+
+        chat_message = ChatService.save_message(chat_room.id, self.buyer.id, "다음")
+        self.assertEqual(chat_message.seq, 2)
+        self.assertFalse(
+            ChatMessage.objects.filter(chat_room=chat_room, seq=1).exists()
+        )
+
+        call_command("repair_chat_counters", stdout=StringIO())
+        chat_room.refresh_from_db()
+        self.assertEqual(chat_room.last_message_id, chat_message.id)
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.seller
+            ).unread_count,
+            1,
+        )
+
+    def test_repair_chat_counters(self):
+        """비정규화된 채팅 카운터 보정 커맨드 테스트"""
+        chat_room = self.test_create_chat_room()
+        ChatService.save_message(chat_room.id, self.buyer.id, "안녕하세요")
+
+        # 카운터를 임의로 어긋나게 만듦
+        ChatRoomParticipant.objects.filter(chat_room=chat_room).update(unread_count=7)
+        ChatRoom.objects.filter(id=chat_room.id).update(
+            last_message=None, last_message_preview=""
+        )
+
+        call_command("repair_chat_counters", stdout=StringIO())
+
+        chat_room.refresh_from_db()
+        self.assertEqual(chat_room.last_message_preview, "안녕하세요")
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.seller
+            ).unread_count,
+            1,
+        )
+        self.assertEqual(
+            ChatRoomParticipant.objects.get(
+                chat_room=chat_room, user=self.buyer
+            ).unread_count,
+            0,
+        )
+
     def test_seller_cannot_create_chat_room_for_own_product(self):
         """판매자는 자신의 상품에 대한 채팅방을 생성할 수 없음을 테스트"""
         # 판매자 토큰으로 인증 설정
@@ -351,6 +971,30 @@ class ChatAPITestCase(TestCase):
 
         return appointment_id
 
+    def test_create_appointment_in_legacy_room_without_buyer(self):
+        """buyer 가 비어 있는 기존 채팅방은 판매자가 아닌 참여자를 구매자로 사용"""
+        legacy_room = ChatRoom.objects.create(product=self.product, seller=self.seller)
+        ChatRoomParticipant.objects.bulk_create(
+            [
+                ChatRoomParticipant(chat_room=legacy_room, user=self.seller),
+                ChatRoomParticipant(chat_room=legacy_room, user=self.buyer),
+            ]
+        )
+
+        result = ChatService.create_appointment(
+            legacy_room.id,
+            self.seller.id,
+            timezone.now() + datetime.timedelta(days=1),
+            37.5665,
+            126.9780,
+            "서울시청 앞",
+        )
+
+        self.assertTrue(result["success"], result["message"])
+        self.assertEqual(result["data"]["buyer_id"], self.buyer.id)
+        detail = ChatService.get_chat_room_detail(legacy_room.id, self.seller.id)
+        self.assertEqual(detail["data"]["buyer"]["id"], self.buyer.id)
+
     def test_get_appointment(self):
         """거래약속 조회 테스트"""
         # 먼저 약속 생성
@@ -562,3 +1206,439 @@ class ChatAPITestCase(TestCase):
         response_data = json.loads(response.content)
         self.assertFalse(response_data["success"])
         self.assertIn("접근할 권한이 없습니다", response_data["message"])
+
+
+class ChatWriteBufferTestCase(SimpleTestCase):
+    """write-behind 버퍼 flush / 재시도 테스트 (DB 대신 기록용 writer 사용)"""
+
+    def make_buffer(self, writer, max_batch=2):
+        return ChatWriteBuffer(flush_interval_ms=10, max_batch=max_batch, writer=writer)
+
+    def test_flush_in_batches(self):
+        """MAX_BATCH 단위로 나누어 저장"""
+        batches = []
+
+        def writer(batch):
+            batches.append([m.id for m in batch])
+            return len(batch)
+
+        buffer = self.make_buffer(writer)
+        self.assertFalse(buffer.add(SimpleNamespace(id=1)))
+        self.assertTrue(buffer.add(SimpleNamespace(id=2)))
+        buffer.add(SimpleNamespace(id=3))
+
+        saved = async_to_sync(buffer.flush)()
+
+        self.assertEqual(saved, 3)
+        self.assertEqual(batches, [[1, 2], [3]])
+        self.assertEqual(buffer.pending, [])
+
+    def test_bad_message_dropped_after_batch_failure(self):
+        """배치 저장 실패 시 한 건씩 저장하고 저장 불가 메시지만 폐기"""
+        saved_ids = []
+
+        def writer(batch):
+            if any(m.id == 2 for m in batch):
+                raise ValueError("invalid row")
+            saved_ids.extend(m.id for m in batch)
+            return len(batch)
+
+        buffer = self.make_buffer(writer, max_batch=10)
+        for message_id in [1, 2, 3]:
+            buffer.add(SimpleNamespace(id=message_id))
+
+        saved = async_to_sync(buffer.flush)()
+
+        self.assertEqual(saved, 2)
+        self.assertEqual(saved_ids, [1, 3])
+        self.assertEqual(buffer.dropped_count, 1)
+
+    def test_connection_error_keeps_messages_for_retry(self):
+        """DB 연결 장애 시 메시지를 순서대로 버퍼에 남겨 다음 주기에 재시도"""
+
+        def writer(batch):
+            raise OperationalError("connection refused")
+
+        buffer = self.make_buffer(writer, max_batch=10)
+        for message_id in [1, 2, 3]:
+            buffer.add(SimpleNamespace(id=message_id))
+
+        with self.assertRaises(OperationalError):
+            async_to_sync(buffer.flush)()
+
+        self.assertEqual([m.id for m in buffer.pending], [1, 2, 3])
+        self.assertEqual(buffer.dropped_count, 0)
+
+
+class MessageReserveBatcherTestCase(SimpleTestCase):
+    """write-behind 메시지 ID/seq 발급 묶음 처리 테스트 (DB 대신 기록용 reserver 사용)"""
+
+    def test_concurrent_frames_share_one_reservation(self):
+        """같은 채팅방에 동시에 들어온 프레임은 발급 한 번으로 처리"""
+        calls = []
+
+        def reserver(chat_room_id, messages):
+            calls.append((chat_room_id, len(messages)))
+            for seq, chat_message in enumerate(messages, start=1):
+                chat_message.seq = seq
+            return messages
+
+        batcher = MessageReserveBatcher(reserver=reserver)
+
+        async def send_burst():
+            reserved = await asyncio.gather(
+                *(
+                    batcher.reserve(SimpleNamespace(chat_room_id=1, seq=None))
+                    for _ in range(5)
+                )
+            )
+            await batcher.wait_idle()
+            return reserved
+
+        reserved = async_to_sync(send_burst)()
+
+        self.assertEqual(calls, [(1, 5)])
+        self.assertEqual([m.seq for m in reserved], [1, 2, 3, 4, 5])
+        self.assertEqual(batcher.running, set())
+        # 끝난 발급 태스크는 참조 목록에서 제거
+        self.assertEqual(batcher.tasks, set())
+
+
+class ReadReceiptBufferTestCase(SimpleTestCase):
+    """읽음 처리 coalescing 버퍼 테스트"""
+
+    def test_coalesce_latest_read_per_user(self):
+        """같은 사용자의 읽음 이벤트는 가장 최근 위치 하나로 합쳐 한 번에 저장"""
+        flushed = []
+
+        def writer(entries):
+            flushed.append(sorted(entries))
+            return len(entries)
+
+        buffer = ReadReceiptBuffer(flush_interval_ms=10, writer=writer)
+        self.assertTrue(buffer.mark(1, 10, 5))
+        self.assertTrue(buffer.mark(1, 10, 7))
+        self.assertFalse(buffer.mark(1, 10, 6))
+        self.assertTrue(buffer.mark(1, 20, 3))
+
+        self.assertEqual(async_to_sync(buffer.flush)(), 2)
+        self.assertEqual(flushed, [[((1, 10), 7), ((1, 20), 3)]])
+        self.assertFalse(buffer.has_pending())
+
+    def test_failed_flush_keeps_entries(self):
+        """저장 실패 시 읽음 위치를 버퍼에 되돌림"""
+
+        def writer(entries):
+            raise OperationalError("connection refused")
+
+        buffer = ReadReceiptBuffer(flush_interval_ms=10, writer=writer)
+        buffer.mark(1, 10, 5)
+
+        with self.assertRaises(OperationalError):
+            async_to_sync(buffer.flush)()
+
+        self.assertEqual(buffer.pending, {(1, 10): 5})
+
+
+class ChatRateLimitTestCase(SimpleTestCase):
+    """WebSocket 전송 속도 제한 테스트"""
+
+    def test_token_bucket(self):
+        """순간 허용량을 넘으면 거부하고 시간이 지나면 다시 허용"""
+        now = [0.0]
+        bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0])
+
+        self.assertEqual(
+            [bucket.consume() for _ in range(4)], [True, True, True, False]
+        )
+
+        now[0] += 0.5  # 초당 2개 → 0.5초에 1개 충전
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+
+    @override_settings(
+        CHAT_RATE_LIMIT={"USER_MESSAGES": 2, "USER_WINDOW": 60},
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "chat-rate-limit-test",
+            }
+        },
+    )
+    def test_user_rate_limiter_shared_across_connections(self):
+        """사용자 단위 제한은 연결과 무관하게 캐시에서 합산"""
+        results = [async_to_sync(UserRateLimiter.allow)(1) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertTrue(async_to_sync(UserRateLimiter.allow)(2))
+
+
+class ChatEventFrameTestCase(SimpleTestCase):
+    """그룹 이벤트 프레임 사전 직렬화 테스트"""
+
+    def test_message_event_carries_serialized_frame(self):
+        """발행 시 직렬화된 프레임이 Consumer 가 만들던 프레임과 같은지 확인"""
+        chat_message = ChatMessage(
+            id=10,
+            seq=3,
+            chat_room_id=1,
+            sender_id=2,
+            message="안녕하세요",
+            created_at=datetime.datetime(2026, 10, 19, 10, 0),
+        )
+        event = ChatEventPublisher.message_event(chat_message, sender_nickname="판매자")
+
+        frame = loads_text(event["frame_text"])
+        self.assertEqual(frame, ChatEventPublisher.message_frame(event))
+        self.assertEqual(frame["message"], "안녕하세요")
+        self.assertEqual(frame["seq"], 3)
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class ChatWebSocketTestCase(TransactionTestCase):
+    """WebSocket Consumer 테스트 (Consumer 는 별도 스레드에서 DB에 접근하므로 실제 커밋 필요)"""
+
+    def setUp(self):
+        self.seller = User.objects.create_user(
+            email="ws_seller@example.com",
+            password="testpassword123",
+            nickname="웹소켓판매자",
+            phone_number="01012345678",
+        )
+        self.buyer = User.objects.create_user(
+            email="ws_buyer@example.com",
+            password="testpassword123",
+            nickname="웹소켓구매자",
+            phone_number="01087654321",
+        )
+        product = Product.objects.create(
+            user=self.seller,
+            title="웹소켓 테스트 상품",
+            trade_type="sale",
+            price=10000,
+            description="웹소켓 테스트",
+            meeting_location=Point(126.9780, 37.5665, srid=4326),
+            status="selling",
+        )
+        self.chat_room = ChatRoom.objects.create(
+            product=product, seller=self.seller, buyer=self.buyer
+        )
+        ChatRoomParticipant.objects.bulk_create(
+            [
+                ChatRoomParticipant(chat_room=self.chat_room, user=self.seller),
+                ChatRoomParticipant(chat_room=self.chat_room, user=self.buyer),
+            ]
+        )
+
+    def communicator(self, user, path="/ws/chat/", query=""):
+        from a_core.asgi import application
+
+        token = str(RefreshToken.for_user(user).access_token)
+        return WebsocketCommunicator(application, f"{path}?token={token}{query}")
+
+    def test_multiplexed_subscribe_and_message(self):
+        """연결 하나로 채팅방을 구독하고 메시지/인박스 이벤트를 받는지 테스트"""
+
+        async def scenario():
+            communicator = self.communicator(self.seller)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            # 참여하지 않은 채팅방은 구독 불가
+            await communicator.send_json_to({"type": "subscribe", "room_id": 999999})
+            response = await communicator.receive_json_from()
+            self.assertEqual(response["type"], "error")
+
+            await communicator.send_json_to(
+                {"type": "subscribe", "room_id": self.chat_room.id}
+            )
+            response = await communicator.receive_json_from()
+            self.assertEqual(
+                response, {"type": "subscribed", "room_id": self.chat_room.id}
+            )
+
+            # 기존 채팅방별 엔드포인트에서 보낸 메시지도 같은 그룹으로 전달
+            buyer = self.communicator(self.buyer, f"/ws/chat/{self.chat_room.id}/")
+            connected, _ = await buyer.connect()
+            self.assertTrue(connected)
+            await buyer.send_json_to({"message": "안녕하세요"})
+
+            frames = [
+                await communicator.receive_json_from(),
+                await communicator.receive_json_from(),
+            ]
+            by_type = {frame["type"]: frame for frame in frames}
+            self.assertEqual(by_type["message"]["message"], "안녕하세요")
+            self.assertEqual(by_type["message"]["room_id"], self.chat_room.id)
+            self.assertEqual(by_type["room_updated"]["unread_count"], 1)
+
+            await communicator.send_json_to(
+                {"type": "unsubscribe", "room_id": self.chat_room.id}
+            )
+            response = await communicator.receive_json_from()
+            self.assertEqual(response["type"], "unsubscribed")
+
+            await buyer.disconnect()
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_reconnect_replays_missed_messages(self):
+        """재연결 시 last_seq 이후 메시지를 먼저 재전송하는지 테스트"""
+        messages = [
+            ChatService.save_message(self.chat_room.id, self.buyer.id, f"메시지 {i}")
+            for i in range(3)
+        ]
+
+        async def scenario():
+            communicator = self.communicator(
+                self.seller, f"/ws/chat/{self.chat_room.id}/", "&last_seq=1"
+            )
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            replayed = [
+                await communicator.receive_json_from(),
+                await communicator.receive_json_from(),
+            ]
+            self.assertEqual(
+                [frame["message_id"] for frame in replayed],
+                [messages[1].id, messages[2].id],
+            )
+            done = await communicator.receive_json_from()
+            self.assertEqual(done["type"], "replay_done")
+            self.assertEqual(done["count"], 2)
+            self.assertFalse(done["has_more"])
+
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_reconnect_rejects_malformed_cursor(self):
+        """숫자가 아닌 last_seq 로는 연결을 거부하고 그룹 / 접속 상태 / 게이지를 남기지 않는지 테스트"""
+        before = ChatMetrics.snapshot()["gauges"].get("connections", 0)
+
+        async def scenario():
+            communicator = self.communicator(
+                self.seller, f"/ws/chat/{self.chat_room.id}/", "&last_seq=abc"
+            )
+            connected, code = await communicator.connect()
+            self.assertFalse(connected)
+            self.assertEqual(code, CLOSE_BAD_REQUEST)
+            self.assertEqual(
+                ChatMetrics.snapshot()["gauges"].get("connections", 0), before
+            )
+            await communicator.wait()
+
+        async_to_sync(scenario)()
+        self.assertFalse(ChatPresence.is_viewing(self.chat_room.id, self.seller.id))
+
+    def test_read_event_rejects_unknown_message_id(self):
+        """채팅방 마지막 메시지보다 앞선 message_id 로는 읽음 처리 / 전달되지 않는지 테스트"""
+        chat_message = ChatService.save_message(
+            self.chat_room.id, self.buyer.id, "안녕하세요"
+        )
+
+        async def scenario():
+            communicator = self.communicator(
+                self.seller, f"/ws/chat/{self.chat_room.id}/"
+            )
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            await communicator.send_json_to(
+                {"type": "read", "message_id": chat_message.id + 1000}
+            )
+            response = await communicator.receive_json_from()
+            self.assertEqual(response["type"], "error")
+
+            await communicator.send_json_to(
+                {"type": "read", "message_id": chat_message.id}
+            )
+            response = await communicator.receive_json_from()
+            self.assertEqual(response["type"], "read")
+            self.assertEqual(response["message_id"], chat_message.id)
+
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    @patch.object(MultiplexChatConsumer, "IDLE_TIMEOUT", 0.3)
+    @patch.object(MultiplexChatConsumer, "HEARTBEAT_INTERVAL", 0.1)
+    def test_idle_connection_is_reaped(self):
+        """heartbeat 에 응답하지 않는 연결을 종료하고 연결 수 게이지를 되돌리는지 테스트"""
+        before = ChatMetrics.snapshot()["gauges"].get("connections", 0)
+
+        async def scenario():
+            communicator = self.communicator(self.seller)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            self.assertEqual(
+                ChatMetrics.snapshot()["gauges"]["connections"], before + 1
+            )
+
+            # 클라이언트 ping 에는 pong 으로 응답
+            await communicator.send_json_to({"type": "ping"})
+            self.assertEqual(await communicator.receive_json_from(), {"type": "pong"})
+
+            # 응답하지 않으면 ping 을 몇 번 받은 뒤 연결 종료
+            while True:
+                output = await communicator.receive_output(timeout=2)
+                if output["type"] == "websocket.close":
+                    break
+                self.assertEqual(json.loads(output["text"])["type"], "ping")
+            self.assertEqual(output["code"], CLOSE_IDLE)
+            self.assertEqual(ChatMetrics.snapshot()["gauges"]["connections"], before)
+
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_ping_flood_is_throttled(self):
+        """클라이언트 ping 을 연속으로 보내도 PING_BURST 개까지만 pong 으로 응답하는지 테스트"""
+
+        async def scenario():
+            communicator = self.communicator(self.seller)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            for _ in range(MultiplexChatConsumer.PING_BURST + 5):
+                await communicator.send_json_to({"type": "ping"})
+            for _ in range(MultiplexChatConsumer.PING_BURST):
+                self.assertEqual(
+                    await communicator.receive_json_from(), {"type": "pong"}
+                )
+            self.assertTrue(await communicator.receive_nothing(timeout=0.3))
+
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    @patch.object(ChatConsumer, "IDLE_TIMEOUT", 0.3)
+    @patch.object(ChatConsumer, "HEARTBEAT_INTERVAL", 0.1)
+    def test_legacy_endpoint_heartbeat_is_opt_in(self):
+        """채팅방별 엔드포인트는 heartbeat 를 선택한 연결만 ping 을 받고 정리되는지 테스트"""
+        path = f"/ws/chat/{self.chat_room.id}/"
+
+        async def scenario():
+            # 수신만 하는 기존 클라이언트는 ping 을 받지 않고 연결이 유지됨
+            listener = self.communicator(self.seller, path)
+            connected, _ = await listener.connect()
+            self.assertTrue(connected)
+            self.assertTrue(await listener.receive_nothing(timeout=0.6))
+            await listener.disconnect()
+
+            # ?heartbeat=1 로 연결하면 응답하지 않을 때 연결 종료
+            communicator = self.communicator(self.seller, path, "&heartbeat=1")
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            while True:
+                output = await communicator.receive_output(timeout=2)
+                if output["type"] == "websocket.close":
+                    break
+                self.assertEqual(json.loads(output["text"])["type"], "ping")
+            self.assertEqual(output["code"], CLOSE_IDLE)
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
@@ -1,5 +1,6 @@
 import json
 import tempfile
+import threading
 from unittest.mock import MagicMock, patch
 
 from a_apis.models.files import File
@@ -17,13 +18,15 @@ from a_apis.models.region import (
 )
 from a_apis.schema.products import LocationSchema, ProductCreateSchema
 from a_apis.service.products import ProductService
+from a_apis.service.user_cards import UserCardService
 from a_user.models import MannerRating, PriceOffer, Review, User
 from PIL import Image
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.gis.geos import Point
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -1241,6 +1244,39 @@ class ProductAPITestCase(TestCase):
         new_temp = self.user.update_manner_temperature("bad_response")
         self.assertEqual(float(new_temp), 0.0)
 
+    def test_create_manner_rating_applies_single_temperature_update(self):
+        """여러 유형의 매너 평가를 한 번에 등록하면 매너온도는 합계로 한 번만 변경"""
+        product = Product.objects.create(
+            user=self.user,
+            title="거래 완료 상품",
+            description="매너 평가 테스트",
+            price=10000,
+        )
+        ProductService.complete_trade(product.id, self.user.id, self.other_user.id)
+
+        result = ProductService.create_manner_rating(
+            product.id, self.other_user.id, ["kind", "time", "kind", "bad_price"]
+        )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["data"]["rating_types"], ["kind", "time", "bad_price"])
+        self.assertEqual(
+            MannerRating.objects.filter(product=product, rater=self.other_user).count(),
+            3,
+        )
+        # 36.5 + 0.2 + 0.2 - 0.5
+        self.user.refresh_from_db()
+        self.assertEqual(float(self.user.rating_score), 36.4)
+
+        # 범위 제한은 제출 단위 합계에 적용
+        User.objects.filter(id=self.user.id).update(rating_score=99.8)
+        MannerRating.objects.filter(product=product).delete()
+        ProductService.create_manner_rating(
+            product.id, self.other_user.id, ["kind", "time", "accurate"]
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(float(self.user.rating_score), 99.9)
+
 
 class ProductDistanceCalculationTestCase(TestCase):
     """상품 거래 위치와 인증 동네 간 거리 계산 테스트"""
@@ -2613,3 +2649,278 @@ class PriceOfferCountingTestCase(TestCase):
         self.assertEqual(result["data"]["price_offer_count"], 0)
         self.assertTrue(result["data"]["accept_price_offer"])
         print("✅ 가격 제안 없을 때 0 카운팅 테스트 통과")
+
+    def test_price_offer_summary(self):
+        """대기중 가격 제안 요약 (개수 / 최저 / 최고 / 중앙값 / 최근 제안) 테스트"""
+        for user, price in [
+            (self.buyer1, 90000),
+            (self.buyer2, 85000),
+            (self.buyer1, 92000),
+            (self.buyer2, 88000),
+        ]:
+            latest = PriceOffer.objects.create(
+                product=self.product_with_offers, user=user, price=price
+            )
+        # 대기중이 아닌 제안은 집계에서 제외
+        PriceOffer.objects.create(
+            product=self.product_with_offers,
+            user=self.buyer1,
+            price=99000,
+            status="rejected",
+        )
+        # 최근 제안자 카드 캐시를 미리 채워 집계 쿼리만 측정
+        UserCardService.get_many([self.buyer2.id])
+
+        with self.assertNumQueries(1):
+            result = ProductService.get_price_offer_summary(
+                product_id=self.product_with_offers.id, user_id=self.seller.id
+            )
+
+        self.assertTrue(result["success"])
+        summary = result["data"]
+        self.assertEqual(summary["pending_count"], 4)
+        self.assertEqual(summary["min_price"], 85000)
+        self.assertEqual(summary["max_price"], 92000)
+        self.assertEqual(summary["median_price"], 89000)
+        self.assertEqual(summary["latest_offer"]["id"], latest.id)
+        self.assertEqual(summary["latest_offer"]["user_nickname"], "구매자2")
+
+        # 판매자가 아니면 조회 불가
+        result = ProductService.get_price_offer_summary(
+            product_id=self.product_with_offers.id, user_id=self.buyer1.id
+        )
+        self.assertFalse(result["success"])
+
+    def test_my_price_offer_summaries_via_api(self):
+        """판매자 대시보드 요약은 상품 수와 무관하게 쿼리 1개로 조회"""
+        extra_products = [
+            Product.objects.create(
+                user=self.seller,
+                title=f"추가 상품 {i}",
+                description="추가 상품",
+                price=10000,
+                category=self.category,
+                region=self.eupmyeondong,
+                refresh_at=timezone.now(),
+            )
+            for i in range(3)
+        ]
+        for product in extra_products:
+            PriceOffer.objects.create(product=product, user=self.buyer1, price=9000)
+        # 나눔 상품은 판매 가격이 없음
+        share_product = Product.objects.create(
+            user=self.seller,
+            title="나눔 상품",
+            description="나눔합니다",
+            trade_type="share",
+            price=None,
+            category=self.category,
+            region=self.eupmyeondong,
+            refresh_at=timezone.now(),
+        )
+        PriceOffer.objects.create(
+            product=self.product_with_offers, user=self.buyer2, price=95000
+        )
+        # 최근 제안자 카드 캐시를 미리 채워 집계 쿼리만 측정
+        ProductService.get_my_price_offer_summaries(user_id=self.seller.id)
+
+        with self.assertNumQueries(1):
+            result = ProductService.get_my_price_offer_summaries(user_id=self.seller.id)
+        summaries = {s["product_id"]: s for s in result["data"]}
+        self.assertEqual(len(summaries), 6)
+        self.assertIsNone(summaries[share_product.id]["product_price"])
+        self.assertEqual(summaries[self.product_without_offers.id]["pending_count"], 0)
+        self.assertIsNone(summaries[self.product_without_offers.id]["latest_offer"])
+        self.assertEqual(summaries[self.product_with_offers.id]["median_price"], 95000)
+
+        response = Client().get(
+            "/api/products/my-products/price-offer-summary",
+            HTTP_AUTHORIZATION=f"Bearer {self.seller_token}",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(len(data["data"]), 6)
+
+
+class TradeConcurrencyTestCase(TransactionTestCase):
+    """거래 상태 전이 동시성 테스트 (스레드마다 별도 DB 연결 사용)"""
+
+    def setUp(self):
+        self.seller = User.objects.create_user(
+            username="seller@example.com",
+            email="seller@example.com",
+            password="sellerpassword123",
+            nickname="판매자",
+            phone_number="01012345678",
+        )
+        self.buyers = [
+            User.objects.create_user(
+                username=f"buyer{i}@example.com",
+                email=f"buyer{i}@example.com",
+                password="buyerpassword123",
+                nickname=f"구매자{i}",
+                phone_number="01087654321",
+            )
+            for i in range(2)
+        ]
+        self.product = Product.objects.create(
+            user=self.seller,
+            title="동시성 테스트 상품",
+            description="동시성 테스트",
+            price=100000,
+            accept_price_offer=True,
+        )
+
+    def _run_concurrently(self, calls):
+        """barrier 로 동시에 출발시킨 호출 결과 목록"""
+        barrier = threading.Barrier(len(calls))
+        results = [None] * len(calls)
+
+        def worker(index, call):
+            try:
+                barrier.wait()
+                results[index] = call()
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(i, call))
+            for i, call in enumerate(calls)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_complete_trade(self):
+        """서로 다른 구매자로 동시에 거래 완료 시 하나만 성공"""
+        results = self._run_concurrently(
+            [
+                lambda buyer=buyer: ProductService.complete_trade(
+                    self.product.id, self.seller.id, buyer.id
+                )
+                for buyer in self.buyers
+            ]
+        )
+
+        self.assertEqual(sum(result["success"] for result in results), 1)
+        failed = next(result for result in results if not result["success"])
+        self.assertEqual(failed["message"], "이미 판매 완료된 상품입니다.")
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.status, Product.Status.SOLDOUT)
+        winner = results.index(next(r for r in results if r["success"]))
+        self.assertEqual(self.product.buyer_id, self.buyers[winner].id)
+
+    def test_concurrent_offer_accept(self):
+        """같은 상품의 두 제안을 동시에 수락하면 하나만 수락됨"""
+        offers = [
+            PriceOffer.objects.create(
+                product=self.product, user=buyer, price=90000 - i * 1000
+            )
+            for i, buyer in enumerate(self.buyers)
+        ]
+
+        results = self._run_concurrently(
+            [
+                lambda offer=offer: ProductService.respond_to_price_offer(
+                    offer.id, self.seller.id, "accept"
+                )
+                for offer in offers
+            ]
+        )
+
+        self.assertEqual(sum(result["success"] for result in results), 1)
+        statuses = sorted(
+            PriceOffer.objects.filter(product=self.product).values_list(
+                "status", flat=True
+            )
+        )
+        self.assertEqual(statuses, ["accepted", "rejected"])
+
+    def test_invalid_transition_after_completion(self):
+        """거래 완료된 상품은 상태를 되돌릴 수 없음"""
+        ProductService.complete_trade(
+            self.product.id, self.seller.id, self.buyers[0].id
+        )
+
+        result = ProductService.update_product_status(
+            self.product.id, self.seller.id, Product.Status.SELLING
+        )
+
+        self.assertFalse(result["success"])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.status, Product.Status.SOLDOUT)
+
+
+class ProductReputationAutocommitTestCase(TransactionTestCase):
+    """트랜잭션 밖(autocommit)에서 새로 가입한 유저의 첫 상품 등록 / 삭제 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="newbie@example.com",
+            email="newbie@example.com",
+            password="newbiepassword123",
+            nickname="새내기",
+            phone_number="01012345678",
+        )
+        sido = SidoRegion.objects.create(code="11", name="서울특별시")
+        sigungu = SigunguRegion.objects.create(code="11000", sido=sido, name="중구")
+        location = Point(126.9780, 37.5665, srid=4326)
+        self.region = EupmyeondongRegion.objects.create(
+            code="1100000", sigungu=sigungu, name="명동", center_coordinates=location
+        )
+        UserActivityRegion.objects.create(
+            user=self.user, activity_area=self.region, priority=1, location=location
+        )
+
+    def test_first_product_of_new_user(self):
+        from a_user.models import UserReputation
+
+        data = ProductCreateSchema(
+            title="첫 상품",
+            trade_type="sale",
+            price=10000,
+            description="처음 등록하는 상품",
+            region_id=self.region.id,
+        )
+        result = ProductService.create_product(user_id=self.user.id, data=data)
+
+        self.assertTrue(result["success"], result["message"])
+        reputation = UserReputation.objects.get(user=self.user)
+        self.assertEqual(reputation.selling_product_count, 1)
+
+        result = ProductService.delete_product(result["data"]["id"], self.user.id)
+        self.assertTrue(result["success"], result["message"])
+        reputation.refresh_from_db()
+        self.assertEqual(reputation.selling_product_count, 0)
+
+    def test_delete_product_removes_files_after_commit(self):
+        """상품 삭제 시 이미지 파일은 트랜잭션 커밋 후에 삭제되는지 테스트"""
+        product = Product.objects.create(
+            user=self.user,
+            title="이미지 상품",
+            trade_type="sale",
+            price=10000,
+            description="이미지가 있는 상품",
+            region=self.region,
+        )
+        file_obj = File.objects.create(file="test_path.jpg", size=1024, type="jpg")
+        ProductImage.objects.create(product=product, file=file_obj)
+
+        deleted = []
+
+        def delete_file(target):
+            deleted.append((target.id, connection.in_atomic_block))
+            return True
+
+        with patch(
+            "a_apis.service.products.FileService.delete_file", side_effect=delete_file
+        ):
+            result = ProductService.delete_product(product.id, self.user.id)
+
+        self.assertTrue(result["success"], result["message"])
+        self.assertEqual(deleted, [(file_obj.id, False)])
+        self.assertFalse(Product.objects.filter(id=product.id).exists())
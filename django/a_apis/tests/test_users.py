@@ -1,7 +1,7 @@
 import json
 import tempfile
 from datetime import timedelta
-from io import BytesIO
+from io import BytesIO, StringIO
 from unittest.mock import MagicMock, patch
 
 from a_apis.models.email_verification import EmailVerification
@@ -232,6 +232,28 @@ class UserProfileUpdateTest(TestCase):
         self.user.refresh_from_db()
         self.assertEqual(self.user.nickname, "변경된닉네임")
 
+    @patch("a_apis.service.files.FileService.upload_file")
+    @patch("a_apis.service.files.FileService.delete_file")
+    def test_user_card_is_invalidated(self, mock_delete_file, mock_upload_file):
+        """닉네임 / 매너온도 변경 시 사용자 카드 캐시 갱신 테스트"""
+        from a_apis.schema.users import UpdateProfileSchema
+        from a_apis.service.user_cards import UserCardService
+        from a_apis.service.users import UserService
+
+        card = UserCardService.get(self.user.id)
+        self.assertEqual(card["nickname"], "원래닉네임")
+        self.assertIsNone(card["region_name"])
+        with self.assertNumQueries(0):
+            UserCardService.get_many([self.user.id])
+
+        UserService.update_user_profile(
+            self.mock_request, UpdateProfileSchema(nickname="변경된닉네임")
+        )
+        self.assertEqual(UserCardService.get(self.user.id)["nickname"], "변경된닉네임")
+
+        User.apply_manner_temperature_delta(self.user.id, 1)
+        self.assertEqual(UserCardService.get(self.user.id)["rating_score"], 37.5)
+
     @patch("a_apis.service.files.FileService.upload_file")
     @patch("a_apis.service.files.FileService.delete_file")
     def test_update_profile_image(self, mock_delete_file, mock_upload_file):
@@ -520,3 +542,228 @@ class UserLoginAndMeAPITest(TestCase):
             "로그인과 내 정보 조회 API의 사용자 데이터 구조가 일관성 있게 구성되었습니다."
         )
         print(f"공통 사용자 ID: {login_user_data['id']}")
+
+    def test_withdraw_user_invalidates_chat_access_cache(self):
+        """회원 탈퇴 시 계정 비활성화 및 WebSocket 접근 캐시 삭제 테스트"""
+        from a_apis.service.chat_access import ChatAccessCache
+        from a_apis.service.users import UserService
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        from django.core.cache import cache
+
+        ChatAccessCache._load_user(self.user.id)
+        self.assertIsNotNone(cache.get(ChatAccessCache.user_key(self.user.id)))
+
+        class MockRequest:
+            def __init__(self, token):
+                self.auth = token
+
+        refresh = RefreshToken.for_user(self.user)
+        result = UserService.withdraw_user(MockRequest(str(refresh.access_token)))
+
+        self.assertTrue(result["success"])
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNone(cache.get(ChatAccessCache.user_key(self.user.id)))
+        # 탈퇴한 사용자는 WebSocket 인증 대상에서 제외
+        self.assertIsNone(ChatAccessCache._load_user(self.user.id))
+
+
+class UserReputationTest(TestCase):
+    """유저 평판 집계(UserReputation) 갱신 / 조회 테스트"""
+
+    def setUp(self):
+        from a_apis.models import Product
+
+        self.seller = User.objects.create_user(
+            username="seller@example.com",
+            email="seller@example.com",
+            password="sellerpassword123",
+            nickname="판매자",
+            phone_number="01012345678",
+        )
+        self.buyer = User.objects.create_user(
+            username="buyer@example.com",
+            email="buyer@example.com",
+            password="buyerpassword123",
+            nickname="구매자",
+            phone_number="01087654321",
+        )
+        self.products = [
+            Product.objects.create(
+                user=self.seller,
+                title=f"평판 테스트 상품 {i}",
+                description="평판 테스트",
+                price=10000,
+            )
+            for i in range(2)
+        ]
+        # 집계 도입 전 가입한 유저 (집계 행 없음)
+        from a_user.models import UserReputation
+
+        UserReputation.objects.all().delete()
+
+    def test_reputation_is_maintained_on_writes(self):
+        from a_apis.service.products import ProductService
+        from a_apis.service.users import UserService
+        from a_user.models import UserReputation
+
+        from django.core.management import call_command
+
+        product = self.products[0]
+        # 첫 갱신 시 원본에서 집계 행 생성 (판매중 상품 1개)
+        ProductService.complete_trade(product.id, self.seller.id, self.buyer.id)
+        ProductService.create_review(product.id, self.buyer.id, "좋은 거래였어요")
+        ProductService.create_manner_rating(
+            product.id, self.buyer.id, ["kind", "time", "bad_price"]
+        )
+        ProductService.update_product_status(
+            self.products[1].id, self.seller.id, "reserved"
+        )
+
+        reputation = UserReputation.objects.get(user=self.seller)
+        self.assertEqual(reputation.selling_product_count, 0)
+        self.assertEqual(reputation.review_count, 1)
+        self.assertEqual(reputation.positive_count, 2)
+        self.assertEqual(reputation.negative_count, 1)
+        self.assertEqual(reputation.kind_count, 1)
+
+        profile = UserService.get_user_profile(self.seller.id)["user"]
+        self.assertEqual(profile["selling_products_count"], 0)
+        self.assertEqual(profile["total_review_count"], 1)
+        self.assertEqual(len(profile["top_manner_ratings"]), 3)
+
+        # 매너평가 상세는 유저 + 집계 조회 한 번
+        with self.assertNumQueries(1):
+            detail = UserService.get_user_manner_ratings_detail(self.seller.id)
+        self.assertEqual(detail["positive_ratings"]["total_count"], 2)
+        self.assertEqual(
+            [r["rating_type"] for r in detail["negative_ratings"]["ratings"]],
+            ["bad_price"],
+        )
+
+        # 어긋난 집계는 재계산 명령으로 복구
+        UserReputation.objects.filter(user=self.seller).update(
+            review_count=10, kind_count=0
+        )
+        call_command("rebuild_user_reputation", stdout=StringIO())
+        reputation.refresh_from_db()
+        self.assertEqual(reputation.review_count, 1)
+        self.assertEqual(reputation.kind_count, 1)
+
+    def test_manner_rating_save_is_atomic(self):
+        """개별 매너평가 저장 중 집계 갱신이 실패하면 평가 / 매너온도도 반영되지 않음"""
+        from a_user.models import MannerRating
+
+        temperature = self.seller.rating_score
+
+        with patch(
+            "a_apis.service.reputation.ReputationService.record_ratings",
+            side_effect=RuntimeError("집계 실패"),
+        ):
+            with self.assertRaises(RuntimeError):
+                MannerRating.objects.create(
+                    product=self.products[0],
+                    rater=self.buyer,
+                    rated_user=self.seller,
+                    rating_type="kind",
+                )
+
+        self.assertFalse(MannerRating.objects.filter(rated_user=self.seller).exists())
+        self.seller.refresh_from_db()
+        self.assertEqual(self.seller.rating_score, temperature)
+
+
+class UserReviewListTest(TestCase):
+    """받은 거래후기 목록 조회 쿼리 수 / 커서 페이지네이션 테스트"""
+
+    def setUp(self):
+        from a_apis.models import Product
+        from a_apis.models.region import (
+            EupmyeondongRegion,
+            SidoRegion,
+            SigunguRegion,
+            UserActivityRegion,
+        )
+        from a_user.models import Review
+
+        from django.contrib.gis.geos import Point
+
+        self.seller = User.objects.create_user(
+            username="seller@example.com",
+            email="seller@example.com",
+            password="sellerpassword123",
+            nickname="판매자",
+            phone_number="01012345678",
+        )
+        location = Point(126.9780, 37.5665, srid=4326)
+        sido = SidoRegion.objects.create(code="11", name="서울특별시")
+        sigungu = SigunguRegion.objects.create(code="11000", sido=sido, name="중구")
+        area = EupmyeondongRegion.objects.create(
+            code="1100000", sigungu=sigungu, name="명동", center_coordinates=location
+        )
+
+        self.reviews = []
+        for i in range(5):
+            buyer = User.objects.create_user(
+                username=f"buyer{i}@example.com",
+                email=f"buyer{i}@example.com",
+                password="buyerpassword123",
+                nickname=f"구매자{i}",
+                phone_number="01087654321",
+            )
+            UserActivityRegion.objects.create(
+                user=buyer, activity_area=area, priority=1, location=location
+            )
+            product = Product.objects.create(
+                user=self.seller,
+                title=f"후기 테스트 상품 {i}",
+                description="후기 테스트",
+                price=10000,
+                status=Product.Status.SOLDOUT,
+                buyer=buyer,
+            )
+            self.reviews.append(
+                Review.objects.create(
+                    product=product,
+                    reviewer=buyer,
+                    receiver=self.seller,
+                    content=f"후기 {i}",
+                )
+            )
+
+    def test_reviews_detail_keyset_pagination(self):
+        from a_apis.service.reputation import ReputationService
+        from a_apis.service.users import UserService
+
+        ReputationService.rebuild([self.seller.id])
+
+        # 후기 수와 무관하게 유저 / 후기 / 작성자 카드 조회 3번
+        with self.assertNumQueries(3):
+            first = UserService.get_user_reviews_detail(self.seller.id, page_size=3)
+
+        self.assertTrue(first["success"])
+        self.assertEqual(first["total_count"], 5)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(
+            [r["id"] for r in first["reviews"]],
+            [review.id for review in reversed(self.reviews)][:3],
+        )
+        self.assertEqual(first["reviews"][0]["reviewer_role"], "buyer")
+        self.assertEqual(first["reviews"][0]["reviewer_region"], "명동")
+
+        second = UserService.get_user_reviews_detail(
+            self.seller.id, before_id=first["next_before_id"], page_size=3
+        )
+        self.assertFalse(second["has_more"])
+        self.assertIsNone(second["next_before_id"])
+        self.assertEqual(
+            [r["id"] for r in second["reviews"]],
+            [self.reviews[1].id, self.reviews[0].id],
+        )
+
+        # 최근 후기 작성자 카드는 캐시에서 조회
+        with self.assertNumQueries(2):
+            profile = UserService.get_user_profile(self.seller.id)["user"]
+        self.assertEqual(len(profile["recent_reviews"]), 3)
+        self.assertEqual(profile["recent_reviews"][0]["reviewer_region"], "명동")
@@ -145,6 +145,28 @@ CHANNEL_LAYERS = {
     },
 }
 
+# 채팅 메시지 write-behind 설정 (a_apis/service/chat_buffer.py 참고)
+# 활성화 시 메시지를 먼저 브로드캐스트하고 FLUSH_INTERVAL_MS 마다 또는 MAX_BATCH 개 단위로
+# 모아서 저장. 비정상 종료 시 최대 한 주기 분량의 메시지가 유실될 수 있음
+CHAT_WRITE_BEHIND = {
+    "ENABLED": os.environ.get("CHAT_WRITE_BEHIND_ENABLED", "False") == "True",
+    "FLUSH_INTERVAL_MS": int(os.environ.get("CHAT_WRITE_BEHIND_FLUSH_MS", "50")),
+    "MAX_BATCH": int(os.environ.get("CHAT_WRITE_BEHIND_MAX_BATCH", "100")),
+    "MAX_PENDING": 10000,
+}
+
+# 채팅 WebSocket 전송 속도 제한 (a_apis/service/chat_limits.py 참고)
+CHAT_RATE_LIMIT = {
+    "CONNECTION_RATE": 5,
+    "CONNECTION_BURST": 10,
+    "USER_MESSAGES": 60,
+    "USER_WINDOW": 10,
+    "MAX_VIOLATIONS": 30,
+}
+
+# WebSocket 읽음 처리는 메모리에 모았다가 이 주기(ms)마다 DB에 반영
+CHAT_READ_RECEIPT_FLUSH_MS = int(os.environ.get("CHAT_READ_RECEIPT_FLUSH_MS", "2000"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,120 @@
+# Generated by Django 5.1.6 on 2026-10-19 16:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_user", "0002_user_rating_count_priceoffer_mannerrating_review"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserReputation",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="reputation",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="유저",
+                    ),
+                ),
+                (
+                    "time_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="시간 약속 평가 수"
+                    ),
+                ),
+                (
+                    "response_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="빠른 응답 평가 수"
+                    ),
+                ),
+                (
+                    "kind_count",
+                    models.PositiveIntegerField(default=0, verbose_name="친절 평가 수"),
+                ),
+                (
+                    "accurate_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="상품 상태 일치 평가 수"
+                    ),
+                ),
+                (
+                    "negotiable_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="가격 제안 긍정 평가 수"
+                    ),
+                ),
+                (
+                    "bad_time_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="약속시간 미준수 평가 수"
+                    ),
+                ),
+                (
+                    "bad_response_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="느린 응답 평가 수"
+                    ),
+                ),
+                (
+                    "bad_manner_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="불친절 평가 수"
+                    ),
+                ),
+                (
+                    "bad_accuracy_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="상품 상태 불일치 평가 수"
+                    ),
+                ),
+                (
+                    "bad_price_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="과도한 흥정 평가 수"
+                    ),
+                ),
+                (
+                    "positive_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="긍정 매너 평가 수"
+                    ),
+                ),
+                (
+                    "negative_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="부정 매너 평가 수"
+                    ),
+                ),
+                (
+                    "review_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="받은 거래 후기 수"
+                    ),
+                ),
+                (
+                    "selling_product_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="판매중 상품 수"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "유저 평판 집계",
+                "verbose_name_plural": "유저 평판 집계 목록",
+                "db_table": "user_reputations",
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_user", "0003_userreputation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["receiver", "-id"], name="review_receiver_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a_user", "0004_review_receiver_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="priceoffer",
+            index=models.Index(
+                fields=["product", "status"], name="price_offer_product_status_idx"
+            ),
+        ),
+    ]
@@ -1,8 +1,12 @@
+from decimal import Decimal
+
 from a_common.models import CommonModel
 
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Least
 from django.utils import timezone
 
 
@@ -18,7 +22,10 @@ class UserManager(BaseUserManager):
 
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
-        user.save()
+        with transaction.atomic():
+            user.save()
+            # 새 유저는 집계할 원본이 없으므로 0 으로 시작하는 평판 집계 행을 함께 생성
+            UserReputation.objects.create(user=user)
         return user
 
     def create_superuser(self, email, password, **extra_fields):
@@ -67,36 +74,63 @@ class User(AbstractUser, CommonModel):
     def __str__(self):
         return f"{self.nickname} ({self.email})"
 
+    # 평가 유형에 따른 온도 변화
+    MANNER_TEMPERATURE_CHANGES = {
+        # 긍정적 평가: 온도 상승
+        "time": Decimal("0.2"),  # 시간 약속을 잘 지켜요
+        "response": Decimal("0.2"),  # 응답이 빨라요
+        "kind": Decimal("0.2"),  # 친절하고 매너가 좋아요
+        "accurate": Decimal("0.2"),  # 상품 상태가 설명과 일치해요
+        "negotiable": Decimal("0.2"),  # 가격 제안에 대해 긍정적이에요
+        # 부정적 평가: 온도 하락
+        "bad_time": Decimal("-0.5"),  # 약속시간을 안 지켜요
+        "bad_response": Decimal("-0.5"),  # 응답이 느려요
+        "bad_manner": Decimal("-0.5"),  # 불친절해요
+        "bad_accuracy": Decimal("-0.5"),  # 상품 상태가 설명과 달라요
+        "bad_price": Decimal("-0.5"),  # 가격 흥정이 너무 심해요
+    }
+    # 온도 범위는 0도 ~ 99.9도로 제한 (max_digits=3, decimal_places=1 제약조건을 고려)
+    MANNER_TEMPERATURE_MIN = Decimal("0.0")
+    MANNER_TEMPERATURE_MAX = Decimal("99.9")
+
+    @classmethod
+    def manner_temperature_delta(cls, rating_types) -> Decimal:
+        """평가 유형 목록의 온도 변화 합계 (잘못된 평가 유형은 0)"""
+        return sum(
+            (cls.MANNER_TEMPERATURE_CHANGES.get(rt, Decimal(0)) for rt in rating_types),
+            Decimal(0),
+        )
+
+    @classmethod
+    def apply_manner_temperature_delta(cls, user_id: int, delta) -> int:
+        """매너온도에 delta 를 더해 범위 안으로 제한
+
+        현재 값을 읽지 않고 UPDATE 한 번으로 반영하므로 동시에 들어온 평가도 누락되지 않음
+        """
+        from a_apis.service.user_cards import UserCardService
+
+        delta = Decimal(str(delta))
+        if not delta:
+            return 0
+        updated = cls.objects.filter(id=user_id).update(
+            rating_score=Greatest(
+                Value(cls.MANNER_TEMPERATURE_MIN),
+                Least(
+                    Value(cls.MANNER_TEMPERATURE_MAX),
+                    F("rating_score") + Value(delta),
+                ),
+            )
+        )
+        UserCardService.invalidate(user_id)
+        return updated
+
     def update_manner_temperature(self, rating_type):
-        """매너온도 업데이트 메서드"""
-        # 평가 유형에 따른 온도 변화
-        temperature_changes = {
-            # 긍정적 평가: 온도 상승
-            "time": 0.2,  # 시간 약속을 잘 지켜요
-            "response": 0.2,  # 응답이 빨라요
-            "kind": 0.2,  # 친절하고 매너가 좋아요
-            "accurate": 0.2,  # 상품 상태가 설명과 일치해요
-            "negotiable": 0.2,  # 가격 제안에 대해 긍정적이에요
-            # 부정적 평가: 온도 하락
-            "bad_time": -0.5,  # 약속시간을 안 지켜요
-            "bad_response": -0.5,  # 응답이 느려요
-            "bad_manner": -0.5,  # 불친절해요
-            "bad_accuracy": -0.5,  # 상품 상태가 설명과 달라요
-            "bad_price": -0.5,  # 가격 흥정이 너무 심해요
-        }
-
-        # 기본 변화값 설정 (잘못된 평가 유형이 들어온 경우 0)
-        change = temperature_changes.get(rating_type, 0)
-
-        # 온도 범위는 0도 ~ 99.9도로 제한 (max_digits=3, decimal_places=1 제약조건을 고려)
-        new_temperature = float(self.rating_score) + change
-        new_temperature = max(0, min(99.9, new_temperature))
-
-        # 업데이트 후 저장
-        self.rating_score = new_temperature
-        self.save(update_fields=["rating_score"])
-
-        return new_temperature
+        """매너온도 업데이트 메서드 (반영 후 매너온도 반환)"""
+        User.apply_manner_temperature_delta(
+            self.id, User.manner_temperature_delta([rating_type])
+        )
+        self.refresh_from_db(fields=["rating_score"])
+        return self.rating_score
 
 
 class PriceOffer(CommonModel):
@@ -137,6 +171,12 @@ class PriceOffer(CommonModel):
         verbose_name = "가격 제안"
         verbose_name_plural = "가격 제안 목록"
         ordering = ["-created_at"]
+        indexes = [
+            # 상품별 대기중 제안 집계 (product_id = ? AND status = 'pending')
+            models.Index(
+                fields=["product", "status"], name="price_offer_product_status_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.nickname}의 {self.product.title}에 대한 가격 제안: {self.price}원"
@@ -172,6 +212,10 @@ class Review(CommonModel):
         ordering = ["-created_at"]
         # 한 상품에 대해 같은 사용자가 여러 후기를 남길 수 없도록 제한
         unique_together = ["product", "reviewer"]
+        indexes = [
+            # 받은 후기 목록 커서 페이지네이션 (receiver_id = ? AND id < ? ORDER BY id DESC)
+            models.Index(fields=["receiver", "-id"], name="review_receiver_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.reviewer.nickname}의 {self.product.title}에 대한 후기"
@@ -227,6 +271,99 @@ class MannerRating(CommonModel):
         return f"{self.rater.nickname}가 {self.rated_user.nickname}에게 준 평가: {self.get_rating_type_display()}"
 
     def save(self, *args, **kwargs):
-        # 저장 시 피평가자의 매너온도 업데이트
-        super().save(*args, **kwargs)
-        self.rated_user.update_manner_temperature(self.rating_type)
+        # 개별 저장 시 피평가자의 매너온도 업데이트
+        # (여러 유형을 한 번에 등록할 때는 bulk_create 후 apply_manner_temperature_delta 사용)
+        # 평가 저장 / 매너온도 / 평판 집계가 함께 반영되도록 하나의 트랜잭션으로 처리
+        is_new = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            User.apply_manner_temperature_delta(
+                self.rated_user_id, User.manner_temperature_delta([self.rating_type])
+            )
+            if is_new:
+                from a_apis.service.reputation import ReputationService
+
+                ReputationService.record_ratings(self.rated_user_id, [self.rating_type])
+
+
+class UserReputation(CommonModel):
+    """유저 평판 집계 (프로필 조회용)
+
+    매너 평가 / 거래 후기 / 상품 상태 변경 시 같은 트랜잭션에서 F() 증감으로 갱신하며,
+    rebuild_user_reputation 명령으로 원본 테이블에서 다시 계산할 수 있음
+    """
+
+    # 평가 유형별 집계 필드
+    RATING_FIELDS = {
+        rating_type: f"{rating_type}_count"
+        for rating_type, _ in MannerRating.MANNER_TYPES
+    }
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reputation",
+        verbose_name="유저",
+    )
+    time_count = models.PositiveIntegerField(
+        default=0, verbose_name="시간 약속 평가 수"
+    )
+    response_count = models.PositiveIntegerField(
+        default=0, verbose_name="빠른 응답 평가 수"
+    )
+    kind_count = models.PositiveIntegerField(default=0, verbose_name="친절 평가 수")
+    accurate_count = models.PositiveIntegerField(
+        default=0, verbose_name="상품 상태 일치 평가 수"
+    )
+    negotiable_count = models.PositiveIntegerField(
+        default=0, verbose_name="가격 제안 긍정 평가 수"
+    )
+    bad_time_count = models.PositiveIntegerField(
+        default=0, verbose_name="약속시간 미준수 평가 수"
+    )
+    bad_response_count = models.PositiveIntegerField(
+        default=0, verbose_name="느린 응답 평가 수"
+    )
+    bad_manner_count = models.PositiveIntegerField(
+        default=0, verbose_name="불친절 평가 수"
+    )
+    bad_accuracy_count = models.PositiveIntegerField(
+        default=0, verbose_name="상품 상태 불일치 평가 수"
+    )
+    bad_price_count = models.PositiveIntegerField(
+        default=0, verbose_name="과도한 흥정 평가 수"
+    )
+    positive_count = models.PositiveIntegerField(
+        default=0, verbose_name="긍정 매너 평가 수"
+    )
+    negative_count = models.PositiveIntegerField(
+        default=0, verbose_name="부정 매너 평가 수"
+    )
+    review_count = models.PositiveIntegerField(
+        default=0, verbose_name="받은 거래 후기 수"
+    )
+    selling_product_count = models.PositiveIntegerField(
+        default=0, verbose_name="판매중 상품 수"
+    )
+
+    class Meta:
+        db_table = "user_reputations"
+        verbose_name = "유저 평판 집계"
+        verbose_name_plural = "유저 평판 집계 목록"
+
+    def __str__(self):
+        return f"{self.user_id} 평판 (긍정 {self.positive_count} / 부정 {self.negative_count})"
+
+    @staticmethod
+    def is_positive(rating_type: str) -> bool:
+        return User.MANNER_TEMPERATURE_CHANGES.get(rating_type, 0) > 0
+
+    def rating_counts(self, positive: bool = None) -> list:
+        """(평가 유형, 평가 이름, 횟수) 목록 (횟수 내림차순, 0 제외)"""
+        counts = [
+            (rating_type, name, getattr(self, self.RATING_FIELDS[rating_type]))
+            for rating_type, name in MannerRating.MANNER_TYPES
+            if positive is None or self.is_positive(rating_type) == positive
+        ]
+        return sorted((item for item in counts if item[2]), key=lambda item: -item[2])